@@ -0,0 +1,249 @@
+import maya.cmds as cmds
+import AnimMath
+
+# By Teo2103D
+
+# Channels keyed by the bake tools, in the order they are written
+TRANSFORM_CHANNELS = ['translateX', 'translateY', 'translateZ',
+                      'rotateX', 'rotateY', 'rotateZ',
+                      'scaleX', 'scaleY', 'scaleZ']
+
+# Key reduction after the bakes (AnimTool menu): keys are removed where the curve stays within
+# the tolerance of the baked values, in scene units for translations/pivots and degrees for rotations
+reduce_keys = False
+key_tolerances = {"doubleLinear": 0.01, "doubleAngle": 0.1, "double": 0.001}
+
+# False in batch mode (mayapy): there is no progress window to show
+_progress_enabled = True
+
+def start_progress(title, count):
+    """
+    Opens Maya's progress window for an operation of count steps (the user can press Esc to cancel).
+    Does nothing in batch mode.
+    """
+    global _progress_enabled
+    _progress_enabled = not cmds.about(batch=True)
+    if _progress_enabled:
+        cmds.progressWindow(title=title, progress=0, maxValue=max(count, 1), status=title, isInterruptable=True)
+
+def update_progress(index, count):
+    """
+    Moves the progress window to step index. Returns False if the user cancelled.
+    The window is only refreshed about a hundred times, whatever the number of steps.
+    """
+    if not _progress_enabled or index % max(count // 100, 1):
+        return True
+    if cmds.progressWindow(query=True, isCancelled=True):
+        return False
+    cmds.progressWindow(edit=True, progress=index)
+    return True
+
+def progress_cancelled():
+    """True if the user pressed Esc in the progress window, checked on every call (unlike update_progress)."""
+    return _progress_enabled and bool(cmds.progressWindow(query=True, isCancelled=True))
+
+def end_progress():
+    if _progress_enabled:
+        cmds.progressWindow(endProgress=True)
+
+def sample_matrices(plugs, frames, progress=None, allow_shards=True):
+    """
+    Samples matrix plugs (e.g. "grp.worldMatrix[0]") at every frame in one pass.
+    Each value is read with context time (getAttr -time), so the global timeline
+    never moves and the scene is not re-evaluated for every frame.
+    Long ranges are split between mayapy worker processes by AnimShard (unless allow_shards is False).
+    progress is an optional function (index, count) called on each frame, returning False to cancel.
+    Returns a dictionary {plug: [matrix at frames[0], matrix at frames[1], ...]}, or None if cancelled.
+    """
+    if allow_shards:
+        import AnimShard
+        if AnimShard.should_shard(frames):
+            return AnimShard.sample_matrices(plugs, frames, progress)
+
+    samples = {plug: [] for plug in plugs}
+
+    for index, t in enumerate(frames):
+        if progress and not progress(index, len(frames)):
+            return None
+        for plug in samples:
+            samples[plug].append(cmds.getAttr(plug, time=t))
+
+    return samples
+
+def iter_sample_matrices(plugs, frames, samples):
+    """
+    Job version of sample_matrices for AnimScheduler (no shards): fills samples ({plug: [matrix, ...]})
+    one frame per step and yields the progress (index, count).
+    """
+    for plug in plugs:
+        samples.setdefault(plug, [])
+    for index, t in enumerate(frames):
+        for plug in plugs:
+            samples[plug].append(cmds.getAttr(plug, time=t))
+        yield index + 1, len(frames)
+
+def get_transform_attributes(obj):
+    """
+    Reads everything besides translate/rotate/scale that shapes the local matrix of obj
+    (rotate order, rotate axis, joint orient and pivots), as keyword arguments for AnimMath.
+    """
+    attributes = {
+        "rotate_order": cmds.getAttr(f"{obj}.rotateOrder"),
+        "rotate_axis": cmds.getAttr(f"{obj}.rotateAxis")[0],
+        "scale_pivot": cmds.getAttr(f"{obj}.scalePivot")[0],
+        "rotate_pivot": cmds.getAttr(f"{obj}.rotatePivot")[0],
+        "scale_pivot_translate": cmds.getAttr(f"{obj}.scalePivotTranslate")[0],
+        "rotate_pivot_translate": cmds.getAttr(f"{obj}.rotatePivotTranslate")[0],
+    }
+    if cmds.objectType(obj, isAType="joint"):
+        attributes["joint_orient"] = cmds.getAttr(f"{obj}.jointOrient")[0]
+    return attributes
+
+def decompose_local_matrices(obj, world_matrices, parent_inverse_matrices, previous_rotate=None):
+    """
+    Converts world matrices into the translate/rotate/scale values of obj,
+    using its rotate order, rotate axis and joint orient and keeping its pivots in place.
+    The rotations are Euler filtered (starting from previous_rotate if given) so the baked curves do not flip.
+    Returns a dictionary {channel: [value, ...]} for the nine TRANSFORM_CHANNELS.
+    """
+    local_matrices = AnimMath.multiply_many(world_matrices, parent_inverse_matrices)
+    translates, rotates, scales = AnimMath.decompose(local_matrices, previous_rotate=previous_rotate,
+                                                     **get_transform_attributes(obj))
+
+    values = {}
+    for channels, vectors in zip((TRANSFORM_CHANNELS[0:3], TRANSFORM_CHANNELS[3:6], TRANSFORM_CHANNELS[6:9]),
+                                 (translates, rotates, scales)):
+        for axis, channel in enumerate(channels):
+            values[channel] = [vector[axis] for vector in vectors]
+    return values
+
+def match_world_matrix(obj, target, scale=False):
+    """
+    Moves obj onto the world matrix of target (position and rotation, scale optional),
+    like cmds.matchTransform but with one matrix read per node and no xform round-trip.
+    As with matchTransform, the rotate pivot of obj lands on the rotate pivot of target.
+    """
+    match_matrix(obj, cmds.getAttr(f"{target}.worldMatrix[0]"), cmds.getAttr(f"{target}.rotatePivot")[0], scale)
+
+def match_matrix(obj, target_world, target_pivot=(0.0, 0.0, 0.0), scale=False, rotate=True):
+    """
+    Moves obj onto a world matrix, as match_world_matrix does onto a node with that matrix and rotate pivot
+    (a target computed from other matrices has its pivot at its origin, like a locator).
+    Without rotate, only the position is matched (e.g. a pole vector control): obj keeps its orientation.
+    """
+    if not rotate:
+        target_world = cmds.getAttr(f"{obj}.worldMatrix[0]")[:12] + list(target_world[12:])
+    # Matrix of the target's pivot, seen from obj's pivot
+    pivot_offset = [t - o for t, o in zip(target_pivot, cmds.getAttr(f"{obj}.rotatePivot")[0])]
+    world = AnimMath.multiply(AnimMath.translation_matrix(pivot_offset), target_world)
+    parent_inverse = cmds.getAttr(f"{obj}.parentInverseMatrix[0]")
+    values = decompose_local_matrices(obj, [world], [parent_inverse],
+                                      previous_rotate=cmds.getAttr(f"{obj}.rotate")[0])
+
+    attributes = ["translate"] + (["rotate"] if rotate else []) + (["scale"] if scale else [])
+    for attribute in attributes:
+        channels = [f"{attribute}{axis}" for axis in "XYZ"]
+        try:
+            cmds.setAttr(f"{obj}.{attribute}", *[values[channel][0] for channel in channels])
+        except RuntimeError:
+            # Some channels are locked or driven by the rig: set the free ones only, like matchTransform does
+            for channel in channels:
+                if cmds.getAttr(f"{obj}.{channel}", settable=True):
+                    cmds.setAttr(f"{obj}.{channel}", values[channel][0])
+
+def bake_matches(pairs, frames, progress=None):
+    """
+    Range version of match_world_matrix: every (obj, target) pair is matched on every frame
+    and keyed (translate and rotate), from a single sampling pass over the frames.
+    When an object of the list sits under another one (FK chain), its parent is moved
+    with the new pose of the one above, so the whole chain lands on its targets.
+    A target is a node, or a target computed from other matrices: (plugs to sample, function getting the
+    samples {plug: [matrix per frame]} and returning the target world matrix of every frame), with an optional
+    third item True to match the position only (the object keeps its orientation, only its translate is keyed).
+    Returns False if the progress function cancelled the bake.
+    """
+    plugs = []
+    for obj, target in pairs:
+        plugs.extend(target[0] if isinstance(target, tuple) else [f"{target}.worldMatrix[0]"])
+        plugs.extend([f"{obj}.worldMatrix[0]", f"{obj}.parentInverseMatrix[0]"])
+    samples = sample_matrices(list(dict.fromkeys(plugs)), frames, progress)
+    if samples is None:
+        return False
+
+    long_names = {obj: cmds.ls(obj, long=True)[0] for obj, _ in pairs}
+    new_worlds = {}
+
+    for obj, target in pairs:
+        # Same pivot handling as match_world_matrix (a computed target has its pivot at its origin)
+        position_only = isinstance(target, tuple) and len(target) > 2 and target[2]
+        if isinstance(target, tuple):
+            target_pivot, target_worlds = (0.0, 0.0, 0.0), target[1](samples)
+        else:
+            target_pivot, target_worlds = cmds.getAttr(f"{target}.rotatePivot")[0], samples[f"{target}.worldMatrix[0]"]
+        if position_only:
+            target_worlds = [world[:12] + list(target_world[12:])
+                             for world, target_world in zip(samples[f"{obj}.worldMatrix[0]"], target_worlds)]
+        pivot_offset = [t - o for t, o in zip(target_pivot, cmds.getAttr(f"{obj}.rotatePivot")[0])]
+        target_worlds = AnimMath.multiply_many(AnimMath.translation_matrix(pivot_offset), target_worlds)
+        parent_inverses = samples[f"{obj}.parentInverseMatrix[0]"]
+
+        # Closest object already matched above this one in the hierarchy: its new pose moves our parent
+        ancestors = [other for other in new_worlds if long_names[obj].startswith(long_names[other] + "|")]
+        if ancestors:
+            ancestor = max(ancestors, key=lambda other: len(long_names[other]))
+            parent_inverses = [AnimMath.multiply(AnimMath.multiply(AnimMath.inverse(new), old), parent_inverse)
+                               for parent_inverse, old, new in zip(parent_inverses, samples[f"{ancestor}.worldMatrix[0]"],
+                                                                   new_worlds[ancestor])]
+
+        new_worlds[obj] = target_worlds
+        values = decompose_local_matrices(obj, target_worlds, parent_inverses,
+                                          previous_rotate=cmds.getAttr(f"{obj}.rotate", time=frames[0])[0])
+
+        # Translate and rotate only, and never the channels locked by the rig
+        channel_values = {channel: values[channel] for channel in TRANSFORM_CHANNELS[0:3 if position_only else 6]
+                          if not cmds.getAttr(f"{obj}.{channel}", lock=True)}
+        write_keys(obj, channel_values, frames)
+
+    return True
+
+def write_keys(obj, channel_values, frames, reduce=None):
+    """
+    Writes all the keys of each channel as one batch instead of one setKeyframe per frame.
+    The keys are stored in an animCurve with a single setAttr on its keyTimeValue array,
+    then pasted over the frame range (existing keys outside the range are kept).
+    With reduce (reduce_keys by default), the baked values are simplified before being written:
+    only the keys needed to stay within key_tolerances are kept, with spline tangents.
+    """
+    curve_types = {"doubleLinear": "animCurveTL", "doubleAngle": "animCurveTA"}
+    short_name = obj.split('|')[-1].replace(':', '_')
+    if reduce is None:
+        reduce = reduce_keys
+
+    for channel, values in channel_values.items():
+        attribute_type = cmds.getAttr(f"{obj}.{channel}", type=True)
+        curve_type = curve_types.get(attribute_type, "animCurveTU")
+        curve = cmds.createNode(curve_type, name=f"{short_name}_{channel}_bake")
+
+        indices = range(len(frames))
+        if reduce:
+            indices = AnimMath.reduce_keys(frames, values, key_tolerances.get(attribute_type, key_tolerances["double"]))
+
+        key_time_values = []
+        for index in indices:
+            key_time_values.extend((frames[index], values[index]))
+        count = len(indices)
+        cmds.setAttr(f"{curve}.keyTimeValue[0:{count - 1}]", *key_time_values, size=count)
+        if reduce:
+            cmds.keyTangent(curve, edit=True, inTangentType="spline", outTangentType="spline")
+
+        existing = cmds.listConnections(f"{obj}.{channel}", source=True, destination=False, type="animCurve")
+        if existing:
+            # Merge with the animation already on the channel
+            cmds.copyKey(curve)
+            cmds.pasteKey(obj, attribute=channel, option="replace", time=(frames[0], frames[-1]))
+            cmds.delete(curve)
+        else:
+            cmds.connectAttr(f"{curve}.output", f"{obj}.{channel}", force=True)
+            cmds.rename(curve, f"{short_name}_{channel}")
+
+# By Teo2103D
@@ -0,0 +1,227 @@
+import argparse
+import json
+import multiprocessing
+import multiprocessing.util
+import os
+import sys
+import time
+import traceback
+
+# By Teo2103D
+
+# Headless batch for the AnimTool operations, to run them on many scene files without Maya's UI.
+#
+#   mayapy AnimBatch.py jobs.json --workers 4 --report report.json
+#
+# jobs.json is a list of jobs (or {"jobs": [...]}), one per scene:
+#   {"scene": "shots/sh010.ma", "operation": "follow", "objects": ["car", "driver"], "start": 1, "end": 240,
+#    "options": {"one_driver": false}, "save": true}
+#
+# Operations (objects are given in the order they would be selected):
+# - "follow":      FollowAnimTool, objects = driver, driven, driver, driven... (options: one_driver, fast_bake)
+# - "switch":      SwitchIkFk over the range, objects = the controls (options: rig, keys_only; rig = locator name)
+# - "switch_frame": SwitchIkFk on the start frame only, same objects and options
+# - "reset":       ResetTool over the range, objects = the controls (options: attributes "All", "Transforms"
+#                  or "Other", mode "Current", "Range" or "Keys")
+# - "pivot_range": MovePivotTool, objects = object, locator
+# - "switch_setup": SwitchSetupBatch, objects = the rigs (options: mapping, a limb mapping or the path of its JSON file;
+#                  stored, true to store the targets on the joints instead of creating locators)
+#
+# start/end default to the playback range of the scene. The scene is saved over itself with "save": true,
+# or saved as "output": "path.ma". Without either, the scene is left untouched (timing runs).
+# Every worker process starts Maya once (maya.standalone) and then opens the scenes one after the other.
+
+ANIM_TOOL_PATH = os.path.dirname(os.path.abspath(__file__))
+
+def _setup_paths():
+    for path in (ANIM_TOOL_PATH, os.path.join(ANIM_TOOL_PATH, "SwitchIKFK")):
+        if os.path.isdir(path) and path not in sys.path:
+            sys.path.append(path)
+
+def initialize_worker():
+    """Starts Maya in the worker process (once per process); it is shut down cleanly when the process exits."""
+    _setup_paths()
+    import maya.standalone
+    maya.standalone.initialize(name="python")
+    # Runs on a normal exit of the process, pool workers included (they skip atexit)
+    multiprocessing.util.Finalize(None, maya.standalone.uninitialize, exitpriority=10)
+
+def _run_follow(job, start_frame, end_frame):
+    import FollowAnimTool
+    options = job.get("options", {})
+    count = FollowAnimTool.follow_objects(job["objects"], start_frame, end_frame,
+                                          fast_bake=options.get("fast_bake", True),
+                                          one_driver=options.get("one_driver", False))
+    if not count:
+        raise RuntimeError("No driver/driven pair in the objects.")
+    return f"{count} pairs baked"
+
+def _run_switch(job, start_frame, end_frame):
+    import SwitchIkFk
+    options = job.get("options", {})
+    if not options.get("rig"):
+        raise RuntimeError("The switch needs the rig name of the locators (options.rig).")
+    if job["operation"] == "switch_frame":
+        import maya.cmds as cmds
+        cmds.currentTime(start_frame, edit=True)
+        SwitchIkFk.match_transforms_to_locators(options["rig"], job["objects"])
+        return "matched"
+    if not SwitchIkFk.switch_frame_range(options["rig"], start_frame, end_frame,
+                                         keys_only=options.get("keys_only", False), selected_objects=job["objects"]):
+        raise RuntimeError("The switch did not create any key.")
+    return "switched"
+
+def _run_reset(job, start_frame, end_frame):
+    import ResetTool
+    options = job.get("options", {})
+    count = ResetTool.reset_attributes(job["objects"], options.get("attributes", "All"),
+                                       mode=options.get("mode", ResetTool.FRAME_RANGE),
+                                       start_frame=start_frame, end_frame=end_frame)
+    return f"{count} attributes reset"
+
+def _run_pivot_range(job, start_frame, end_frame):
+    import MovePivotTool
+    obj, locator = job["objects"]
+    count = MovePivotTool.snap_pivot_to_locator_over_range(obj, locator, start_frame, end_frame)
+    if count is None:
+        raise RuntimeError(f"The pivot of {obj} could not be baked on {locator}.")
+    return f"pivot baked on {count} frames"
+
+def _run_switch_setup(job, start_frame, end_frame):
+    import SwitchSetupBatch
+    mapping = job.get("options", {}).get("mapping")
+    if isinstance(mapping, str):
+        mapping = SwitchSetupBatch.load_limb_mapping(mapping)
+    report = SwitchSetupBatch.set_up_rigs(job["objects"], mapping, job.get("options", {}).get("stored"))
+    if not report["limbs"]:
+        raise RuntimeError(f"No limb set up: {'; '.join(report['missing'])}")
+    return f"{report['limbs']} limbs set up" + (f", skipped {'; '.join(report['missing'])}" if report["missing"] else "")
+
+OPERATIONS = {
+    "follow": _run_follow,
+    "switch": _run_switch,
+    "switch_frame": _run_switch,
+    "reset": _run_reset,
+    "pivot_range": _run_pivot_range,
+    "switch_setup": _run_switch_setup,
+}
+
+def run_job(job):
+    """
+    Opens the scene of a job, runs its operation and saves the result.
+    Returns a report entry; errors are reported instead of stopping the batch.
+    """
+    import maya.cmds as cmds
+
+    result = {"scene": job.get("scene"), "operation": job.get("operation"), "status": "ok", "pid": os.getpid()}
+    start_time = time.perf_counter()
+    try:
+        if job.get("operation") not in OPERATIONS:
+            raise RuntimeError(f"Unknown operation: {job.get('operation')}")
+
+        cmds.file(job["scene"], open=True, force=True, prompt=False)
+        opened = time.perf_counter()
+        result["open_seconds"] = round(opened - start_time, 3)
+
+        missing = [obj for obj in job.get("objects", []) if not cmds.objExists(obj)]
+        if missing:
+            raise RuntimeError(f"Objects not found: {', '.join(missing)}")
+
+        start_frame = int(job.get("start", cmds.playbackOptions(query=True, minTime=True)))
+        end_frame = int(job.get("end", cmds.playbackOptions(query=True, maxTime=True)))
+        result.update(start=start_frame, end=end_frame)
+
+        cmds.undoInfo(stateWithoutFlush=False)  # No undo queue in batch
+        try:
+            result["message"] = OPERATIONS[job["operation"]](job, start_frame, end_frame)
+        finally:
+            cmds.undoInfo(stateWithoutFlush=True)
+        result["operation_seconds"] = round(time.perf_counter() - opened, 3)
+
+        if job.get("output"):
+            cmds.file(rename=job["output"])
+            file_type = "mayaBinary" if job["output"].lower().endswith(".mb") else "mayaAscii"
+            cmds.file(save=True, force=True, type=file_type)
+            result["saved"] = job["output"]
+        elif job.get("save"):
+            cmds.file(save=True, force=True)
+            result["saved"] = job["scene"]
+    except Exception as e:
+        result.update(status="error", message=str(e), traceback=traceback.format_exc())
+    finally:
+        result["seconds"] = round(time.perf_counter() - start_time, 3)
+        try:
+            cmds.file(new=True, force=True)
+        except RuntimeError:
+            pass
+
+    return result
+
+def load_jobs(path):
+    with open(path) as job_file:
+        data = json.load(job_file)
+    jobs = data["jobs"] if isinstance(data, dict) else data
+    # Scene paths are relative to the job file
+    base = os.path.dirname(os.path.abspath(path))
+    for job in jobs:
+        for key in ("scene", "output"):
+            if job.get(key) and not os.path.isabs(job[key]):
+                job[key] = os.path.join(base, job[key])
+    return jobs
+
+def run_batch(jobs, workers=1):
+    """
+    Runs the jobs with a pool of worker processes (or in this process with a single worker)
+    and returns the report.
+    """
+    start_time = time.perf_counter()
+    if workers <= 1:
+        initialize_worker()
+        results = [run_job(job) for job in jobs]
+    else:
+        # spawn: every worker starts its own Maya, nothing is inherited from this process
+        context = multiprocessing.get_context("spawn")
+        pool = context.Pool(workers, initializer=initialize_worker)
+        try:
+            results = pool.map(run_job, jobs, chunksize=1)
+            # close/join instead of terminate: the workers exit normally and shut their Maya down
+            pool.close()
+        except BaseException:
+            pool.terminate()
+            raise
+        finally:
+            pool.join()
+
+    return {
+        "workers": workers,
+        "jobs": len(jobs),
+        "succeeded": sum(result["status"] == "ok" for result in results),
+        "failed": sum(result["status"] != "ok" for result in results),
+        "seconds": round(time.perf_counter() - start_time, 3),
+        "results": results,
+    }
+
+def main(arguments=None):
+    parser = argparse.ArgumentParser(description="Runs AnimTool operations on scene files with mayapy.")
+    parser.add_argument("jobs", help="JSON file with the jobs.")
+    parser.add_argument("--workers", type=int, default=max(multiprocessing.cpu_count() // 2, 1),
+                        help="Number of worker processes (one Maya each).")
+    parser.add_argument("--report", default="AnimBatchReport.json", help="JSON report to write.")
+    options = parser.parse_args(arguments)
+
+    jobs = load_jobs(options.jobs)
+    report = run_batch(jobs, min(options.workers, len(jobs)) or 1)
+
+    with open(options.report, "w") as report_file:
+        json.dump(report, report_file, indent=2)
+
+    print(f"{report['succeeded']}/{report['jobs']} jobs done in {report['seconds']} s, report: {options.report}")
+    for result in report["results"]:
+        if result["status"] != "ok":
+            print(f"FAILED {result['scene']} ({result['operation']}): {result['message']}")
+    return 0 if not report["failed"] else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
+
+# By Teo2103D
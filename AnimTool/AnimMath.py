@@ -0,0 +1,486 @@
+import math
+
+# By Teo2103D
+
+# World-space matching math shared by the AnimTool scripts.
+# No Maya import here: everything works on plain lists so it can be tested and timed outside Maya.
+#
+# Matrices are flat lists of 16 floats in Maya's order (row-major, row vectors, translation in 12-14),
+# exactly what cmds.xform(q=True, matrix=True) and cmds.getAttr("node.worldMatrix[0]") return.
+# Every function working on "matrices" takes a list of matrices (one per frame or per object).
+# Angles are in degrees, like the rotate channels.
+
+IDENTITY = [1.0, 0.0, 0.0, 0.0,
+            0.0, 1.0, 0.0, 0.0,
+            0.0, 0.0, 1.0, 0.0,
+            0.0, 0.0, 0.0, 1.0]
+
+# Maya rotateOrder enum -> axes in the order they are applied
+ROTATE_ORDERS = [(0, 1, 2),  # xyz
+                 (1, 2, 0),  # yzx
+                 (2, 0, 1),  # zxy
+                 (0, 2, 1),  # xzy
+                 (1, 0, 2),  # yxz
+                 (2, 1, 0)]  # zyx
+
+def is_matrix(value):
+    """
+    Returns True if value is a single matrix (16 numbers) rather than a list of matrices.
+    """
+    return len(value) == 16 and not isinstance(value[0], (list, tuple))
+
+def _as_list(matrices, count):
+    """
+    Repeats a single matrix count times so it can be combined with a list of matrices.
+    """
+    return [matrices] * count if is_matrix(matrices) else matrices
+
+def multiply(a, b):
+    """
+    Multiplies two 4x4 matrices (a then b, Maya order).
+    """
+    return [a[r] * b[c] + a[r + 1] * b[c + 4] + a[r + 2] * b[c + 8] + a[r + 3] * b[c + 12]
+            for r in (0, 4, 8, 12) for c in range(4)]
+
+def multiply_many(a, b):
+    """
+    Multiplies two lists of matrices element by element.
+    Either side can be a single matrix, it is then used for every element of the other side.
+    """
+    if is_matrix(a) and is_matrix(b):
+        return [multiply(a, b)]
+    count = len(b) if is_matrix(a) else len(a)
+    return [multiply(m_a, m_b) for m_a, m_b in zip(_as_list(a, count), _as_list(b, count))]
+
+def inverse(m):
+    """
+    Inverts an affine 4x4 matrix (transform matrices never have a projective part).
+    """
+    a, b, c = m[0], m[1], m[2]
+    d, e, f = m[4], m[5], m[6]
+    g, h, i = m[8], m[9], m[10]
+
+    co_a, co_b, co_c = e * i - f * h, f * g - d * i, d * h - e * g
+    det = a * co_a + b * co_b + c * co_c
+    if abs(det) < 1e-12:
+        raise ValueError("The matrix cannot be inverted (zero scale).")
+    inv_det = 1.0 / det
+
+    r = [co_a * inv_det, (c * h - b * i) * inv_det, (b * f - c * e) * inv_det,
+         co_b * inv_det, (a * i - c * g) * inv_det, (c * d - a * f) * inv_det,
+         co_c * inv_det, (b * g - a * h) * inv_det, (a * e - b * d) * inv_det]
+
+    tx, ty, tz = m[12], m[13], m[14]
+    return [r[0], r[1], r[2], 0.0,
+            r[3], r[4], r[5], 0.0,
+            r[6], r[7], r[8], 0.0,
+            -(tx * r[0] + ty * r[3] + tz * r[6]),
+            -(tx * r[1] + ty * r[4] + tz * r[7]),
+            -(tx * r[2] + ty * r[5] + tz * r[8]),
+            1.0]
+
+def inverse_many(matrices):
+    """
+    Inverts a list of matrices.
+    """
+    return [inverse(m) for m in matrices]
+
+def translation_matrix(translate):
+    """
+    Builds a matrix that only moves by translate.
+    """
+    return [1.0, 0.0, 0.0, 0.0,
+            0.0, 1.0, 0.0, 0.0,
+            0.0, 0.0, 1.0, 0.0,
+            float(translate[0]), float(translate[1]), float(translate[2]), 1.0]
+
+def remove_scale(matrices):
+    """
+    Returns the matrices without their scale (and shear), like a parentConstraint sees its target.
+    """
+    cleaned = []
+    for m in matrices:
+        rows = [m[0:3], m[4:7], m[8:11]]
+        # Gram-Schmidt so the three axes stay perpendicular
+        x = _normalize(rows[0])
+        y = _normalize(_subtract(rows[1], _scale_vector(x, _dot(rows[1], x))))
+        z = _cross(x, y)
+        if _dot(z, rows[2]) < 0:
+            z = _scale_vector(z, -1.0)
+        cleaned.append(list(x) + [0.0] + list(y) + [0.0] + list(z) + [0.0] + [m[12], m[13], m[14], 1.0])
+    return cleaned
+
+def _dot(a, b):
+    return a[0] * b[0] + a[1] * b[1] + a[2] * b[2]
+
+def _cross(a, b):
+    return (a[1] * b[2] - a[2] * b[1], a[2] * b[0] - a[0] * b[2], a[0] * b[1] - a[1] * b[0])
+
+def _subtract(a, b):
+    return (a[0] - b[0], a[1] - b[1], a[2] - b[2])
+
+def _scale_vector(v, factor):
+    return (v[0] * factor, v[1] * factor, v[2] * factor)
+
+def _normalize(v):
+    length = math.sqrt(_dot(v, v))
+    return _scale_vector(v, 1.0 / length) if length > 1e-12 else tuple(v)
+
+def aim_matrices(origins, targets, up=(0.0, 1.0, 0.0)):
+    """
+    Matrices placed at each origin with their X axis aimed at the target and their Y axis towards up,
+    like an aimConstraint (aim X, up Y, world up vector). origins and targets are lists of (x, y, z).
+    When the aim is along up, the world axis closest to perpendicular to the aim is used as up instead
+    (an aimConstraint flips there), and an origin on its target keeps the world axes.
+    """
+    matrices = []
+    for origin, target in zip(origins, targets):
+        x = _subtract(target, origin)
+        x = _normalize(x) if _dot(x, x) > 1e-24 else (1.0, 0.0, 0.0)
+        y = _subtract(up, _scale_vector(x, _dot(up, x)))
+        if _dot(y, y) < 1e-12 * _dot(up, up):
+            fallback_up = min(((1.0, 0.0, 0.0), (0.0, 1.0, 0.0), (0.0, 0.0, 1.0)), key=lambda axis: abs(_dot(axis, x)))
+            y = _subtract(fallback_up, _scale_vector(x, _dot(fallback_up, x)))
+        y = _normalize(y)
+        z = _cross(x, y)
+        matrices.append(list(x) + [0.0] + list(y) + [0.0] + list(z) + [0.0] + list(origin) + [1.0])
+    return matrices
+
+def bend_direction(root, middle, end):
+    """
+    Unit direction in which a three-joint chain bends (from the root-end line towards the middle joint),
+    or None when the chain is straight.
+    """
+    axis = _subtract(end, root)
+    to_middle = _subtract(middle, root)
+    length = math.sqrt(_dot(to_middle, to_middle)) + math.sqrt(_dot(_subtract(end, middle), _subtract(end, middle)))
+    axis_length = _dot(axis, axis)
+    bend = to_middle
+    if axis_length > 1e-12:
+        bend = _subtract(to_middle, _scale_vector(axis, _dot(to_middle, axis) / axis_length))
+    return _normalize(bend) if _dot(bend, bend) > (1e-6 * length) ** 2 and length > 1e-12 else None
+
+def pole_vector_positions(roots, middles, ends, distance=0.5, fallbacks=None):
+    """
+    Pole vector positions of three-joint chains (shoulder, elbow, wrist / hip, knee, ankle), from lists of
+    world positions (one per frame or per limb): in the plane of the chain, out from the middle joint,
+    perpendicular to the root-end line, at distance x the length of the chain from the middle joint.
+    A straight chain has no bend direction: the closest bent frame of the list gives it (the earlier one on a tie).
+    When the chain is never bent, fallbacks gives the direction (one per frame, e.g. the bend of the rest pose
+    carried by the middle joint); without it the middle joint itself is returned.
+    """
+    directions, lengths = [], []
+    for root, middle, end in zip(roots, middles, ends):
+        to_middle, to_end = _subtract(middle, root), _subtract(end, middle)
+        lengths.append(math.sqrt(_dot(to_middle, to_middle)) + math.sqrt(_dot(to_end, to_end)))
+        directions.append(bend_direction(root, middle, end))
+
+    bent = [index for index, direction in enumerate(directions) if direction is not None]
+    if not bent:
+        directions = [_normalize(fallback) for fallback in fallbacks] if fallbacks else [(0.0, 0.0, 0.0)] * len(lengths)
+    else:
+        # Straight frames: direction of the closest bent frame
+        position = 0
+        for index in range(len(directions)):
+            while position + 1 < len(bent) and abs(bent[position + 1] - index) < abs(bent[position] - index):
+                position += 1
+            if directions[index] is None:
+                directions[index] = directions[bent[position]]
+
+    return [tuple(middle[a] + direction[a] * distance * length for a in range(3))
+            for middle, direction, length in zip(middles, directions, lengths)]
+
+def positions(matrices):
+    """
+    Returns the translation (x, y, z) of each matrix.
+    """
+    return [(m[12], m[13], m[14]) for m in matrices]
+
+def transform_vector(vector, m):
+    """
+    Transforms a direction by a matrix: rotation and scale only (row vector, Maya order).
+    """
+    x, y, z = vector
+    return (x * m[0] + y * m[4] + z * m[8],
+            x * m[1] + y * m[5] + z * m[9],
+            x * m[2] + y * m[6] + z * m[10])
+
+def transform_point(point, m):
+    """
+    Transforms a point by a matrix (row vector, Maya order).
+    """
+    x, y, z = point
+    return (x * m[0] + y * m[4] + z * m[8] + m[12],
+            x * m[1] + y * m[5] + z * m[9] + m[13],
+            x * m[2] + y * m[6] + z * m[10] + m[14])
+
+def _rotate_vector(v, r):
+    """
+    Rotates a vector by a 3x3 matrix stored as a flat list of 9 values.
+    """
+    return (v[0] * r[0] + v[1] * r[3] + v[2] * r[6],
+            v[0] * r[1] + v[1] * r[4] + v[2] * r[7],
+            v[0] * r[2] + v[1] * r[5] + v[2] * r[8])
+
+def _multiply3(a, b):
+    """
+    Multiplies two 3x3 matrices stored as flat lists of 9 values.
+    """
+    return [a[r] * b[c] + a[r + 1] * b[c + 3] + a[r + 2] * b[c + 6] for r in (0, 3, 6) for c in range(3)]
+
+def _transpose3(a):
+    return [a[0], a[3], a[6], a[1], a[4], a[7], a[2], a[5], a[8]]
+
+def _axis_rotation(axis, angle):
+    """
+    3x3 rotation matrix around one axis (0=X, 1=Y, 2=Z), angle in radians.
+    """
+    c, s = math.cos(angle), math.sin(angle)
+    if axis == 0:
+        return [1.0, 0.0, 0.0, 0.0, c, s, 0.0, -s, c]
+    if axis == 1:
+        return [c, 0.0, -s, 0.0, 1.0, 0.0, s, 0.0, c]
+    return [c, s, 0.0, -s, c, 0.0, 0.0, 0.0, 1.0]
+
+def euler_to_rotation(rotate, rotate_order=0):
+    """
+    Builds the 3x3 rotation matrix of an Euler rotation (degrees) with a Maya rotate order.
+    """
+    i, j, k = ROTATE_ORDERS[rotate_order]
+    return _multiply3(_multiply3(_axis_rotation(i, math.radians(rotate[i])),
+                                 _axis_rotation(j, math.radians(rotate[j]))),
+                      _axis_rotation(k, math.radians(rotate[k])))
+
+def rotation_to_euler(r, rotate_order=0):
+    """
+    Extracts the Euler rotation (degrees) of an orthonormal 3x3 rotation matrix for a Maya rotate order.
+    """
+    i, j, k = ROTATE_ORDERS[rotate_order]
+    # Even permutations (xyz, yzx, zxy) and odd ones only differ by sign
+    sign = 1.0 if rotate_order < 3 else -1.0
+
+    sin_b = max(-1.0, min(1.0, -sign * r[i * 3 + k]))
+    b = math.asin(sin_b)
+    if abs(sin_b) < 0.9999999:
+        a = math.atan2(sign * r[j * 3 + k], r[k * 3 + k])
+        c = math.atan2(sign * r[i * 3 + j], r[i * 3 + i])
+    else:
+        # Gimbal lock: the first and last axes are aligned, keep everything on the first one
+        a = math.atan2(-sign * r[k * 3 + j], r[j * 3 + j])
+        c = 0.0
+
+    rotate = [0.0, 0.0, 0.0]
+    rotate[i], rotate[j], rotate[k] = math.degrees(a), math.degrees(b), math.degrees(c)
+    return rotate
+
+def _rotation_chain(rotate, rotate_order, rotate_axis, joint_orient):
+    """
+    Full 3x3 rotation of a transform: rotateAxis, then rotate, then jointOrient.
+    """
+    r = euler_to_rotation(rotate, rotate_order)
+    if rotate_axis is not None:
+        r = _multiply3(euler_to_rotation(rotate_axis), r)
+    if joint_orient is not None:
+        r = _multiply3(r, euler_to_rotation(joint_orient))
+    return r
+
+def _pivot_offset(rotation, scale, scale_pivot, rotate_pivot, scale_pivot_translate, rotate_pivot_translate):
+    """
+    Translation added by the pivots for a given rotation and scale (the "T = 0" part of the matrix).
+    """
+    base = [scale_pivot[a] - scale_pivot[a] * scale[a] + scale_pivot_translate[a] - rotate_pivot[a] for a in range(3)]
+    rotated = _rotate_vector(base, rotation)
+    return [rotated[a] + rotate_pivot[a] + rotate_pivot_translate[a] for a in range(3)]
+
+def compose(translate, rotate, scale, rotate_order=0, joint_orient=None, rotate_axis=None,
+            scale_pivot=(0, 0, 0), rotate_pivot=(0, 0, 0),
+            scale_pivot_translate=(0, 0, 0), rotate_pivot_translate=(0, 0, 0)):
+    """
+    Builds the local matrix of a transform or joint from its channels, like Maya does:
+    [Sp-1][S][Sp][Spt][Rp-1][Ra][R][Jo][Rp][Rpt][T] (shear and inverse scale are not handled).
+    translate, rotate and scale are lists of (x, y, z), one per frame or per object.
+    """
+    matrices = []
+    for t, r, s in zip(translate, rotate, scale):
+        rot = _rotation_chain(r, rotate_order, rotate_axis, joint_orient)
+        offset = _pivot_offset(rot, s, scale_pivot, rotate_pivot, scale_pivot_translate, rotate_pivot_translate)
+        matrices.append([s[0] * rot[0], s[0] * rot[1], s[0] * rot[2], 0.0,
+                         s[1] * rot[3], s[1] * rot[4], s[1] * rot[5], 0.0,
+                         s[2] * rot[6], s[2] * rot[7], s[2] * rot[8], 0.0,
+                         offset[0] + t[0], offset[1] + t[1], offset[2] + t[2], 1.0])
+    return matrices
+
+def decompose(matrices, rotate_order=0, joint_orient=None, rotate_axis=None,
+              scale_pivot=(0, 0, 0), rotate_pivot=(0, 0, 0),
+              scale_pivot_translate=(0, 0, 0), rotate_pivot_translate=(0, 0, 0),
+              filter_euler=True, previous_rotate=None):
+    """
+    Finds the translate, rotate and scale channels that give each local matrix,
+    keeping the pivots, rotateAxis and jointOrient of the transform untouched.
+    With filter_euler, the rotations are made continuous from one matrix to the next (no flips),
+    starting from previous_rotate when given (e.g. the current rotate values of the object).
+    Returns three lists of (x, y, z): translate, rotate, scale.
+    """
+    axis_inverse = _transpose3(euler_to_rotation(rotate_axis)) if rotate_axis is not None else None
+    orient_inverse = _transpose3(euler_to_rotation(joint_orient)) if joint_orient is not None else None
+
+    translates, rotates, scales = [], [], []
+    for m in matrices:
+        rows = (m[0:3], m[4:7], m[8:11])
+        scale = [math.sqrt(row[0] * row[0] + row[1] * row[1] + row[2] * row[2]) for row in rows]
+
+        # A mirrored matrix has a negative scale, keep it on X
+        if (m[0] * (m[5] * m[10] - m[6] * m[9]) - m[1] * (m[4] * m[10] - m[6] * m[8])
+                + m[2] * (m[4] * m[9] - m[5] * m[8])) < 0:
+            scale[0] = -scale[0]
+
+        rot = [value / scale[index // 3] for index, value in enumerate(m[0:3] + m[4:7] + m[8:11])]
+        channels_rot = rot
+        if axis_inverse is not None:
+            channels_rot = _multiply3(axis_inverse, channels_rot)
+        if orient_inverse is not None:
+            channels_rot = _multiply3(channels_rot, orient_inverse)
+
+        offset = _pivot_offset(rot, scale, scale_pivot, rotate_pivot, scale_pivot_translate, rotate_pivot_translate)
+        translates.append((m[12] - offset[0], m[13] - offset[1], m[14] - offset[2]))
+        rotates.append(tuple(rotation_to_euler(channels_rot, rotate_order)))
+        scales.append(tuple(scale))
+
+    if filter_euler:
+        rotates = euler_filter(rotates, rotate_order, previous_rotate)
+
+    return translates, rotates, scales
+
+def _closest_angle(angle, previous):
+    """
+    Adds or removes full turns to angle so it is as close as possible to previous.
+    """
+    return angle + 360.0 * round((previous - angle) / 360.0)
+
+def euler_filter(rotations, rotate_order=0, previous=None):
+    """
+    Makes a list of Euler rotations continuous: each rotation is replaced by the equivalent one
+    (full turns or the flipped solution) closest to the one before it.
+    previous is an optional rotation to continue from (e.g. the key just before the range).
+    """
+    i, j, k = ROTATE_ORDERS[rotate_order]
+    filtered = []
+
+    for rotation in rotations:
+        if previous is None:
+            best = tuple(rotation)
+        else:
+            # Same orientation written with the middle axis flipped
+            flipped = [0.0, 0.0, 0.0]
+            flipped[i] = rotation[i] + 180.0
+            flipped[j] = 180.0 - rotation[j]
+            flipped[k] = rotation[k] + 180.0
+
+            best, best_distance = None, None
+            for candidate in (rotation, flipped):
+                candidate = tuple(_closest_angle(candidate[a], previous[a]) for a in range(3))
+                distance = sum(abs(candidate[a] - previous[a]) for a in range(3))
+                if best_distance is None or distance < best_distance:
+                    best, best_distance = candidate, distance
+
+        filtered.append(best)
+        previous = best
+
+    return filtered
+
+def move_pivots(new_pivot, rotate, scale, rotate_order=0, joint_orient=None, rotate_axis=None,
+                scale_pivot=(0, 0, 0), rotate_pivot=(0, 0, 0),
+                scale_pivot_translate=(0, 0, 0), rotate_pivot_translate=(0, 0, 0)):
+    """
+    Moves the rotate and scale pivots to new_pivot (object space) without moving the object,
+    like cmds.xform(rp=..., sp=...): the pivot translates absorb the difference.
+    Returns (scale_pivot_translate, rotate_pivot_translate) for the new pivots.
+    """
+    # Keep the scale part of the matrix: sp - sp * s + spt must not change
+    delta_sp = [new_pivot[a] - scale_pivot[a] for a in range(3)]
+    new_spt = tuple(scale_pivot_translate[a] - delta_sp[a] + delta_sp[a] * scale[a] for a in range(3))
+
+    # Keep the rotate part of the matrix: (X - rp) * R + rp + rpt must not change
+    rot = _rotation_chain(rotate, rotate_order, rotate_axis, joint_orient)
+    delta_rp = [new_pivot[a] - rotate_pivot[a] for a in range(3)]
+    rotated = _rotate_vector(delta_rp, rot)
+    new_rpt = tuple(rotate_pivot_translate[a] + rotated[a] - delta_rp[a] for a in range(3))
+
+    return new_spt, new_rpt
+
+def _linear_reduce(times, values, tolerance):
+    """
+    Ramer-Douglas-Peucker on a sampled curve: indices of the samples to keep so that
+    straight lines between them stay within tolerance of every sample.
+    """
+    keep = {0, len(times) - 1}
+    stack = [(0, len(times) - 1)]
+    while stack:
+        first, last = stack.pop()
+        t0, v0, t1, v1 = times[first], values[first], times[last], values[last]
+        slope = (v1 - v0) / (t1 - t0)
+        worst, worst_error = None, tolerance
+        for index in range(first + 1, last):
+            error = abs(v0 + slope * (times[index] - t0) - values[index])
+            if error > worst_error:
+                worst, worst_error = index, error
+        if worst is not None:
+            keep.add(worst)
+            stack.extend(((first, worst), (worst, last)))
+    return keep
+
+def spline_slopes(times, values):
+    """
+    Tangent slopes of Maya's "spline" tangents: the slope between the two neighbours of each key
+    (the slope to the only neighbour on the first and last keys).
+    """
+    count = len(times)
+    if count < 2:
+        return [0.0] * count
+    slopes = []
+    for index in range(count):
+        before, after = max(index - 1, 0), min(index + 1, count - 1)
+        slopes.append((values[after] - values[before]) / (times[after] - times[before]))
+    return slopes
+
+def _hermite(t, t0, v0, m0, t1, v1, m1):
+    dt = t1 - t0
+    s = (t - t0) / dt
+    s2, s3 = s * s, s * s * s
+    return ((2 * s3 - 3 * s2 + 1) * v0 + (s3 - 2 * s2 + s) * dt * m0
+            + (-2 * s3 + 3 * s2) * v1 + (s3 - s2) * dt * m1)
+
+def reduce_keys(times, values, tolerance):
+    """
+    Simplifies a curve sampled on every frame (e.g. a bake): returns the indices of the samples to keep as keys
+    so that the curve through them, with spline tangents, stays within tolerance of every sample.
+    The two first and two last samples are always kept, so the ends still match the keys around the range.
+    """
+    count = len(times)
+    if count <= 4 or tolerance <= 0:
+        return list(range(count))
+
+    # Straight-line reduction first, then keys are added where the spline curve moves away from the samples
+    keep = _linear_reduce(times, values, tolerance) | {1, count - 2}
+    while True:
+        kept = sorted(keep)
+        kept_times = [times[index] for index in kept]
+        kept_values = [values[index] for index in kept]
+        slopes = spline_slopes(kept_times, kept_values)
+
+        added = False
+        for key in range(len(kept) - 1):
+            first, last = kept[key], kept[key + 1]
+            worst, worst_error = None, tolerance
+            for index in range(first + 1, last):
+                error = abs(_hermite(times[index], kept_times[key], kept_values[key], slopes[key],
+                                     kept_times[key + 1], kept_values[key + 1], slopes[key + 1]) - values[index])
+                if error > worst_error:
+                    worst, worst_error = index, error
+            if worst is not None:
+                keep.add(worst)
+                added = True
+        if not added:
+            return kept
+
+# By Teo2103D
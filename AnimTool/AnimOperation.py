@@ -0,0 +1,100 @@
+import contextlib
+import functools
+import time
+import maya.cmds as cmds
+
+# By Teo2103D
+
+# Execution context shared by every AnimTool operation:
+# - one undo chunk for the whole operation (one Ctrl+Z undoes it, and the undo queue stays small)
+# - viewport refresh suspended while the operation runs (not in batch mode, there is no viewport)
+# - optional evaluation mode ("off" = DG, "serial", "parallel") for the duration
+# - everything is restored when the operation ends, also when it fails
+# - the duration of each operation is recorded in timings
+#
+# Operations can call each other: only the outermost one opens the chunk and changes the state.
+
+# Operation name -> list of durations (seconds) since the tools were loaded
+timings = {}
+
+# Name of the outermost operation running (None between operations), used by AnimProfiler
+current_name = None
+
+_depth = 0
+
+@contextlib.contextmanager
+def operation(name, suspend_refresh=True, evaluation_mode=None, record=True):
+    """
+    Runs the body of a with statement as one AnimTool operation:
+        with AnimOperation.operation("Follow"):
+            ...
+    record=False when the caller records the duration itself (AnimScheduler, for the whole job).
+    """
+    global _depth, current_name
+    outermost = _depth == 0
+    _depth += 1
+    if outermost:
+        current_name = name
+
+    previous_mode = None
+    refresh_suspended = False
+    start_time = time.perf_counter()
+
+    if outermost:
+        cmds.undoInfo(openChunk=True, chunkName=f"AnimTool {name}")
+    try:
+        if outermost:
+            if suspend_refresh and not cmds.about(batch=True):
+                cmds.refresh(suspend=True)
+                refresh_suspended = True
+            if evaluation_mode:
+                current_mode = cmds.evaluationManager(query=True, mode=True)
+                if current_mode and current_mode[0] != evaluation_mode:
+                    previous_mode = current_mode[0]
+                    cmds.evaluationManager(mode=evaluation_mode)
+        yield
+    finally:
+        _depth -= 1
+        if outermost:
+            current_name = None
+            try:
+                if previous_mode:
+                    cmds.evaluationManager(mode=previous_mode)
+                if refresh_suspended:
+                    cmds.refresh(suspend=False)
+            finally:
+                cmds.undoInfo(closeChunk=True)
+        if record:
+            record_timing(name, time.perf_counter() - start_time)
+
+def as_operation(name, **options):
+    """
+    Decorator version of operation():
+        @AnimOperation.as_operation("Follow")
+        def create_matched_groups_with_animation(...):
+    """
+    def decorator(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            with operation(name, **options):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorator
+
+def record_timing(name, duration):
+    """Adds a duration (seconds) to the timings of an operation (also used by AnimScheduler for its jobs)."""
+    timings.setdefault(name, []).append(duration)
+
+def get_timing_report():
+    """One line per operation: count, total, mean and max duration."""
+    lines = []
+    for name, durations in sorted(timings.items(), key=lambda item: -sum(item[1])):
+        total = sum(durations)
+        lines.append(f"{name}: {len(durations)} runs, total {total:.3f} s, "
+                     f"mean {total / len(durations):.3f} s, max {max(durations):.3f} s")
+    return lines
+
+def clear_timings():
+    timings.clear()
+
+# By Teo2103D
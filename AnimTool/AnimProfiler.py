@@ -0,0 +1,131 @@
+import collections
+import json
+import math
+import os
+import sys
+import time
+import maya.cmds as cmds
+import AnimOperation
+
+# By Teo2103D
+
+# Profiler of the maya.cmds calls made by the AnimTool scripts (AnimTool menu > Profile Maya Calls).
+#
+# When it is on, the "cmds" of every loaded AnimTool module is replaced by a proxy that times each call,
+# so every call is counted by tool (module) and by command, with a histogram of its durations.
+# Calls that make Maya evaluate the scene at another time are marked: timeline changes (currentTime)
+# and context evaluations (getAttr -time). Calls are also counted by AnimTool operation (AnimOperation).
+# When it is off, the modules get the real maya.cmds back: no cost at all.
+
+ANIM_TOOL_PATH = os.path.dirname(os.path.abspath(__file__))
+
+enabled = False
+
+# (tool, command) -> number of calls / total seconds / {histogram bucket: calls}
+call_counts = collections.Counter()
+call_seconds = collections.Counter()
+call_histograms = collections.defaultdict(collections.Counter)
+# (tool, "time change" or "context evaluation") -> number of calls
+evaluations = collections.Counter()
+# (operation, command) -> number of calls
+operation_counts = collections.Counter()
+
+def _bucket(seconds):
+    """Histogram bucket of a duration: upper bound in microseconds, powers of 2 ("<=64us")."""
+    microseconds = max(seconds * 1e6, 1.0)
+    return f"<={2 ** math.ceil(math.log2(microseconds))}us"
+
+def _record(tool, command, seconds, args, kwargs):
+    key = (tool, command)
+    call_counts[key] += 1
+    call_seconds[key] += seconds
+    call_histograms[key][_bucket(seconds)] += 1
+    operation_counts[(AnimOperation.current_name or "(no operation)", command)] += 1
+
+    if command == "currentTime" and args and not kwargs.get("query", kwargs.get("q")):
+        evaluations[(tool, "time change")] += 1
+    elif command == "getAttr" and ("time" in kwargs or "t" in kwargs):
+        evaluations[(tool, "context evaluation")] += 1
+
+class InstrumentedCmds(object):
+    """Stands for maya.cmds in one module and times every command called through it."""
+    def __init__(self, tool):
+        self._tool = tool
+
+    def __getattr__(self, name):
+        function = getattr(cmds, name)
+        if not callable(function):
+            return function
+        tool = self._tool
+
+        def command(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                _record(tool, name, time.perf_counter() - start, args, kwargs)
+
+        # Cached: the next calls to this command skip __getattr__
+        setattr(self, name, command)
+        return command
+
+def _tool_modules():
+    """Loaded modules of the AnimTool folder that use maya.cmds."""
+    modules = []
+    for module in list(sys.modules.values()):
+        path = getattr(module, "__file__", None)
+        if module is sys.modules[__name__] or not path or not hasattr(module, "cmds"):
+            continue
+        if os.path.abspath(path).startswith(ANIM_TOOL_PATH):
+            modules.append(module)
+    return modules
+
+def refresh():
+    """Instruments the AnimTool modules loaded since the profiler was turned on (lazily loaded tools)."""
+    if not enabled:
+        return
+    for module in _tool_modules():
+        if module.cmds is cmds:
+            module.cmds = InstrumentedCmds(module.__name__)
+
+def set_enabled(value, *args):
+    """Turns the profiler on or off for all the loaded AnimTool modules."""
+    global enabled
+    enabled = bool(value)
+    if enabled:
+        refresh()
+    else:
+        for module in _tool_modules():
+            if isinstance(module.cmds, InstrumentedCmds):
+                module.cmds = cmds
+
+def clear():
+    for table in (call_counts, call_seconds, call_histograms, evaluations, operation_counts):
+        table.clear()
+
+def get_report(top=20):
+    """Text summary: the most expensive commands by tool, then the scene evaluations."""
+    lines = [f"{'tool':<24}{'command':<22}{'calls':>8}{'total ms':>11}{'mean us':>10}"]
+    for (tool, command), seconds in call_seconds.most_common(top):
+        count = call_counts[(tool, command)]
+        lines.append(f"{tool:<24}{command:<22}{count:>8}{seconds * 1000:>11.2f}{seconds / count * 1e6:>10.1f}")
+    for (tool, kind), count in sorted(evaluations.items()):
+        lines.append(f"{tool}: {count} {kind}s")
+    return lines
+
+def dump(path):
+    """Writes everything recorded to a JSON file."""
+    data = {
+        "calls": [{"tool": tool, "command": command, "count": count,
+                   "seconds": round(call_seconds[(tool, command)], 6),
+                   "histogram": dict(call_histograms[(tool, command)])}
+                  for (tool, command), count in call_counts.most_common()],
+        "evaluations": [{"tool": tool, "kind": kind, "count": count} for (tool, kind), count in evaluations.items()],
+        "operations": [{"operation": operation, "command": command, "count": count}
+                       for (operation, command), count in operation_counts.most_common()],
+    }
+    with open(path, "w") as dump_file:
+        json.dump(data, dump_file, indent=2)
+    return path
+
+# By Teo2103D
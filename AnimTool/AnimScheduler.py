@@ -0,0 +1,211 @@
+import time
+import maya.cmds as cmds
+import maya.api.OpenMaya as om
+import AnimOperation
+
+# By Teo2103D
+
+# Cooperative execution of the long AnimTool operations (follow bakes, resets of large selections, pivot setup lists):
+# Maya stays usable while they run and they can be cancelled.
+#
+# A job is a generator: it does a small piece of work (one frame, one object...) between two yields
+# and yields its progress (index, count); its return value is the result of the operation.
+# A job only reads the scene (sampling, queries) until it yields EDIT: what comes after is its edits.
+# start() runs the job in slices of about SLICE_SECONDS on Maya's idle queue (evalDeferred -lowestPriority):
+# between two slices Maya redraws and handles the user. A small window shows the progress with a Cancel button.
+# - the slices only read: no undo chunk stays open while the user works, and cancelling has nothing to undo
+# - after EDIT the rest of the job runs at once, as one AnimOperation: one Ctrl+Z undoes the whole operation
+# - a failed job is reported with a warning (its edits, if it got that far, are undone)
+# - the jobs run one after the other, in the order they were started
+# - opening a scene or starting a new one drops all the jobs (they would go on in the next scene)
+# In batch mode (mayapy), or with the background execution off (AnimTool menu), the job runs to the end at once.
+
+# Background execution of the long operations (AnimTool menu)
+background = True
+
+# Work done per slice: short enough for Maya to stay responsive, long enough for the idle queue not to cost much
+SLICE_SECONDS = 0.05
+
+# Yielded by a job when it is done reading the scene: the rest of the job edits it, in one go
+EDIT = "edit"
+
+WINDOW = "AnimToolJobs"
+
+# Jobs started and not finished: the first one runs, the others wait
+_queue = []
+
+_callback_ids = []
+
+# A slice waits on the idle queue (never two: a job dropped with the scene may leave one behind)
+_scheduled = False
+
+def runs_in_background():
+    """True when start() runs the jobs in the background (not in batch mode, background execution on)."""
+    return background and not cmds.about(batch=True)
+
+def run_now(job):
+    """Runs a job to the end at once and returns its result (its edits go in the caller's undo chunk)."""
+    while True:
+        try:
+            next(job)
+        except StopIteration as stop:
+            return stop.value
+
+def start(name, job, on_done=None):
+    """
+    Runs a job as the AnimTool operation name: in the background when runs_in_background(), else at once.
+    on_done is called with the result of the job when it ends (not when it is cancelled or fails).
+    Returns the result when the job ran at once, else None.
+    """
+    if not runs_in_background():
+        with AnimOperation.operation(name):
+            result = run_now(job)
+        if on_done:
+            on_done(result)
+        return result
+
+    _install_callbacks()
+    _queue.append({"name": name, "job": job, "on_done": on_done,
+                   "progress": (0, 1), "cancelled": False, "duration": 0.0})
+    if len(_queue) == 1:
+        _schedule()
+    _update_window()
+    return None
+
+def cancel(all_jobs=False):
+    """Cancels the running job (stopped on its next slice), and the waiting ones with all_jobs."""
+    if not _queue:
+        return
+    if all_jobs:
+        del _queue[1:]
+    _queue[0]["cancelled"] = True
+    _update_window()
+
+def is_busy():
+    return bool(_queue)
+
+def _install_callbacks():
+    """Drops the jobs before a new scene or before a scene is opened (once per session)."""
+    if _callback_ids:
+        return
+    for message in (om.MSceneMessage.kBeforeNew, om.MSceneMessage.kBeforeOpen):
+        _callback_ids.append(om.MSceneMessage.addCallback(message, _on_scene_change))
+
+def _on_scene_change(*args):
+    """The scene is replaced: the jobs stop where they are."""
+    if not _queue:
+        return
+    names = [entry["name"] for entry in _queue]
+    for entry in list(_queue):
+        entry["job"].close()
+    del _queue[:]
+    _update_window()
+    cmds.warning(f"Scene changed: stopped {', '.join(names)}.")
+
+def _schedule():
+    global _scheduled
+    if not _scheduled:
+        _scheduled = True
+        cmds.evalDeferred(_run_slice, lowestPriority=True)
+
+def _run_slice():
+    """
+    Runs the first job of the queue for about SLICE_SECONDS, then gives Maya back until the next idle time.
+    Once the job yields EDIT, the rest of it runs at once in one undo chunk.
+    """
+    global _scheduled
+    _scheduled = False
+    if not _queue:
+        return
+    entry = _queue[0]
+    if entry["cancelled"]:
+        _finish(entry, aborted=True)
+        return
+
+    AnimOperation.current_name = entry["name"]
+    start_time = time.perf_counter()
+    editing, done, result = False, False, None
+    try:
+        # At least one step per slice, so the job moves on whatever SLICE_SECONDS is
+        while True:
+            progress = next(entry["job"])
+            if progress == EDIT:
+                editing = True
+                break
+            entry["progress"] = progress
+            if time.perf_counter() - start_time >= SLICE_SECONDS:
+                break
+    except StopIteration as stop:
+        done, result = True, stop.value
+    except Exception as exception:
+        _fail(entry, exception, start_time)
+        return
+    finally:
+        AnimOperation.current_name = None
+
+    if editing:
+        try:
+            with AnimOperation.operation(entry["name"], record=False):
+                result = run_now(entry["job"])
+        except Exception as exception:
+            # Only undo the chunk of the job: it is the last one, the edits ran without giving Maya back
+            if cmds.undoInfo(query=True, undoName=True) == f"AnimTool {entry['name']}":
+                cmds.undo()
+            _fail(entry, exception, start_time)
+            return
+        done = True
+
+    entry["duration"] += time.perf_counter() - start_time
+    if done:
+        _finish(entry, result=result)
+        return
+    _update_window()
+    _schedule()
+
+def _fail(entry, exception, start_time):
+    """Ends a job that raised an error: reported with a warning (an error raised on the idle queue is not shown)."""
+    entry["duration"] += time.perf_counter() - start_time
+    _finish(entry, aborted=True)
+    cmds.warning(f"{entry['name']} failed, the scene is back as it was: {exception}")
+
+def _finish(entry, result=None, aborted=False):
+    """Ends a job, records its duration (slices and edits) and starts the next job."""
+    _queue.remove(entry)
+    entry["job"].close()
+    AnimOperation.record_timing(entry["name"], entry["duration"])
+
+    if aborted:
+        if entry["cancelled"]:
+            print(f"{entry['name']} cancelled, the scene was not changed.")
+    elif entry["on_done"]:
+        entry["on_done"](result)
+
+    if _queue:
+        _schedule()
+    _update_window()
+
+def _update_window():
+    """Shows the running job in the progress window (closed when the queue is empty)."""
+    if not _queue:
+        if cmds.window(WINDOW, exists=True):
+            cmds.deleteUI(WINDOW)
+        return
+
+    if not cmds.window(WINDOW, exists=True):
+        cmds.window(WINDOW, title="AnimTool", widthHeight=(300, 90))
+        cmds.columnLayout(adjustableColumn=True)
+        cmds.text(f"{WINDOW}_status", label="")
+        cmds.progressBar(f"{WINDOW}_progress", maxValue=1)
+        cmds.button(label="Cancel", command=lambda *_: cancel())
+        cmds.button(label="Cancel All", command=lambda *_: cancel(all_jobs=True))
+        cmds.showWindow(WINDOW)
+
+    entry = _queue[0]
+    index, count = entry["progress"]
+    status = f"{entry['name']}: cancelling..." if entry["cancelled"] else f"{entry['name']}: {index} / {count}"
+    if len(_queue) > 1:
+        status += f" ({len(_queue) - 1} waiting)"
+    cmds.text(f"{WINDOW}_status", edit=True, label=status)
+    cmds.progressBar(f"{WINDOW}_progress", edit=True, maxValue=max(count, 1), progress=index)
+
+# By Teo2103D
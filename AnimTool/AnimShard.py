@@ -0,0 +1,154 @@
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import maya.cmds as cmds
+import AnimBake
+
+# By Teo2103D
+
+# Sharded sampling for long bakes (FollowAnimTool over thousands of frames, whole-range IK/FK switch...).
+#
+# The scene is exported to a temporary file, the frame range is split into chunks and every chunk is sampled
+# by its own mayapy process on that copy. The interactive session only merges the sampled matrices back in
+# frame order: the matrices do not depend on the chunks, and the conversion to Euler values (with the Euler
+# filter) is done once on the merged range, so the keys are continuous across the chunk boundaries.
+#
+# AnimBake.sample_matrices uses it on its own for long ranges when mayapy is found; short ranges, or a Maya
+# without mayapy, keep the single-process sampling. The background jobs (AnimScheduler) use iter_sample_matrices:
+# Maya stays usable while the workers run, and cancelling the job stops them.
+#
+# Worker side (started by this module): mayapy AnimShard.py job.json
+
+# Sharding on/off (AnimTool menu) and its settings
+enabled = True
+MIN_FRAMES = 2000          # Shorter ranges are faster in-process (starting mayapy takes a few seconds)
+MAX_WORKERS = 4
+POLL_INTERVAL = 0.02       # Seconds between two checks of the workers (and of the Esc key), short for the background jobs
+
+ANIM_TOOL_PATH = os.path.dirname(os.path.abspath(__file__))
+
+def get_mayapy():
+    """Path of the mayapy executable of the running Maya, or None."""
+    maya_location = os.environ.get("MAYA_LOCATION")
+    if not maya_location:
+        return None
+    mayapy = os.path.join(maya_location, "bin", "mayapy.exe" if os.name == "nt" else "mayapy")
+    return mayapy if os.path.isfile(mayapy) else None
+
+def get_worker_count(frames):
+    return max(1, min(MAX_WORKERS, (os.cpu_count() or 2) - 1, len(frames) // (MIN_FRAMES // 2)))
+
+def should_shard(frames):
+    """True if a range this long is worth sampling in worker processes."""
+    return enabled and len(frames) >= MIN_FRAMES and get_worker_count(frames) > 1 and get_mayapy() is not None
+
+def split_frames(frames, count):
+    """Splits the frames into count contiguous chunks of (almost) the same size."""
+    size, extra = divmod(len(frames), count)
+    chunks, start = [], 0
+    for index in range(count):
+        end = start + size + (1 if index < extra else 0)
+        chunks.append(frames[start:end])
+        start = end
+    return [chunk for chunk in chunks if chunk]
+
+def _stop(processes):
+    for process in processes:
+        if process.poll() is None:
+            process.kill()
+
+def sample_matrices(plugs, frames, progress=None):
+    """
+    Same result as AnimBake.sample_matrices, computed by worker processes on a copy of the scene.
+    Returns {plug: [matrix per frame]}, or None if cancelled (the workers are then stopped).
+    Raises RuntimeError if a worker fails.
+    """
+    samples = {}
+    job = iter_sample_matrices(plugs, frames, samples)
+    try:
+        # The progress moves by chunk, Esc is checked on every wait
+        for done, count in job:
+            if progress and (not progress(done, count) or AnimBake.progress_cancelled()):
+                return None
+    finally:
+        job.close()
+    return samples
+
+def iter_sample_matrices(plugs, frames, samples):
+    """
+    Job version of sample_matrices for AnimScheduler: starts the workers and yields the progress (frames done, count)
+    between two checks of the workers, then fills samples ({plug: [matrix, ...]}) once they are all done.
+    Closing the job (cancel) stops the workers. Raises RuntimeError if a worker fails.
+    """
+    temp_folder = tempfile.mkdtemp(prefix="AnimShard_")
+    processes, logs = [], []
+    try:
+        # Copy of the scene as it is now (unsaved changes and helper groups included)
+        scene = os.path.join(temp_folder, "scene.mb")
+        cmds.file(scene, force=True, exportAll=True, preserveReferences=True, type="mayaBinary")
+
+        chunks = split_frames(list(frames), get_worker_count(frames))
+        outputs = []
+        for index, chunk in enumerate(chunks):
+            job = os.path.join(temp_folder, f"job_{index}.json")
+            outputs.append(os.path.join(temp_folder, f"samples_{index}.json"))
+            with open(job, "w") as job_file:
+                json.dump({"scene": scene, "plugs": list(plugs), "frames": chunk, "output": outputs[-1]}, job_file)
+            # Output in a log file: a full pipe would block the worker
+            logs.append(open(os.path.join(temp_folder, f"worker_{index}.log"), "w"))
+            processes.append(subprocess.Popen([get_mayapy(), os.path.abspath(__file__), job],
+                                              stdout=logs[-1], stderr=subprocess.STDOUT))
+
+        # Wait for the workers, giving the hand back between two checks
+        while any(process.poll() is None for process in processes):
+            yield sum(len(chunk) for chunk, process in zip(chunks, processes) if process.poll() is not None), len(frames)
+            time.sleep(POLL_INTERVAL)
+
+        for chunk_index, (process, log) in enumerate(zip(processes, logs)):
+            if process.returncode:
+                log.close()
+                with open(log.name, errors="replace") as log_file:
+                    error = log_file.read().strip().splitlines()
+                raise RuntimeError(f"Bake worker {chunk_index} failed: {error[-1] if error else process.returncode}")
+
+        # Merge back in frame order
+        for plug in plugs:
+            samples[plug] = []
+        for output in outputs:
+            with open(output) as output_file:
+                chunk_samples = json.load(output_file)
+            for plug in plugs:
+                samples[plug].extend(chunk_samples[plug])
+    finally:
+        _stop(processes)
+        for process in processes:
+            process.wait()
+        for log in logs:
+            log.close()
+        shutil.rmtree(temp_folder, ignore_errors=True)
+
+def run_worker(job_path):
+    """Worker process: opens the copy of the scene and samples its chunk of frames."""
+    with open(job_path) as job_file:
+        job = json.load(job_file)
+
+    for path in (ANIM_TOOL_PATH, os.path.join(ANIM_TOOL_PATH, "SwitchIKFK")):
+        if path not in sys.path:
+            sys.path.append(path)
+
+    import maya.standalone
+    maya.standalone.initialize(name="python")
+
+    cmds.file(job["scene"], open=True, force=True, prompt=False)
+    samples = AnimBake.sample_matrices(job["plugs"], job["frames"], allow_shards=False)
+    with open(job["output"], "w") as output_file:
+        json.dump(samples, output_file)
+
+if __name__ == "__main__":
+    run_worker(sys.argv[1])
+
+# By Teo2103D
@@ -5,98 +5,191 @@ import importlib
 
 #By Teo2103D
 
-# Automatically retrieves the "scripts" folder path in Maya
-maya_scripts_path = os.path.join(os.path.expanduser("~"), "Documents", "maya", "scripts")
-sys.path.append(maya_scripts_path)
+# Folder of the AnimTool scripts: the one of this file (and its SwitchIKFK folder when the tree is kept as is)
+anim_tool_path = os.path.dirname(os.path.abspath(__file__))
+for path in (anim_tool_path, os.path.join(anim_tool_path, "SwitchIKFK")):
+    if os.path.isdir(path) and path not in sys.path:
+        sys.path.append(path)
 
-def run_follow_tool(*args):
-    """Loads and executes FollowAnimTool.py"""
+import ResetTool
+import AnimShard
+import AnimBake
+import AnimOperation
+import AnimProfiler
+import AnimScheduler
+import SwitchTargets
+
+# Tools of the menu: name -> (module, entry point function).
+# A tool module is only imported the first time it is launched, then the loaded module is reused:
+# importing a tool has no side effect, the entry point does the work.
+TOOLS = {
+    "FollowAnimTool": ("FollowAnimTool", "open_ui"),
+    "UnlockRot_ScalePivot": ("UnlockRot_ScalePivot", "unlock_pivot_attributes"),
+    "MovePivotTool": ("MovePivotTool", "open_object_selection_ui"),
+    "OnIk": ("OnIk", "create_group_based_on_selection"),
+    "OnFk": ("OnFk", "create_three_groups_with_constraints_and_prefix"),
+    "SwitchSetupBatch": ("SwitchSetupBatch", "set_up_selected_rigs"),
+    "SwitchIkFk": ("SwitchIkFk", "detect_unique_locator_names"),
+}
+
+# Shared modules reloaded before a tool in dev mode, in dependency order
+SHARED_MODULES = ["AnimMath", "AnimOperation", "AnimBake", "AnimShard", "AnimScheduler",
+                  "LimbNaming", "SwitchTargets", "SwitchRigRegistry", "OnIk"]
+
+# Module state kept through a dev reload: the options of this menu, and what the session holds
+# (timings, naming profile, registered callbacks and the registry cache)
+KEPT_STATE = {
+    "AnimOperation": ["timings"],
+    "AnimBake": ["reduce_keys", "key_tolerances"],
+    "AnimShard": ["enabled"],
+    "AnimScheduler": ["background", "_callback_ids"],
+    "LimbNaming": ["_config", "active_profile"],
+    "SwitchTargets": ["store_offsets"],
+    "SwitchRigRegistry": ["_entries", "_pending", "_callback_ids"],
+}
+
+# Dev mode: reload the shared modules and the tool on every launch to pick up code changes
+dev_mode = False
+
+_loaded_tools = {}
+
+def set_dev_mode(value, *args):
+    global dev_mode
+    dev_mode = bool(value)
+
+def set_sharded_bakes(value, *args):
+    """Long bakes (from AnimShard.MIN_FRAMES frames) are sampled by mayapy worker processes."""
+    AnimShard.enabled = bool(value)
+
+def set_switch_stored_offsets(value, *args):
+    """OnIk, OnFk and the batch setup store the switch targets on the joints instead of creating locators."""
+    SwitchTargets.store_offsets = bool(value)
+
+def set_background_operations(value, *args):
+    """Long operations (follow bakes, resets, pivot lists) run in the background with a Cancel button (AnimScheduler)."""
+    AnimScheduler.background = bool(value)
+
+def set_key_reduction(value, *args):
+    """Bakes keep only the keys needed to stay within AnimBake.key_tolerances."""
+    AnimBake.reduce_keys = bool(value)
+
+def set_key_tolerances(*args):
+    """Asks for the key reduction tolerances (units and degrees)."""
+    result = cmds.promptDialog(title="Key Reduction", message="Tolerance (units, degrees):",
+                               text=f"{AnimBake.key_tolerances['doubleLinear']}, {AnimBake.key_tolerances['doubleAngle']}",
+                               button=["OK", "Cancel"], defaultButton="OK", cancelButton="Cancel")
+    if result != "OK":
+        return
     try:
-        import FollowAnimTool
-        importlib.reload(FollowAnimTool)
-    except Exception as e:
-        cmds.warning(f"FollowAnimTool Error: {e}")
+        linear, angular = [float(value) for value in cmds.promptDialog(query=True, text=True).split(",")]
+    except ValueError:
+        cmds.warning("Enter two numbers: units, degrees (e.g. 0.01, 0.1).")
+        return
+    AnimBake.key_tolerances.update(doubleLinear=linear, doubleAngle=angular)
 
-def run_UnlockRot_ScalePivot(*args):
-    """Loads and executes UnlockRot_ScalePivot.py"""
+def print_operation_timings(*args):
+    """Prints how long each AnimTool operation took since the tools were loaded."""
+    lines = AnimOperation.get_timing_report()
+    print("AnimTool operation timings:\n" + ("\n".join(lines) if lines else "No operation yet."))
+
+def set_profiling(value, *args):
+    """Times every maya.cmds call of the AnimTool scripts (see AnimProfiler)."""
+    AnimProfiler.set_enabled(value)
+
+def dump_profile(*args):
+    """Prints the profile summary and writes the full profile to a JSON file."""
+    print("AnimTool Maya call profile:\n" + "\n".join(AnimProfiler.get_report()))
+    path = cmds.fileDialog2(fileFilter="JSON (*.json)", dialogStyle=2, fileMode=0, caption="Save Profile")
+    if path:
+        print(f"Profile written to {AnimProfiler.dump(path[0])}")
+
+def clear_profile(*args):
+    AnimProfiler.clear()
+    AnimOperation.clear_timings()
+
+def get_tool_module(name):
+    """
+    Returns the module of a tool, imported on first use and cached.
+    In dev mode, the shared modules and the tool are reloaded every time.
+    """
+    module_name = TOOLS[name][0]
+    module = _loaded_tools.get(module_name)
+    if module is None:
+        module = importlib.import_module(module_name)
+        _loaded_tools[module_name] = module
+    elif dev_mode:
+        reload_shared_modules()
+        module = importlib.reload(module)
+        _loaded_tools[module_name] = module
+    # The tool (and what it imported) is loaded now: instrument it if the profiler is on
+    AnimProfiler.refresh()
+    return module
+
+def reload_shared_modules():
+    """
+    Reloads the shared modules already loaded, keeping their KEPT_STATE (the menu options stay as they are shown).
+    AnimScheduler is left as it is while it has jobs.
+    """
+    for shared_name in SHARED_MODULES:
+        shared_module = sys.modules.get(shared_name)
+        if shared_module is None or (shared_name == "AnimScheduler" and AnimScheduler.is_busy()):
+            continue
+        state = {attr: getattr(shared_module, attr) for attr in KEPT_STATE.get(shared_name, [])}
+        importlib.reload(shared_module)
+        for attr, value in state.items():
+            setattr(shared_module, attr, value)
+
+def run_tool(name, *args):
+    """Launches a tool through its entry point."""
     try:
-        import UnlockRot_ScalePivot
-        importlib.reload(UnlockRot_ScalePivot)
+        getattr(get_tool_module(name), TOOLS[name][1])()
     except Exception as e:
-        cmds.warning(f"UnlockRot_ScalePivot Error: {e}")
+        cmds.warning(f"{name} Error: {e}")
+
+def run_follow_tool(*args):
+    """Opens FollowAnimTool"""
+    run_tool("FollowAnimTool")
+
+def run_UnlockRot_ScalePivot(*args):
+    """Unlocks the pivots of the selection (UnlockRot_ScalePivot)"""
+    run_tool("UnlockRot_ScalePivot")
         
 def run_move_pivot_tool(*args):
-    """Loads and executes MovePivotTool.py"""
-    try:
-        import MovePivotTool
-        importlib.reload(MovePivotTool)
-    except Exception as e:
-        cmds.warning(f"MovePivotTool Error: {e}")
+    """Opens MovePivotTool"""
+    run_tool("MovePivotTool")
 
 def run_SetUpSwitch_OnIk_tool(*args):
-    """Loads and executes OnIk.py"""
-    try:
-        import OnIk
-        importlib.reload(OnIk)
-    except Exception as e:
-        cmds.warning(f"OnIk Error: {e}")
+    """Creates the switch locators on the selected IK chain (OnIk)"""
+    run_tool("OnIk")
 
 def run_SetUpSwitch_OnFk_tool(*args):
-    """Loads and executes OnFk.py"""
-    try:
-        import OnFk
-        importlib.reload(OnFk)
-    except Exception as e:
-        cmds.warning(f"OnFk Error: {e}")
+    """Creates the switch locators on the selected FK chain (OnFk)"""
+    run_tool("OnFk")
+
+def run_SetUpSwitch_batch_tool(*args):
+    """Creates the switch locators of every limb of the selected rigs (SwitchSetupBatch)"""
+    run_tool("SwitchSetupBatch")
 
 def run_Switch_FkIk_tool(*args):
-    """Loads and executes SwitchIkFk.py"""
-    try:
-        import SwitchIkFk
-        importlib.reload(SwitchIkFk)
-    except Exception as e:
-        cmds.warning(f"SwitchIkFk Error: {e}")
+    """Opens SwitchIkFk"""
+    run_tool("SwitchIkFk")
 
 # Reset functions
+# Reset mode chosen in the Reset menu (current frame, playback range or keys in the playback range)
+reset_mode = ResetTool.CURRENT_FRAME
+
+def set_reset_mode(mode, *args):
+    global reset_mode
+    reset_mode = mode
+
 def reset_to_defaults(option, *args):
     selected_objects = cmds.ls(selection=True)
     if not selected_objects:
         cmds.warning("Please select at least one object.")
         return
-    
-    for obj in selected_objects:
-        if option == "All":
-            attributes = cmds.listAttr(obj, keyable=True) or []
-            for attr in attributes:
-                default_value = cmds.attributeQuery(attr, node=obj, listDefault=True)
-                if default_value:
-                    try:
-                        cmds.setAttr(f"{obj}.{attr}", default_value[0])
-                    except:
-                        pass
-        elif option == "Transforms":
-            for transform in ["translate", "rotate", "scale"]:
-                for axis in "XYZ":
-                    attr = f"{transform}{axis}"
-                    if cmds.attributeQuery(attr, node=obj, exists=True):
-                        try:
-                            default_value = cmds.attributeQuery(attr, node=obj, listDefault=True)
-                            if default_value:
-                                cmds.setAttr(f"{obj}.{attr}", default_value[0])
-                        except:
-                            pass
-        elif option == "Other":
-            transform_attrs = {f"{t}{a}" for t in ["translate", "rotate", "scale"] for a in "XYZ"}
-            attributes = cmds.listAttr(obj, keyable=True) or []
-            for attr in attributes:
-                if attr not in transform_attrs:
-                    default_value = cmds.attributeQuery(attr, node=obj, listDefault=True)
-                    if default_value:
-                        try:
-                            cmds.setAttr(f"{obj}.{attr}", default_value[0])
-                        except:
-                            pass
-    print(f"Reset {option} completed.")
+
+    AnimScheduler.start("Reset", ResetTool.iter_reset_attributes(selected_objects, option, mode=reset_mode),
+                        on_done=lambda count: print(f"Reset {option} completed."))
 
 def reset_selected_attributes(*args):
     selected_objects = cmds.ls(selection=True)
@@ -107,15 +200,9 @@ def reset_selected_attributes(*args):
     if not selected_attrs:
         cmds.warning("No attributes selected in the Channel Box.")
         return
-    for obj in selected_objects:
-        for attr in selected_attrs:
-            default_value = cmds.attributeQuery(attr, node=obj, listDefault=True)
-            if default_value:
-                try:
-                    cmds.setAttr(f"{obj}.{attr}", default_value[0])
-                except:
-                    pass
-    print("Reset of selected attributes completed.")
+    AnimScheduler.start("Reset", ResetTool.iter_reset_attributes(selected_objects, "Selection", selected_attrs,
+                                                                 mode=reset_mode),
+                        on_done=lambda count: print("Reset of selected attributes completed."))
 
 
 def create_anim_tool_menu():
@@ -141,6 +228,9 @@ def create_anim_tool_menu():
     switch_menu = cmds.menuItem(label="Switch IkFk", subMenu=True, parent=menu_name, tearOff=True)  # Spécifiez explicitement `parent=menu_name`
     cmds.menuItem(label="Loc On Ik", parent=switch_menu, command=run_SetUpSwitch_OnIk_tool)
     cmds.menuItem(label="Loc On Fk", parent=switch_menu, command=run_SetUpSwitch_OnFk_tool)
+    cmds.menuItem(label="Loc On Selected Rigs (Batch)", parent=switch_menu, command=run_SetUpSwitch_batch_tool)
+    cmds.menuItem(label="Store Offsets (No Locators)", parent=switch_menu, checkBox=SwitchTargets.store_offsets,
+                  command=set_switch_stored_offsets)
     cmds.menuItem(label="Switch", parent=switch_menu, command=run_Switch_FkIk_tool)
     
     # Créez le sous-menu "Reset" sous le menu principal
@@ -149,6 +239,29 @@ def create_anim_tool_menu():
     cmds.menuItem(label="Transforms Only", parent=reset_menu, command=lambda _: reset_to_defaults("Transforms"))
     cmds.menuItem(label="Other (Attributes Only)", parent=reset_menu, command=lambda _: reset_to_defaults("Other"))
     cmds.menuItem(label="Selection Attributes", parent=reset_menu, command=reset_selected_attributes)
+    cmds.menuItem(divider=True, parent=reset_menu)
+    cmds.radioMenuItemCollection(parent=reset_menu)
+    cmds.menuItem(label="At Current Frame", parent=reset_menu, radioButton=(reset_mode == ResetTool.CURRENT_FRAME),
+                  command=lambda _: set_reset_mode(ResetTool.CURRENT_FRAME))
+    cmds.menuItem(label="Over Playback Range", parent=reset_menu, radioButton=(reset_mode == ResetTool.FRAME_RANGE),
+                  command=lambda _: set_reset_mode(ResetTool.FRAME_RANGE))
+    cmds.menuItem(label="Keys Only (Playback Range)", parent=reset_menu, radioButton=(reset_mode == ResetTool.KEYS_ONLY),
+                  command=lambda _: set_reset_mode(ResetTool.KEYS_ONLY))
+
+    # Bake and dev options
+    cmds.menuItem(divider=True, parent=menu_name)
+    cmds.menuItem(label="Sharded Long Bakes (Worker Processes)", parent=menu_name, checkBox=AnimShard.enabled,
+                  command=set_sharded_bakes)
+    cmds.menuItem(label="Long Operations In Background", parent=menu_name, checkBox=AnimScheduler.background,
+                  command=set_background_operations)
+    cmds.menuItem(label="Cancel Background Operations", parent=menu_name, command=lambda *_: AnimScheduler.cancel(True))
+    cmds.menuItem(label="Reduce Baked Keys", parent=menu_name, checkBox=AnimBake.reduce_keys, command=set_key_reduction)
+    cmds.menuItem(label="Key Reduction Tolerance...", parent=menu_name, command=set_key_tolerances)
+    cmds.menuItem(label="Print Operation Timings", parent=menu_name, command=print_operation_timings)
+    cmds.menuItem(label="Profile Maya Calls", parent=menu_name, checkBox=AnimProfiler.enabled, command=set_profiling)
+    cmds.menuItem(label="Dump Profile...", parent=menu_name, command=dump_profile)
+    cmds.menuItem(label="Clear Profile And Timings", parent=menu_name, command=clear_profile)
+    cmds.menuItem(label="Reload Tools On Launch (Dev)", parent=menu_name, checkBox=dev_mode, command=set_dev_mode)
 
 # Executes the script to create the menu
 create_anim_tool_menu()
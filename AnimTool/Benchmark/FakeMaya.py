@@ -0,0 +1,1207 @@
+import collections
+import fnmatch
+import re
+import sys
+import types
+import uuid as uuid_module
+
+# By Teo2103D
+
+# In-memory stand-in for maya.cmds (and the few maya.api.OpenMaya classes the tools use),
+# so the AnimTool scripts can be run, counted and timed outside Maya.
+#
+# It keeps a real DAG with transforms, locators, joints, constraints, animCurves and time, and computes
+# world matrices with AnimMath (offsetParentMatrix included, driven by multMatrix/pickMatrix nodes). It is not a Maya replacement: constraints are simplified (parent/point/orient,
+# first target wins), curves are linear, and UI commands only return names.
+#
+# Every command call is counted, and a simple cost model estimates what the same calls would cost in Maya:
+# a fixed latency per command, a scene-wide evaluation on every currentTime change, a per-node cost for
+# context evaluations (getAttr -time) and for full scene listings.
+
+import AnimMath
+
+# Cost model (seconds), tuned to the orders of magnitude seen in a heavy Maya scene
+CALL_LATENCY = 20e-6             # Any cmds call (Python -> MEL -> command engine)
+TIME_CHANGE_COST_PER_NODE = 2e-7  # currentTime -edit re-evaluates the whole scene
+NODE_EVAL_COST = 1e-6            # One node evaluated in a context evaluation
+SCAN_COST_PER_NODE = 5e-8        # ls / listing every node of the scene
+
+TRANSFORM_TYPES = {"transform", "joint"}
+
+SHORT_NAMES = {
+    "t": "translate", "r": "rotate", "s": "scale", "v": "visibility", "ro": "rotateOrder",
+    "rp": "rotatePivot", "sp": "scalePivot", "rpt": "rotatePivotTranslate", "spt": "scalePivotTranslate",
+    "ra": "rotateAxis", "jo": "jointOrient", "ktv": "keyTimeValue",
+}
+for _short, _long in list(SHORT_NAMES.items()):
+    if _long in ("translate", "rotate", "scale", "rotatePivot", "scalePivot", "rotatePivotTranslate",
+                 "scalePivotTranslate", "rotateAxis", "jointOrient"):
+        for _axis in "xyz":
+            SHORT_NAMES[f"{_short}{_axis}"] = f"{_long}{_axis.upper()}"
+
+VECTOR_ATTRS = ["translate", "rotate", "scale", "rotatePivot", "scalePivot",
+                "rotatePivotTranslate", "scalePivotTranslate", "rotateAxis"]
+ANGLE_ATTRS = ("rotate", "rotateAxis", "jointOrient")
+KEYABLE_TRANSFORM_ATTRS = [f"{a}{x}" for a in ("translate", "rotate", "scale") for x in "XYZ"] + ["visibility"]
+MATRIX_ATTRS = ("worldMatrix", "worldInverseMatrix", "parentMatrix", "parentInverseMatrix", "matrix", "inverseMatrix")
+
+def _transform_defaults(joint=False):
+    defaults = {f"{attr}{axis}": 1.0 if attr == "scale" else 0.0 for attr in VECTOR_ATTRS for axis in "XYZ"}
+    if joint:
+        defaults.update({f"jointOrient{axis}": 0.0 for axis in "XYZ"})
+    defaults.update(rotateOrder=0, visibility=1.0, overrideEnabled=0, overrideColor=0, overrideDisplayType=0)
+    defaults["offsetParentMatrix"] = list(AnimMath.IDENTITY)
+    return defaults
+
+# Built-in attributes and defaults, shared by all the nodes of a type (a 100k nodes scene stays light)
+TYPE_DEFAULTS = {"transform": _transform_defaults(), "joint": _transform_defaults(joint=True)}
+TYPE_KEYABLE = {"transform": frozenset(KEYABLE_TRANSFORM_ATTRS), "joint": frozenset(KEYABLE_TRANSFORM_ATTRS)}
+
+class Node(object):
+    __slots__ = ("name", "type", "uuid", "parent", "children", "attrs", "defaults", "keyable", "user_defined",
+                 "locked", "targets", "constraints", "keys")
+
+    def __init__(self, name, node_type):
+        self.name = name
+        self.type = node_type
+        self.uuid = str(uuid_module.uuid4()).upper()
+        self.parent = None
+        self.children = []
+        self.attrs = {}                                   # Values set on this node only
+        self.defaults = TYPE_DEFAULTS.get(node_type, {})  # Copied before a dynamic attribute is added
+        self.keyable = TYPE_KEYABLE.get(node_type, frozenset())
+        self.user_defined = []
+        self.locked = set()
+        self.targets = []        # Constraints: [(target node name, offset matrix)]
+        self.constraints = {}    # Transforms: {constraint type: constraint node driving them}
+        self.keys = []           # animCurves: sorted [(time, value)]
+
+    def has(self, attr):
+        return attr in self.attrs or attr in self.defaults
+
+class FakeCallbacks(object):
+    """Callbacks registered through the fake OpenMaya, fired by the scene."""
+    def __init__(self):
+        self.next_id = 1
+        self.added, self.removed, self.renamed, self.scene = {}, {}, {}, {}
+
+    def add(self, table, function, node_type=None):
+        callback_id = self.next_id
+        self.next_id += 1
+        table[callback_id] = (function, node_type)
+        return callback_id
+
+    def remove(self, ids):
+        for table in (self.added, self.removed, self.renamed, self.scene):
+            for callback_id in ids:
+                table.pop(callback_id, None)
+
+class FakeScene(object):
+    def __init__(self):
+        self.nodes = {}
+        self.by_uuid = {}
+        self.connections = {}                            # destination plug -> source plug
+        self.outgoing = collections.defaultdict(set)     # node -> destination plugs fed by this node
+        self.incoming = collections.defaultdict(set)     # node -> destination plugs on this node
+        self.current_time = 1.0
+        self.min_time, self.max_time = 1.0, 120.0
+        self.selection = []
+        self.clipboard = []
+        self.callbacks = FakeCallbacks()
+        self.version = 0
+        self.world_cache = {}
+        self.stats = collections.Counter()
+        self.simulated_time = 0.0
+        self.batch = False   # cmds.about(batch=True)
+        self.deferred = []   # cmds.evalDeferred queue, run by run_deferred() (Maya runs it when idle)
+
+    def run_deferred(self):
+        """Runs the deferred commands as Maya does when it is idle, until none is left. Returns how many ran."""
+        count = 0
+        while self.deferred:
+            self.deferred.pop(0)()
+            count += 1
+        return count
+
+    # --- Nodes -------------------------------------------------------------------------------
+
+    def unique_name(self, name):
+        if name not in self.nodes:
+            return name
+        base = re.sub(r"\d+$", "", name)
+        index = 1
+        while f"{base}{index}" in self.nodes:
+            index += 1
+        return f"{base}{index}"
+
+    def create(self, node_type, name=None, parent=None):
+        name = self.unique_name(name or f"{node_type}1")
+        node = Node(name, node_type)
+        self.nodes[name] = node
+        self.by_uuid[node.uuid] = node
+        if parent is not None:
+            self.reparent(node, self.node(parent))
+        self.changed()
+        for function, callback_type in list(self.callbacks.added.values()):
+            if callback_type in (None, node_type):
+                function(FakeMObject(node), None)
+        return node
+
+    def node(self, name):
+        if isinstance(name, Node):
+            return name
+        if name in self.nodes:
+            return self.nodes[name]
+        if name in self.by_uuid:
+            return self.by_uuid[name]
+        short = name.split('|')[-1]
+        if short in self.nodes:
+            return self.nodes[short]
+        raise ValueError(f"No object matches name: {name}")
+
+    def exists(self, name):
+        try:
+            self.node(name)
+            return True
+        except ValueError:
+            return False
+
+    def long_name(self, node):
+        names = []
+        while node is not None:
+            names.append(node.name)
+            node = node.parent
+        return "|" + "|".join(reversed(names))
+
+    def reparent(self, node, parent):
+        if node.parent is not None:
+            node.parent.children.remove(node)
+        node.parent = parent
+        if parent is not None:
+            parent.children.append(node)
+        self.changed()
+
+    def rename(self, node, new_name):
+        new_name = self.unique_name(new_name)
+        del self.nodes[node.name]
+        for plug in list(self.connections):
+            source = self.connections.pop(plug)
+            self.connections[_rename_plug(plug, node.name, new_name)] = _rename_plug(source, node.name, new_name)
+        for table in (self.outgoing, self.incoming):
+            for key in list(table):
+                plugs = {_rename_plug(p, node.name, new_name) for p in table.pop(key)}
+                table[new_name if key == node.name else key] = plugs
+        node.name = new_name
+        self.nodes[new_name] = node
+        for function, _ in list(self.callbacks.renamed.values()):
+            function(FakeMObject(node), "", None)
+        return new_name
+
+    def delete(self, node):
+        for child in list(node.children):
+            self.delete(child)
+        for function, callback_type in list(self.callbacks.removed.values()):
+            if callback_type in (None, node.type):
+                function(FakeMObject(node), None)
+        for plug in list(self.incoming.pop(node.name, ())) + list(self.outgoing.pop(node.name, ())):
+            self.disconnect(plug)
+        if node.parent is not None:
+            node.parent.children.remove(node)
+        if node.parent is not None and node.parent.constraints.get(node.type) is node:
+            del node.parent.constraints[node.type]
+        del self.nodes[node.name]
+        del self.by_uuid[node.uuid]
+        self.changed()
+
+    # --- Connections -------------------------------------------------------------------------
+
+    def connect(self, source, destination):
+        self.disconnect(destination)
+        self.connections[destination] = source
+        self.outgoing[source.split('.')[0]].add(destination)
+        self.incoming[destination.split('.')[0]].add(destination)
+        self.changed()
+
+    def disconnect(self, destination):
+        source = self.connections.pop(destination, None)
+        if source:
+            self.outgoing[source.split('.')[0]].discard(destination)
+            self.incoming[destination.split('.')[0]].discard(destination)
+
+    def anim_curve(self, node, attr):
+        source = self.connections.get(f"{node.name}.{attr}")
+        if source:
+            curve = self.nodes.get(source.split('.')[0])
+            if curve is not None and curve.type.startswith("animCurve"):
+                return curve
+        return None
+
+    def changed(self):
+        self.version += 1
+        self.world_cache.clear()
+
+    # --- Evaluation --------------------------------------------------------------------------
+
+    def value(self, node, attr, time=None):
+        curve = self.anim_curve(node, attr)
+        if curve is not None:
+            return evaluate_curve(curve.keys, self.current_time if time is None else time)
+        return node.attrs.get(attr, node.defaults.get(attr, 0.0))
+
+    def vector(self, node, attr, time=None):
+        return tuple(self.value(node, f"{attr}{axis}", time) for axis in "XYZ")
+
+    def local_matrix(self, node, time):
+        kwargs = dict(rotate_order=int(self.value(node, "rotateOrder", time)),
+                      rotate_axis=self.vector(node, "rotateAxis", time),
+                      scale_pivot=self.vector(node, "scalePivot", time),
+                      rotate_pivot=self.vector(node, "rotatePivot", time),
+                      scale_pivot_translate=self.vector(node, "scalePivotTranslate", time),
+                      rotate_pivot_translate=self.vector(node, "rotatePivotTranslate", time))
+        if node.type == "joint":
+            kwargs["joint_orient"] = self.vector(node, "jointOrient", time)
+        return AnimMath.compose([self.vector(node, "translate", time)], [self.vector(node, "rotate", time)],
+                                [self.vector(node, "scale", time)], **kwargs)[0]
+
+    def parent_matrix(self, node, time):
+        return self.world_matrix(node.parent, time) if node.parent is not None else list(AnimMath.IDENTITY)
+
+    def offset_parent_matrix(self, node, time):
+        source = self.connections.get(f"{node.name}.offsetParentMatrix")
+        if source:
+            return self.plug_matrix(source, time)
+        return node.attrs.get("offsetParentMatrix", AnimMath.IDENTITY)
+
+    def transform_matrix(self, node, attr, time=None):
+        """Value of a matrix attribute of a DAG node (worldMatrix, parentInverseMatrix, matrix...)."""
+        time = self.current_time if time is None else time
+        parent = self.parent_matrix(node, time)
+        world = self.world_matrix(node, time)
+        if attr == "worldMatrix":
+            return list(world)
+        if attr == "worldInverseMatrix":
+            return AnimMath.inverse(world)
+        if attr == "parentMatrix":
+            return list(parent)
+        if attr == "parentInverseMatrix":
+            return AnimMath.inverse(parent)
+        if node.type in TRANSFORM_TYPES:
+            parent = AnimMath.multiply(self.offset_parent_matrix(node, time), parent)
+        local = AnimMath.multiply(world, AnimMath.inverse(parent))
+        return local if attr == "matrix" else AnimMath.inverse(local)
+
+    def plug_matrix(self, plug, time=None):
+        """Value of a matrix plug: a DAG node matrix, the output of a multMatrix/pickMatrix, or a set value."""
+        source = self.connections.get(plug)
+        if source:
+            return self.plug_matrix(source, time)
+        node_name, _, attr = plug.partition('.')
+        node = self.node(node_name)
+        base = attr.split('[')[0]
+        if base in MATRIX_ATTRS:
+            return self.transform_matrix(node, base, time)
+        if node.type == "multMatrix" and base == "matrixSum":
+            indices = sorted({int(name[9:-1]) for name in list(node.attrs) + [p.split('.', 1)[1] for p in self.incoming[node.name]]
+                              if name.startswith("matrixIn[")})
+            result = list(AnimMath.IDENTITY)
+            for index in indices:
+                result = AnimMath.multiply(result, self.plug_matrix(f"{node.name}.matrixIn[{index}]", time))
+            return result
+        if node.type == "pickMatrix" and base == "outputMatrix":
+            matrix = self.plug_matrix(f"{node.name}.inputMatrix", time)
+            # Only the scale/shear removal is used: both flags off keep the rotation and translation
+            if not node.attrs.get("useScale", True) and not node.attrs.get("useShear", True):
+                matrix = AnimMath.remove_scale([matrix])[0]
+            return list(matrix)
+        return list(node.attrs.get(attr, AnimMath.IDENTITY))
+
+    def world_matrix(self, node, time=None):
+        time = self.current_time if time is None else time
+        key = (node.name, time)
+        if key in self.world_cache:
+            return self.world_cache[key]
+
+        self.stats["node_evaluations"] += 1
+        self.simulated_time += NODE_EVAL_COST
+
+        if node.type not in TRANSFORM_TYPES:
+            world = self.parent_matrix(node, time)
+        elif node.constraints:
+            world = self.constrained_matrix(node, time)
+        else:
+            world = AnimMath.multiply(self.local_matrix(node, time),
+                                      AnimMath.multiply(self.offset_parent_matrix(node, time), self.parent_matrix(node, time)))
+
+        self.world_cache[key] = world
+        return world
+
+    def constrained_matrix(self, node, time):
+        """World matrix of a constrained transform: the first target of each constraint, equal weights."""
+        def target_world(constraint):
+            target, offset = constraint.targets[0]
+            world = AnimMath.remove_scale([self.world_matrix(self.node(target), time)])[0]
+            return AnimMath.multiply(offset, world)
+
+        constraints = node.constraints
+        if "parentConstraint" in constraints:
+            return target_world(constraints["parentConstraint"])
+
+        world = AnimMath.multiply(self.local_matrix(node, time), self.parent_matrix(node, time))
+        if "orientConstraint" in constraints:
+            world = target_world(constraints["orientConstraint"])[0:12] + world[12:16]
+        if "pointConstraint" in constraints:
+            constraint = constraints["pointConstraint"]
+            positions = [AnimMath.positions([self.world_matrix(self.node(t), time)])[0] for t, _ in constraint.targets]
+            offset = constraint.targets[0][1]
+            world = world[0:12] + [sum(p[a] for p in positions) / len(positions) + offset[12 + a] for a in range(3)] + [1.0]
+        return world
+
+    def set_world_matrix(self, node, world, channels=("translate", "rotate", "scale")):
+        parent = AnimMath.multiply(self.offset_parent_matrix(node, self.current_time),
+                                   self.parent_matrix(node, self.current_time))
+        local = AnimMath.multiply(world, AnimMath.inverse(parent))
+        kwargs = dict(rotate_order=int(self.value(node, "rotateOrder")),
+                      rotate_axis=self.vector(node, "rotateAxis"),
+                      scale_pivot=self.vector(node, "scalePivot"), rotate_pivot=self.vector(node, "rotatePivot"),
+                      scale_pivot_translate=self.vector(node, "scalePivotTranslate"),
+                      rotate_pivot_translate=self.vector(node, "rotatePivotTranslate"),
+                      previous_rotate=self.vector(node, "rotate"))
+        if node.type == "joint":
+            kwargs["joint_orient"] = self.vector(node, "jointOrient")
+        translate, rotate, scale = AnimMath.decompose([local], **kwargs)
+        for attr, value in (("translate", translate[0]), ("rotate", rotate[0]), ("scale", scale[0])):
+            if attr in channels:
+                for axis, component in zip("XYZ", value):
+                    if f"{attr}{axis}" not in node.locked:
+                        node.attrs[f"{attr}{axis}"] = component
+        self.changed()
+
+def _rename_plug(plug, old, new):
+    node, dot, attr = plug.partition('.')
+    return f"{new}{dot}{attr}" if node == old else plug
+
+def evaluate_curve(keys, time):
+    """Linear interpolation with constant extrapolation."""
+    if not keys:
+        return 0.0
+    if time <= keys[0][0]:
+        return keys[0][1]
+    if time >= keys[-1][0]:
+        return keys[-1][1]
+    low, high = 0, len(keys) - 1
+    while high - low > 1:
+        middle = (low + high) // 2
+        if keys[middle][0] <= time:
+            low = middle
+        else:
+            high = middle
+    (t0, v0), (t1, v1) = keys[low], keys[high]
+    return v0 + (v1 - v0) * (time - t0) / (t1 - t0)
+
+def insert_key(keys, time, value):
+    for index, (key_time, _) in enumerate(keys):
+        if key_time == time:
+            keys[index] = (time, value)
+            return
+        if key_time > time:
+            keys.insert(index, (time, value))
+            return
+    keys.append((time, value))
+
+# --- maya.cmds ---------------------------------------------------------------------------------
+
+def _as_list(value):
+    if value is None:
+        return []
+    if isinstance(value, (list, tuple)):
+        result = []
+        for item in value:
+            result.extend(_as_list(item))
+        return result
+    return [value]
+
+def _flag(kwargs, *names, default=None):
+    for name in names:
+        if name in kwargs:
+            return kwargs[name]
+    return default
+
+class FakeCmds(object):
+    """
+    The fake maya.cmds module. Public methods are the commands; any other command name
+    (UI commands mostly) is accepted and returns its first argument or a generated name.
+    """
+    def __init__(self, scene):
+        self._scene = scene
+        self._ui_count = 0
+        self.warnings = []
+        for name in dir(self):
+            if not name.startswith("_") and callable(getattr(self, name)) and name != "warnings":
+                setattr(self, name, self._counted(name, getattr(self, name)))
+
+    def _counted(self, name, function):
+        scene = self._scene
+        def command(*args, **kwargs):
+            scene.stats[f"cmds.{name}"] += 1
+            scene.stats["cmds_calls"] += 1
+            scene.simulated_time += CALL_LATENCY
+            return function(*args, **kwargs)
+        command.__name__ = name
+        return command
+
+    def __getattr__(self, name):
+        if name.startswith("__"):
+            raise AttributeError(name)
+        def ui_command(*args, **kwargs):
+            if _flag(kwargs, "exists", "ex"):
+                return False
+            if _flag(kwargs, "query", "q"):
+                return None
+            self._ui_count += 1
+            return args[0] if args and isinstance(args[0], str) else f"{name}{self._ui_count}"
+        command = self._counted(name, ui_command)
+        setattr(self, name, command)
+        return command
+
+    # --- Messages ----------------------------------------------------------------------------
+
+    def warning(self, message):
+        self.warnings.append(message)
+
+    def error(self, message):
+        raise RuntimeError(message)
+
+    # --- Scene listing -----------------------------------------------------------------------
+
+    def _name(self, node, long_name=False):
+        return self._scene.long_name(node) if long_name else node.name
+
+    def _is_type(self, node, node_type):
+        if node_type == "transform":
+            return node.type in TRANSFORM_TYPES
+        if node_type == "constraint":
+            return node.type.endswith("Constraint")
+        if node_type == "animCurve":
+            return node.type.startswith("animCurve")
+        return node.type == node_type
+
+    def ls(self, *args, **kwargs):
+        scene = self._scene
+        long_name = _flag(kwargs, "long", "l", default=False)
+        node_types = _as_list(_flag(kwargs, "type", "typ"))
+        if _flag(kwargs, "transforms", "tr"):
+            node_types.append("transform")
+
+        if _flag(kwargs, "selection", "sl"):
+            nodes = [scene.node(name) for name in scene.selection]
+        elif any('*' in name for name in _as_list(args)):
+            scene.simulated_time += SCAN_COST_PER_NODE * len(scene.nodes)
+            patterns = _as_list(args)
+            nodes = [node for node in scene.nodes.values()
+                     if any(fnmatch.fnmatchcase(node.name, pattern) for pattern in patterns)]
+        elif args:
+            nodes = [scene.node(name) for name in _as_list(args) if scene.exists(name)]
+        else:
+            scene.simulated_time += SCAN_COST_PER_NODE * len(scene.nodes)
+            nodes = list(scene.nodes.values())
+
+        if node_types:
+            nodes = [node for node in nodes if any(self._is_type(node, t) for t in node_types)]
+        if _flag(kwargs, "uuid", default=False):
+            return [node.uuid for node in nodes]
+        if _flag(kwargs, "showType", "st", default=False):
+            return [value for node in nodes for value in (self._name(node, long_name), node.type)]
+        return [self._name(node, long_name) for node in nodes]
+
+    def objExists(self, name):
+        node_name, _, attr = name.partition('.')
+        if not self._scene.exists(node_name):
+            return False
+        return not attr or self.attributeQuery(attr, node=node_name, exists=True)
+
+    def select(self, *args, **kwargs):
+        names = [self._scene.node(name).name for name in _as_list(args)]
+        if _flag(kwargs, "clear", "cl"):
+            self._scene.selection = []
+        elif _flag(kwargs, "add"):
+            self._scene.selection.extend(names)
+        else:
+            self._scene.selection = names
+
+    def listRelatives(self, *args, **kwargs):
+        scene = self._scene
+        long_name = _flag(kwargs, "fullPath", "f", default=False)
+        node_type = _flag(kwargs, "type")
+        result = []
+        for name in _as_list(args):
+            node = scene.node(name)
+            if _flag(kwargs, "parent", "p"):
+                related = [node.parent] if node.parent is not None else []
+            elif _flag(kwargs, "allDescendents", "ad"):
+                related, stack = [], list(node.children)
+                while stack:
+                    child = stack.pop()
+                    related.append(child)
+                    stack.extend(child.children)
+            else:
+                related = node.children
+                if _flag(kwargs, "shapes", "s"):
+                    related = [child for child in related if child.type not in TRANSFORM_TYPES]
+            for other in related:
+                if node_type is None or self._is_type(other, node_type):
+                    name = self._name(other, long_name)
+                    if name not in result:
+                        result.append(name)
+        return result or None
+
+    def nodeType(self, name):
+        return self._scene.node(name).type
+
+    def objectType(self, name, isAType=None, **kwargs):
+        node = self._scene.node(name)
+        if isAType is not None:
+            return node.type == isAType or (isAType == "transform" and node.type in TRANSFORM_TYPES)
+        return node.type
+
+    def referenceQuery(self, name, **kwargs):
+        return False
+
+    # --- Node creation -----------------------------------------------------------------------
+
+    def createNode(self, node_type, name=None, parent=None, **kwargs):
+        return self._scene.create(node_type, _flag(kwargs, "n", default=name), parent).name
+
+    def group(self, *args, **kwargs):
+        scene = self._scene
+        group = scene.create("transform", _flag(kwargs, "name", "n", default="group1"))
+        if not _flag(kwargs, "empty", "em"):
+            for name in _as_list(args) or list(scene.selection):
+                scene.reparent(scene.node(name), group)
+        return group.name
+
+    def spaceLocator(self, name=None, **kwargs):
+        scene = self._scene
+        transform = scene.create("transform", name or _flag(kwargs, "n", default="locator1"))
+        scene.create("locator", f"{transform.name}Shape", transform)
+        return [transform.name]
+
+    def curve(self, **kwargs):
+        scene = self._scene
+        transform = scene.create("transform", _flag(kwargs, "name", "n", default="curve1"))
+        scene.create("nurbsCurve", f"{transform.name}Shape", transform)
+        return transform.name
+
+    def circle(self, **kwargs):
+        scene = self._scene
+        transform = scene.create("transform", _flag(kwargs, "name", "n", default="nurbsCircle1"))
+        scene.create("nurbsCurve", f"{transform.name}Shape", transform)
+        maker = scene.create("makeNurbCircle", "makeNurbCircle1")
+        return [transform.name, maker.name]
+
+    def instance(self, *args, **kwargs):
+        # In Maya the instance shares the children of the source; the fake DAG has a single parent per node,
+        # so only the transform and its values are copied
+        scene = self._scene
+        source = scene.node(_as_list(args)[0])
+        node = scene.create(source.type, _flag(kwargs, "name", "n", default=source.name))
+        node.attrs.update(source.attrs)
+        return [node.name]
+
+    def delete(self, *args, **kwargs):
+        for name in _as_list(args):
+            if self._scene.exists(name):
+                self._scene.delete(self._scene.node(name))
+
+    def rename(self, old_name, new_name):
+        return self._scene.rename(self._scene.node(old_name), new_name)
+
+    def parent(self, *args, **kwargs):
+        scene = self._scene
+        names = _as_list(args)
+        if _flag(kwargs, "world", "w"):
+            children, new_parent = names, None
+        else:
+            children, new_parent = names[:-1], scene.node(names[-1])
+        result = []
+        for name in children:
+            node = scene.node(name)
+            world = scene.world_matrix(node) if node.type in TRANSFORM_TYPES else None
+            scene.reparent(node, new_parent)
+            if world is not None and not _flag(kwargs, "relative", "r"):
+                scene.set_world_matrix(node, world)
+            result.append(node.name)
+        return result
+
+    def addAttr(self, name, longName=None, attributeType="double", keyable=False, defaultValue=0.0, **kwargs):
+        node = self._scene.node(name)
+        attr = longName or _flag(kwargs, "ln")
+        if (attributeType or _flag(kwargs, "at")) in ("double3", "float3"):
+            return  # Compound: its children (attrX, attrY, attrZ) are added next and make it
+        node.defaults = dict(node.defaults)
+        node.defaults[attr] = float(_flag(kwargs, "dv", default=defaultValue))
+        node.user_defined.append(attr)
+        if keyable or _flag(kwargs, "k"):
+            node.keyable = node.keyable | {attr}
+
+    # --- Attributes --------------------------------------------------------------------------
+
+    def _split(self, plug):
+        node_name, _, attr = plug.partition('.')
+        node = self._scene.node(node_name)
+        return node, SHORT_NAMES.get(attr, attr)
+
+    def _children(self, node, attr):
+        children = [f"{attr}{axis}" for axis in "XYZ"]
+        if node.has(attr) or not all(node.has(child) for child in children):
+            return None
+        return children
+
+    def _attr_type(self, node, attr):
+        if attr.split('[')[0] in MATRIX_ATTRS:
+            return "matrix"
+        base = attr[:-1] if attr[-1:] in "XYZ" else attr
+        if base in ANGLE_ATTRS:
+            return "doubleAngle"
+        if base in ("translate", "rotatePivot", "scalePivot", "rotatePivotTranslate", "scalePivotTranslate", "offset"):
+            return "doubleLinear"
+        if self._children(node, attr):
+            return "double3"
+        if attr == "visibility":
+            return "bool"
+        return "double"
+
+    def getAttr(self, plug, **kwargs):
+        scene = self._scene
+        node, attr = self._split(plug)
+        time = _flag(kwargs, "time", "t")
+        if time is not None:
+            scene.stats["context_evaluations"] += 1
+
+        if _flag(kwargs, "type"):
+            return self._attr_type(node, attr)
+        if _flag(kwargs, "lock", "l"):
+            return attr in node.locked
+        if _flag(kwargs, "settable", "se"):
+            source = scene.connections.get(f"{node.name}.{attr}")
+            return attr not in node.locked and (source is None or scene.anim_curve(node, attr) is not None)
+
+        base = attr.split('[')[0]
+        if base in MATRIX_ATTRS or base in ("offsetParentMatrix", "matrixIn", "matrixSum", "inputMatrix", "outputMatrix"):
+            return scene.plug_matrix(f"{node.name}.{attr}", time)
+
+        children = self._children(node, attr)
+        if children:
+            return [tuple(scene.value(node, child, time) for child in children)]
+        if not node.has(attr) and not node.type.endswith("Constraint") and scene.anim_curve(node, attr) is None:
+            raise ValueError(f"No object matches name: {plug}")
+        return scene.value(node, attr, time)
+
+    def setAttr(self, plug, *values, **kwargs):
+        scene = self._scene
+        node, attr = self._split(plug)
+
+        lock = _flag(kwargs, "lock", "l")
+        if lock is not None:
+            targets = self._children(node, attr) or [attr]
+            for target in targets:
+                (node.locked.add if lock else node.locked.discard)(target)
+            if not values:
+                return
+
+        if _flag(kwargs, "type", "typ") == "matrix":
+            if f"{node.name}.{attr}" in scene.connections:
+                raise RuntimeError(f"The attribute '{node.name}.{attr}' is locked or connected and cannot be modified.")
+            node.attrs[attr] = [float(value) for value in _as_list(values)]
+            scene.changed()
+            return
+
+        if attr.startswith("keyTimeValue"):
+            flat = _as_list(values)
+            for time, value in zip(flat[0::2], flat[1::2]):
+                insert_key(node.keys, float(time), float(value))
+            scene.changed()
+            return
+
+        targets = self._children(node, attr) or [attr]
+        values = _as_list(values)
+        for target, value in zip(targets, values):
+            if target in node.locked:
+                raise RuntimeError(f"The attribute '{node.name}.{target}' is locked or connected and cannot be modified.")
+            source = scene.connections.get(f"{node.name}.{target}")
+            if source and scene.anim_curve(node, target) is None:
+                raise RuntimeError(f"The attribute '{node.name}.{target}' is locked or connected and cannot be modified.")
+            node.attrs[target] = value
+        scene.changed()
+
+    def connectAttr(self, source, destination, force=False, **kwargs):
+        scene = self._scene
+        node, attr = self._split(destination)
+        if attr in node.locked:
+            raise RuntimeError(f"The destination attribute '{destination}' is locked.")
+        if _flag(kwargs, "nextAvailable", "na"):
+            index = 0
+            while f"{node.name}.{attr}[{index}]" in scene.connections:
+                index += 1
+            attr = f"{attr}[{index}]"
+        elif destination in scene.connections and not (force or _flag(kwargs, "f")):
+            raise RuntimeError(f"'{destination}' is already connected.")
+        scene.connect(source, f"{node.name}.{attr}")
+
+    def disconnectAttr(self, source, destination, **kwargs):
+        scene = self._scene
+        if scene.connections.get(destination) != source:
+            raise RuntimeError(f"There is no connection from '{source}' to '{destination}' to disconnect.")
+        scene.disconnect(destination)
+        scene.changed()
+
+    def listAttr(self, *names, **kwargs):
+        names = _as_list(names)
+        if all('.' in name for name in names):
+            # Plugs: the long name of each attribute
+            result = []
+            for plug in names:
+                node_name, _, attr = plug.partition('.')
+                if not self.attributeQuery(attr, node=node_name, exists=True):
+                    raise ValueError(f"No object matches name: {plug}")
+                result.append(SHORT_NAMES.get(attr, attr))
+            return result
+        node = self._scene.node(names[0])
+        if _flag(kwargs, "userDefined", "ud"):
+            return list(node.user_defined) or None
+        if _flag(kwargs, "keyable", "k"):
+            return [attr for attr in node.defaults if attr in node.keyable] or None
+        return list(dict.fromkeys(list(node.defaults) + list(node.attrs)))
+
+    def attributeQuery(self, attr, node=None, **kwargs):
+        target = self._scene.node(_flag(kwargs, "n", default=node))
+        attr = SHORT_NAMES.get(attr, attr)
+        exists = target.has(attr) or bool(self._children(target, attr))
+        if _flag(kwargs, "exists", "ex"):
+            return exists
+        if not exists:
+            raise RuntimeError(f"Attribute '{attr}' does not exist on '{target.name}'.")
+        if _flag(kwargs, "listDefault", "ld"):
+            children = self._children(target, attr)
+            if children:
+                return [target.defaults.get(child, 0.0) for child in children]
+            return [target.defaults.get(attr, 0.0)]
+        if _flag(kwargs, "longName", "ln"):
+            return attr
+        return exists
+
+    # --- Time and transforms -----------------------------------------------------------------
+
+    def currentTime(self, *args, **kwargs):
+        scene = self._scene
+        if _flag(kwargs, "query", "q"):
+            return scene.current_time
+        scene.current_time = float(args[0])
+        scene.stats["time_changes"] += 1
+        scene.simulated_time += TIME_CHANGE_COST_PER_NODE * len(scene.nodes)
+        scene.world_cache.clear()
+        return scene.current_time
+
+    def playbackOptions(self, **kwargs):
+        scene = self._scene
+        if _flag(kwargs, "query", "q"):
+            if _flag(kwargs, "minTime", "min"):
+                return scene.min_time
+            return scene.max_time
+        scene.min_time = _flag(kwargs, "minTime", "min", default=scene.min_time)
+        scene.max_time = _flag(kwargs, "maxTime", "max", default=scene.max_time)
+
+    def xform(self, name, **kwargs):
+        scene = self._scene
+        node = scene.node(name)
+        query = _flag(kwargs, "query", "q")
+        matrix = _flag(kwargs, "matrix", "m")
+        translation = _flag(kwargs, "translation", "t")
+        rotate_pivot = _flag(kwargs, "rotatePivot", "rp")
+        scale_pivot = _flag(kwargs, "scalePivot", "sp")
+
+        if query:
+            world = scene.world_matrix(node)
+            if matrix:
+                return list(world)
+            if rotate_pivot:
+                return list(AnimMath.transform_point(scene.vector(node, "rotatePivot"), world))
+            if scale_pivot:
+                return list(AnimMath.transform_point(scene.vector(node, "scalePivot"), world))
+            return list(world[12:15])
+
+        if matrix is not None:
+            scene.set_world_matrix(node, list(matrix))
+        if translation is not None:
+            local = AnimMath.transform_point(translation, AnimMath.inverse(scene.parent_matrix(node, scene.current_time)))
+            for axis, value in zip("XYZ", local):
+                node.attrs[f"translate{axis}"] = value
+            scene.changed()
+        for pivot, attrs in ((rotate_pivot, ("rotatePivot",)), (scale_pivot, ("scalePivot",))):
+            if pivot is None:
+                continue
+            new_pivot = AnimMath.transform_point(pivot, AnimMath.inverse(scene.world_matrix(node)))
+            spt, rpt = AnimMath.move_pivots(new_pivot, scene.vector(node, "rotate"), scene.vector(node, "scale"),
+                                            rotate_order=int(scene.value(node, "rotateOrder")),
+                                            scale_pivot=scene.vector(node, "scalePivot"),
+                                            rotate_pivot=scene.vector(node, "rotatePivot"),
+                                            scale_pivot_translate=scene.vector(node, "scalePivotTranslate"),
+                                            rotate_pivot_translate=scene.vector(node, "rotatePivotTranslate"))
+            for axis, p, s, r in zip("XYZ", new_pivot, spt, rpt):
+                node.attrs[f"{attrs[0]}{axis}"] = p
+                if attrs[0] == "rotatePivot":
+                    node.attrs[f"rotatePivotTranslate{axis}"] = r
+                else:
+                    node.attrs[f"scalePivotTranslate{axis}"] = s
+            scene.changed()
+
+    def matchTransform(self, name, target, **kwargs):
+        scene = self._scene
+        channels = [attr for attr, flag in (("translate", "position"), ("rotate", "rotation"), ("scale", "scale"))
+                    if kwargs.get(flag, flag != "scale")]
+        scene.set_world_matrix(scene.node(name), scene.world_matrix(scene.node(target)), channels)
+
+    # --- Constraints -------------------------------------------------------------------------
+
+    def _constraint(self, constraint_type, args, kwargs):
+        scene = self._scene
+        names = _as_list(args)
+        if _flag(kwargs, "query", "q"):
+            constraint = scene.node(names[0])
+            if _flag(kwargs, "targetList", "tl"):
+                return [target for target, _ in constraint.targets]
+            if _flag(kwargs, "weightAliasList", "wal"):
+                return [f"{target}W{index}" for index, (target, _) in enumerate(constraint.targets)]
+            return None
+
+        *targets, driven_name = names
+        driven = scene.node(driven_name)
+        constraint = driven.constraints.get(constraint_type)
+        if constraint is None:
+            constraint = scene.create(constraint_type, f"{driven.name}_{constraint_type}1", driven)
+        maintain_offset = _flag(kwargs, "maintainOffset", "mo", default=False)
+
+        for target_name in targets:
+            target = scene.node(target_name)
+            offset = list(AnimMath.IDENTITY)
+            if maintain_offset:
+                target_world = AnimMath.remove_scale([scene.world_matrix(target)])[0]
+                offset = AnimMath.multiply(scene.world_matrix(driven), AnimMath.inverse(target_world))
+                if constraint_type == "pointConstraint":
+                    difference = [a - b for a, b in zip(scene.world_matrix(driven)[12:15], target_world[12:15])]
+                    offset = AnimMath.translation_matrix(difference)
+            index = len(constraint.targets)
+            constraint.targets.append((target.name, offset))
+            constraint.attrs[f"{target.name}W{index}"] = 1.0
+            for source, destination in (("parentMatrix", "targetParentMatrix"), ("translate", "targetTranslate"),
+                                        ("rotatePivot", "targetRotatePivot"),
+                                        ("rotatePivotTranslate", "targetRotateTranslate")):
+                scene.connect(f"{target.name}.{source}", f"{constraint.name}.target[{index}].{destination}")
+        for axis in "XYZ":
+            constraint.attrs[f"offset{axis}"] = 0.0
+        scene.connect(f"{driven.name}.parentInverseMatrix", f"{constraint.name}.constraintParentInverseMatrix")
+        driven.constraints[constraint_type] = constraint
+        scene.changed()
+        return [constraint.name]
+
+    def parentConstraint(self, *args, **kwargs):
+        return self._constraint("parentConstraint", args, kwargs)
+
+    def pointConstraint(self, *args, **kwargs):
+        return self._constraint("pointConstraint", args, kwargs)
+
+    def orientConstraint(self, *args, **kwargs):
+        return self._constraint("orientConstraint", args, kwargs)
+
+    def aimConstraint(self, *args, **kwargs):
+        return self._constraint("aimConstraint", args, kwargs)
+
+    def scaleConstraint(self, *args, **kwargs):
+        return self._constraint("scaleConstraint", args, kwargs)
+
+    # --- Animation ---------------------------------------------------------------------------
+
+    def _attribute_plugs(self, objects, attributes):
+        """[(node, attribute)] for objects x attributes, compounds expanded, keyable attributes if none given."""
+        plugs = []
+        for name in objects:
+            node = self._scene.node(name)
+            for attr in (_as_list(attributes) or sorted(node.keyable)):
+                attr = SHORT_NAMES.get(attr, attr)
+                for child in (self._children(node, attr) or [attr]):
+                    plugs.append((node, child))
+        return plugs
+
+    def _curve_for(self, node, attr):
+        scene = self._scene
+        curve = scene.anim_curve(node, attr)
+        if curve is None:
+            attr_type = self._attr_type(node, attr)
+            curve_type = {"doubleLinear": "animCurveTL", "doubleAngle": "animCurveTA"}.get(attr_type, "animCurveTU")
+            curve = scene.create(curve_type, f"{node.name}_{attr}")
+            scene.connect(f"{curve.name}.output", f"{node.name}.{attr}")
+        return curve
+
+    def setKeyframe(self, *args, **kwargs):
+        scene = self._scene
+        objects = _as_list(args) or list(scene.selection)
+        times = _as_list(_flag(kwargs, "time", "t")) or [scene.current_time]
+        value = _flag(kwargs, "value", "v")
+        insert = _flag(kwargs, "insert", "i", default=False)
+        count = 0
+        for node, attr in self._attribute_plugs(objects, _flag(kwargs, "attribute", "at")):
+            if insert and scene.anim_curve(node, attr) is None:
+                continue
+            current = scene.value(node, attr) if value is None else value
+            curve = self._curve_for(node, attr)
+            for time in times:
+                insert_key(curve.keys, float(time), float(current) if value is not None or not insert
+                           else evaluate_curve(curve.keys, float(time)))
+                count += 1
+        scene.changed()
+        return count
+
+    def _curves(self, args, kwargs):
+        """(curve, ...) for plugs, animCurves or objects given to keyframe/copyKey/cutKey."""
+        scene = self._scene
+        curves = []
+        for name in _as_list(args):
+            node_name, _, attr = name.partition('.')
+            node = scene.node(node_name)
+            if node.type.startswith("animCurve"):
+                curves.append(node)
+            elif attr:
+                curve = scene.anim_curve(node, SHORT_NAMES.get(attr, attr))
+                if curve is not None:
+                    curves.append(curve)
+            else:
+                for plug in sorted(scene.incoming.get(node.name, ())):
+                    curve = scene.anim_curve(node, plug.split('.', 1)[1])
+                    if curve is not None and (not _flag(kwargs, "attribute", "at")
+                                              or plug.split('.', 1)[1] in _as_list(_flag(kwargs, "attribute", "at"))):
+                        curves.append(curve)
+        return curves
+
+    def keyframe(self, *args, **kwargs):
+        scene = self._scene
+        time_range = _flag(kwargs, "time", "t")
+        low, high = (time_range if isinstance(time_range, (list, tuple)) else (time_range, time_range)) \
+            if time_range is not None else (float("-inf"), float("inf"))
+        curves = self._curves(args or scene.selection, kwargs)
+
+        if _flag(kwargs, "query", "q"):
+            if _flag(kwargs, "name", "n"):
+                return [curve.name for curve in curves]
+            result = []
+            for curve in curves:
+                for time, value in curve.keys:
+                    if low <= time <= high:
+                        result.append(value if _flag(kwargs, "valueChange", "vc") else time)
+            return result or None
+
+        new_value = _flag(kwargs, "valueChange", "vc")
+        for curve in curves:
+            curve.keys = [(time, new_value if low <= time <= high and new_value is not None else value)
+                          for time, value in curve.keys]
+        scene.changed()
+        return len(curves)
+
+    def copyKey(self, *args, **kwargs):
+        curves = self._curves(args, kwargs)
+        self._scene.clipboard = [list(curve.keys) for curve in curves]
+        return len(curves)
+
+    def cutKey(self, *args, **kwargs):
+        time_range = _flag(kwargs, "time", "t")
+        for curve in self._curves(args, kwargs):
+            if time_range is None:
+                curve.keys = []
+            else:
+                curve.keys = [key for key in curve.keys if not time_range[0] <= key[0] <= time_range[1]]
+        self._scene.changed()
+
+    def pasteKey(self, *args, **kwargs):
+        scene = self._scene
+        time_range = _flag(kwargs, "time", "t")
+        for (node, attr), keys in zip(self._attribute_plugs(_as_list(args), _flag(kwargs, "attribute", "at")),
+                                      scene.clipboard):
+            curve = self._curve_for(node, attr)
+            start = time_range[0] if time_range else keys[0][0]
+            shift = start - keys[0][0]
+            low, high = (time_range[0], time_range[1]) if time_range else (keys[0][0] + shift, keys[-1][0] + shift)
+            if _flag(kwargs, "option", "o") == "replace":
+                curve.keys = [key for key in curve.keys if not low <= key[0] <= high]
+            for time, value in keys:
+                insert_key(curve.keys, time + shift, value)
+        scene.changed()
+
+    def listConnections(self, *args, **kwargs):
+        scene = self._scene
+        source = _flag(kwargs, "source", "s", default=True)
+        destination = _flag(kwargs, "destination", "d", default=True)
+        with_connections = _flag(kwargs, "connections", "c", default=False)
+        with_plugs = _flag(kwargs, "plugs", "p", default=False)
+        node_type = _flag(kwargs, "type", "t")
+
+        result = []
+        for name in _as_list(args):
+            node_name, _, attr = name.partition('.')
+            node = scene.node(node_name)
+            attr = SHORT_NAMES.get(attr, attr)
+            pairs = []
+            if source:
+                for plug in sorted(scene.incoming.get(node.name, ())):
+                    if not attr or plug.split('.', 1)[1] == attr or plug.split('.', 1)[1].startswith(f"{attr}["):
+                        pairs.append((plug, scene.connections[plug]))
+            if destination:
+                for plug in sorted(scene.outgoing.get(node.name, ())):
+                    own = scene.connections[plug]
+                    if not attr or own.split('.', 1)[1] == attr:
+                        pairs.append((own, plug))
+            for own, other in pairs:
+                other_node = scene.node(other.split('.')[0])
+                if node_type and not self._is_type(other_node, node_type):
+                    continue
+                if with_connections:
+                    result.append(own)
+                result.append(other if with_plugs else other_node.name)
+        return result or None
+
+    # --- Undo, refresh and progress ------------------------------------------------------------
+
+    def undoInfo(self, **kwargs):
+        if _flag(kwargs, "query", "q"):
+            return None if _flag(kwargs, "undoName", "un") else True
+        return None
+
+    def evalDeferred(self, command, **kwargs):
+        self._scene.deferred.append(command)
+
+    def progressWindow(self, **kwargs):
+        if _flag(kwargs, "query", "q"):
+            return False
+        return None
+
+    def refresh(self, **kwargs):
+        return None
+
+    def about(self, **kwargs):
+        if _flag(kwargs, "batch", "b"):
+            return self._scene.batch
+        return "2025"
+
+# --- maya.api.OpenMaya ------------------------------------------------------------------------
+
+class FakeMObject(object):
+    def __init__(self, node):
+        self.node = node
+
+    def hasFn(self, fn):
+        if fn == FakeMFn.kLocator:
+            return self.node.type == "locator"
+        if fn == FakeMFn.kTransform:
+            return self.node.type in TRANSFORM_TYPES
+        return False
+
+class FakeMFn(object):
+    kLocator = 1
+    kTransform = 2
+
+def build_open_maya(scene):
+    """Builds a fake maya.api.OpenMaya module with what SwitchRigRegistry uses."""
+    om = types.ModuleType("maya.api.OpenMaya")
+    om.MFn = FakeMFn
+
+    class MObject(FakeMObject):
+        kNullObj = None
+    om.MObject = MObject
+
+    class MUuid(object):
+        def __init__(self, value):
+            self.value = value
+
+        def asString(self):
+            return self.value
+    om.MUuid = MUuid
+
+    class MFnDependencyNode(object):
+        def __init__(self, obj):
+            self.obj = obj
+
+        def name(self):
+            return self.obj.node.name
+
+        def uuid(self):
+            return MUuid(self.obj.node.uuid)
+    om.MFnDependencyNode = MFnDependencyNode
+
+    class MFnDagNode(MFnDependencyNode):
+        def parentCount(self):
+            return 1 if self.obj.node.parent is not None else 0
+
+        def parent(self, index):
+            return FakeMObject(self.obj.node.parent)
+
+        def childCount(self):
+            return len(self.obj.node.children)
+
+        def child(self, index):
+            return FakeMObject(self.obj.node.children[index])
+    om.MFnDagNode = MFnDagNode
+
+    class MItDependencyNodes(object):
+        def __init__(self, fn):
+            scene.simulated_time += SCAN_COST_PER_NODE * len(scene.nodes)
+            self.nodes = [node for node in scene.nodes.values() if FakeMObject(node).hasFn(fn)]
+            self.index = 0
+
+        def isDone(self):
+            return self.index >= len(self.nodes)
+
+        def thisNode(self):
+            return FakeMObject(self.nodes[self.index])
+
+        def next(self):
+            self.index += 1
+    om.MItDependencyNodes = MItDependencyNodes
+
+    class MSelectionList(object):
+        def __init__(self):
+            self.items = []
+
+        def add(self, item):
+            value = item.value if isinstance(item, MUuid) else item
+            if not scene.exists(value):
+                raise RuntimeError(f"{value} does not exist")
+            self.items.append(scene.node(value))
+
+        def getDependNode(self, index):
+            return FakeMObject(self.items[index])
+    om.MSelectionList = MSelectionList
+
+    callbacks = scene.callbacks
+    om.MDGMessage = types.SimpleNamespace(
+        addNodeAddedCallback=lambda function, node_type=None: callbacks.add(callbacks.added, function, node_type),
+        addNodeRemovedCallback=lambda function, node_type=None: callbacks.add(callbacks.removed, function, node_type))
+    om.MNodeMessage = types.SimpleNamespace(
+        addNameChangedCallback=lambda obj, function: callbacks.add(callbacks.renamed, function))
+    om.MSceneMessage = types.SimpleNamespace(
+        kAfterOpen=1, kAfterNew=2, kBeforeOpen=3, kBeforeNew=4,
+        addCallback=lambda message, function: callbacks.add(callbacks.scene, function))
+    om.MMessage = types.SimpleNamespace(removeCallbacks=callbacks.remove)
+    return om
+
+def install(scene=None):
+    """
+    Creates a fake scene and installs the fake maya, maya.cmds and maya.api.OpenMaya modules.
+    Returns (scene, cmds).
+    """
+    scene = scene or FakeScene()
+    cmds = FakeCmds(scene)
+    maya = types.ModuleType("maya")
+    api = types.ModuleType("maya.api")
+    open_maya = build_open_maya(scene)
+    maya.cmds, maya.api, api.OpenMaya = cmds, api, open_maya
+    sys.modules.update({"maya": maya, "maya.cmds": cmds, "maya.api": api, "maya.api.OpenMaya": open_maya})
+    return scene, cmds
+
+# By Teo2103D
@@ -0,0 +1,416 @@
+import argparse
+import contextlib
+import importlib
+import io
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+# By Teo2103D
+
+# Benchmarks of the AnimTool scripts on synthetic scenes, with the fake maya.cmds of FakeMaya.py.
+#
+#   python RunBenchmarks.py                          # all the scenarios on 10, 1000 and 100000 nodes
+#   python RunBenchmarks.py --sizes 10,10000 --frames 200 --only follow,switch_range
+#   python RunBenchmarks.py --json results.json      # save the results
+#   python RunBenchmarks.py --baseline results.json  # fail (exit code 1) if a scenario makes more cmds calls
+#
+# For each scenario the report gives the number of cmds calls (with the most used commands),
+# the timeline changes, the context evaluations (getAttr -time), the keys added, the Python wall time,
+# the time the same calls would roughly cost in Maya (FakeMaya cost model) and the peak memory of the tool.
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ANIMTOOL = os.path.dirname(HERE)
+sys.path[:0] = [HERE, ANIMTOOL, os.path.join(ANIMTOOL, "SwitchIKFK")]
+
+import AnimMath
+import FakeMaya
+
+# Modules reloaded for every scenario: they keep state (registry, tracked objects, loaded tools)
+TOOL_MODULES = ["AnimBake", "AnimOperation", "ResetTool", "AnimToolMenu", "FollowAnimTool", "MovePivotTool", "UnlockRot_ScalePivot",
+                "SwitchRigRegistry", "SwitchIkFk", "OnIk", "OnFk", "AnimProfiler",
+                "SwitchSetupBatch", "SwitchTargets", "AnimScheduler"]
+
+DEFAULT_SIZES = [10, 1000, 100000]
+
+def load_tool(name):
+    """Imports a tool module for the current fake scene."""
+    sys.modules.pop(name, None)
+    with contextlib.redirect_stdout(io.StringIO()):
+        return importlib.import_module(name)
+
+# --- Synthetic scenes ------------------------------------------------------------------------------
+
+def build_filler(scene, count):
+    """Fills the scene up to count nodes: groups of 100 transforms, one in ten carrying a locator shape."""
+    group = None
+    index = 0
+    while len(scene.nodes) < count:
+        if index % 100 == 0:
+            group = scene.create("transform", f"filler_grp{index // 100}")
+        node = scene.create("transform", f"filler{index}", group)
+        if index % 10 == 0 and len(scene.nodes) < count:
+            scene.create("locator", f"filler{index}Shape", node)
+        index += 1
+
+def animate(scene, node, attr, keys):
+    """Connects an animCurve with keys [(time, value)] to node.attr."""
+    curve_type = "animCurveTA" if attr.startswith("rotate") else "animCurveTL"
+    curve = scene.create(curve_type, f"{node}_{attr}")
+    curve.keys = sorted(keys)
+    scene.connect(f"{curve.name}.output", f"{node}.{attr}")
+
+def build_animated(scene, name, frames, parent=None, node_type="transform"):
+    """A transform moving and turning over the frames."""
+    node = scene.create(node_type, name, parent).name
+    animate(scene, node, "translateX", [(1, 0.0), (frames, 50.0)])
+    animate(scene, node, "translateY", [(1, 0.0), (frames // 2, 10.0), (frames, 0.0)])
+    animate(scene, node, "rotateY", [(1, 0.0), (frames, 270.0)])
+    animate(scene, node, "rotateZ", [(1, 0.0), (frames, 45.0)])
+    return node
+
+def build_arm_rig(scene, frames, rig_name="rig"):
+    """A "rig" group with an animated IK chain and an FK chain on the left arm ("ns:rig": all in namespace ns)."""
+    namespace = rig_name.rpartition(':')[0]
+    prefix = f"{namespace}:" if namespace else ""
+    rig = scene.create("transform", rig_name).name
+    parent = rig
+    for index, part in enumerate(["Shoulder", "Elbow", "Wrist"]):
+        joint = scene.create("joint", f"{prefix}IK_{part}_L", parent).name
+        joint_node = scene.node(joint)
+        joint_node.attrs["translateX"] = 10.0 if index else 0.0
+        animate(scene, joint, "rotateZ", [(1, 0.0), (frames, 30.0 + 20.0 * index)])
+        animate(scene, joint, "rotateY", [(1, 0.0), (frames // 2, -40.0), (frames, 10.0)])
+        parent = joint
+    parent = rig
+    for index, part in enumerate(["Shoulder", "Elbow", "Wrist"]):
+        control = scene.create("transform", f"{prefix}FK_{part}_L", parent)
+        control.attrs["translateX"] = 10.0 if index else 0.0
+        parent = control.name
+    return rig
+
+# --- Scenarios -------------------------------------------------------------------------------------
+# Each one builds its scene and returns the function to measure.
+
+def scenario_follow(scene, cmds, frames):
+    driver = build_animated(scene, "driver", frames)
+    driven = scene.create("transform", "driven").name
+    tool = load_tool("FollowAnimTool")
+    return lambda: tool.create_matched_groups_with_animation(driver, driven, 1, frames, fast_bake=True)
+
+def scenario_follow_reduced(scene, cmds, frames):
+    driver = build_animated(scene, "driver", frames)
+    driven = scene.create("transform", "driven").name
+    tool = load_tool("FollowAnimTool")
+    tool.AnimBake.reduce_keys = True
+    return lambda: tool.create_matched_groups_with_animation(driver, driven, 1, frames, fast_bake=True)
+
+def scenario_follow_scrub(scene, cmds, frames):
+    driver = build_animated(scene, "driver", frames)
+    driven = scene.create("transform", "driven").name
+    tool = load_tool("FollowAnimTool")
+    return lambda: tool.create_matched_groups_with_animation(driver, driven, 1, frames, fast_bake=False)
+
+def scenario_follow_batch(scene, cmds, frames):
+    driver = build_animated(scene, "driver", frames)
+    pairs = [(driver, scene.create("transform", f"driven{index}").name) for index in range(10)]
+    tool = load_tool("FollowAnimTool")
+    return lambda: tool.bake_follow_pairs(pairs, 1, frames)
+
+def scenario_follow_live(scene, cmds, frames):
+    """Same followers as follow_batch, followed live then baked off."""
+    driver = build_animated(scene, "driver", frames)
+    driven = [scene.create("transform", f"driven{index}").name for index in range(10)]
+    tool = load_tool("FollowAnimTool")
+    def run():
+        tool.create_live_follows([(driver, obj) for obj in driven], 1)
+        tool.bake_live_follows(driven, 1, frames)
+    return run
+
+def scenario_follow_background(scene, cmds, frames):
+    """Follow of one pair from the tool window: a background job (AnimScheduler), run through the idle queue."""
+    driver = build_animated(scene, "driver", frames)
+    driven = scene.create("transform", "driven").name
+    tool = load_tool("FollowAnimTool")
+    cmds.select(driver, driven)
+    return lambda: tool.apply_follow(1, frames, True, False)
+
+def build_pivot_scene(scene, frames):
+    """An animated object used as target by a parent, a point and an orient constraint."""
+    obj = build_animated(scene, "prop", frames)
+    for constraint in ("parentConstraint", "pointConstraint", "orientConstraint"):
+        follower = scene.create("transform", f"{constraint}_follower").name
+        getattr(scene.cmds, constraint)(obj, follower, maintainOffset=True)
+    return obj
+
+def scenario_pivot_setup(scene, cmds, frames):
+    obj = build_pivot_scene(scene, frames)
+    tool = load_tool("MovePivotTool")
+    cmds.select(obj)
+    return tool.create_locators_and_gizmo_for_selected_object
+
+def scenario_pivot_setup_batch(scene, cmds, frames):
+    """Pivot setup of 20 constrained props selected together."""
+    objects = []
+    for index in range(20):
+        obj = build_animated(scene, f"prop{index}", frames)
+        follower = scene.create("transform", f"prop{index}_follower").name
+        scene.cmds.parentConstraint(obj, follower, maintainOffset=True)
+        objects.append(obj)
+    tool = load_tool("MovePivotTool")
+    cmds.select(objects)
+    return tool.create_locators_and_gizmo_for_selection
+
+def scenario_pivot_range(scene, cmds, frames):
+    obj = build_pivot_scene(scene, frames)
+    tool = load_tool("MovePivotTool")
+    cmds.select(obj)
+    with contextlib.redirect_stdout(io.StringIO()):
+        tool.create_locators_and_gizmo_for_selected_object()
+    locator = f"PosPivot1_{obj}"
+    cmds.setAttr(f"{locator}.translate", 2, 1, 0)
+    return lambda: tool.snap_pivot_to_locator_over_range(obj, locator, 1, frames)
+
+def build_switch_scene(scene, cmds, frames, stored=False):
+    build_arm_rig(scene, frames)
+    cmds.select("IK_Shoulder_L", "IK_Elbow_L", "IK_Wrist_L")
+    load_tool("SwitchTargets").store_offsets = stored
+    with contextlib.redirect_stdout(io.StringIO()):
+        load_tool("OnIk").create_group_based_on_selection()
+    tool = load_tool("SwitchIkFk")
+    tool.detect_unique_locator_names()
+    cmds.select("FK_Shoulder_L", "FK_Elbow_L", "FK_Wrist_L")
+    return tool
+
+def scenario_pivot_selection_ui(scene, cmds, frames):
+    """Pivot window of a scene with 100 objects set up before the registry: found and listed in the background."""
+    for index in range(100):
+        obj = scene.create("transform", f"prop{index}").name
+        scene.create("transform", f"PosPivot1_{obj}", obj)
+    tool = load_tool("MovePivotTool")
+    return tool.open_object_selection_ui
+
+def scenario_switch_frame(scene, cmds, frames):
+    tool = build_switch_scene(scene, cmds, frames)
+    cmds.currentTime(frames // 2, edit=True)
+    return lambda: tool.match_transforms_to_locators("rig")
+
+def scenario_switch_range(scene, cmds, frames):
+    tool = build_switch_scene(scene, cmds, frames)
+    return lambda: tool.switch_frame_range("rig", 1, frames)
+
+def scenario_switch_range_stored(scene, cmds, frames):
+    """switch_range with the targets stored on the joints instead of constrained locators."""
+    tool = build_switch_scene(scene, cmds, frames, stored=True)
+    return lambda: tool.switch_frame_range("rig", 1, frames)
+
+def scenario_switch_range_profiled(scene, cmds, frames):
+    """switch_range with AnimProfiler on: same calls, the wall time shows the cost of the instrumentation."""
+    tool = build_switch_scene(scene, cmds, frames)
+    profiler = load_tool("AnimProfiler")
+    profiler.set_enabled(True)
+    def run():
+        try:
+            tool.switch_frame_range("rig", 1, frames)
+        finally:
+            profiler.set_enabled(False)
+    return run
+
+def scenario_on_ik(scene, cmds, frames):
+    build_arm_rig(scene, frames)
+    cmds.select("IK_Shoulder_L", "IK_Elbow_L", "IK_Wrist_L")
+    return load_tool("OnIk").create_group_based_on_selection
+
+def scenario_on_fk(scene, cmds, frames):
+    build_arm_rig(scene, frames)
+    cmds.select("IK_Shoulder_L", "IK_Elbow_L", "IK_Wrist_L")
+    return load_tool("OnFk").create_three_groups_with_constraints_and_prefix
+
+def scenario_pole_vector_solver(scene, cmds, frames):
+    """Pole vector positions of 160 limbs (40 characters, 4 limbs) on every frame: pure math, no cmds call."""
+    chains = []
+    for limb in range(160):
+        bends = [(limb + frame) % 7 * 0.5 for frame in range(frames)]
+        chains.append(([(0.0, 0.0, 0.0)] * frames,
+                       [(10.0, bend, -bend) for bend in bends],
+                       [(20.0 - bend, 0.0, 0.0) for bend in bends]))
+    def run():
+        for roots, middles, ends in chains:
+            AnimMath.pole_vector_positions(roots, middles, ends)
+    return run
+
+def scenario_switch_setup_crowd(scene, cmds, frames):
+    """Switch locators of the left arm of 20 referenced characters (namespaces char0: to char19:) in one batch."""
+    rigs = [build_arm_rig(scene, frames, f"char{index}:rig") for index in range(20)]
+    mapping = {"sides": ["_L"], "limbs": {"Arm": {"ik": ["IK_Shoulder{side}", "IK_Elbow{side}", "IK_Wrist{side}"],
+                                                  "fk": ["FK_Shoulder{side}", "FK_Elbow{side}", "FK_Wrist{side}"]}}}
+    tool = load_tool("SwitchSetupBatch")
+    return lambda: tool.set_up_rigs(rigs, mapping)
+
+def scenario_switch_setup_crowd_stored(scene, cmds, frames):
+    """switch_setup_crowd storing the targets on the joints: no locator, constraint or group."""
+    rigs = [build_arm_rig(scene, frames, f"char{index}:rig") for index in range(20)]
+    mapping = {"sides": ["_L"], "limbs": {"Arm": {"ik": ["IK_Shoulder{side}", "IK_Elbow{side}", "IK_Wrist{side}"],
+                                                  "fk": ["FK_Shoulder{side}", "FK_Elbow{side}", "FK_Wrist{side}"]}}}
+    tool = load_tool("SwitchSetupBatch")
+    return lambda: tool.set_up_rigs(rigs, mapping, stored=True)
+
+def scenario_reset(scene, cmds, frames):
+    objects = [build_animated(scene, f"ctrl{index}", frames) for index in range(100)]
+    menu = load_tool("AnimToolMenu")
+    menu.set_reset_mode(menu.ResetTool.FRAME_RANGE)
+    scene.min_time, scene.max_time = 1.0, float(frames)
+    cmds.select(objects)
+    return lambda: menu.reset_to_defaults("All")
+
+def scenario_reset_sliced(scene, cmds, frames):
+    """Same reset as reset, with one object per slice of the idle queue: the cost of the background execution."""
+    run = scenario_reset(scene, cmds, frames)
+    sys.modules["AnimScheduler"].SLICE_SECONDS = 0.0
+    return run
+
+def scenario_menu_launch(scene, cmds, frames):
+    """Ten launches of a tool window from the menu: only the first one imports the tool."""
+    menu = load_tool("AnimToolMenu")
+    def run():
+        for _ in range(10):
+            menu.run_follow_tool()
+    return run
+
+SCENARIOS = [
+    ("follow", scenario_follow),
+    ("follow_reduced", scenario_follow_reduced),
+    ("follow_scrub", scenario_follow_scrub),
+    ("follow_batch", scenario_follow_batch),
+    ("follow_live", scenario_follow_live),
+    ("follow_background", scenario_follow_background),
+    ("pivot_setup", scenario_pivot_setup),
+    ("pivot_setup_batch", scenario_pivot_setup_batch),
+    ("pivot_range", scenario_pivot_range),
+    ("pivot_selection_ui", scenario_pivot_selection_ui),
+    ("switch_frame", scenario_switch_frame),
+    ("switch_range", scenario_switch_range),
+    ("switch_range_stored", scenario_switch_range_stored),
+    ("switch_range_profiled", scenario_switch_range_profiled),
+    ("on_ik", scenario_on_ik),
+    ("on_fk", scenario_on_fk),
+    ("pole_vector_solver", scenario_pole_vector_solver),
+    ("switch_setup_crowd", scenario_switch_setup_crowd),
+    ("switch_setup_crowd_stored", scenario_switch_setup_crowd_stored),
+    ("reset", scenario_reset),
+    ("reset_sliced", scenario_reset_sliced),
+    ("menu_launch", scenario_menu_launch),
+]
+
+# --- Runner ----------------------------------------------------------------------------------------
+
+def count_keys(scene):
+    return sum(len(node.keys) for node in scene.nodes.values() if node.type.startswith("animCurve"))
+
+def run_scenario(function, size, frames):
+    """Builds a fresh scene of size nodes, runs the scenario and returns its measures."""
+    for name in TOOL_MODULES:
+        sys.modules.pop(name, None)
+    scene, cmds = FakeMaya.install()
+    scene.cmds = cmds
+    scene.min_time, scene.max_time = 1.0, float(frames)
+
+    run = function(scene, cmds, frames)
+    build_filler(scene, size)
+
+    scene.stats.clear()
+    scene.simulated_time = 0.0
+    keys_before = count_keys(scene)
+    tracemalloc.start()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        run()
+        # Background jobs (AnimScheduler) run their slices when Maya is idle: after the scenario
+        slices = scene.run_deferred()
+    wall_time = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    commands = {name[5:]: count for name, count in scene.stats.items() if name.startswith("cmds.")}
+    return {
+        "nodes": len(scene.nodes),
+        "calls": scene.stats["cmds_calls"],
+        "commands": dict(sorted(commands.items(), key=lambda item: -item[1])),
+        "time_changes": scene.stats["time_changes"],
+        "context_evaluations": scene.stats["context_evaluations"],
+        "keys": count_keys(scene) - keys_before,
+        "idle_slices": slices,
+        "wall_ms": round(wall_time * 1000.0, 2),
+        "maya_ms": round(scene.simulated_time * 1000.0, 2),
+        "peak_kb": round(peak / 1024.0, 1),
+        "warnings": list(cmds.warnings),
+    }
+
+def print_report(results):
+    header = f"{'scenario':<26}{'size':>8}{'calls':>9}{'time chg':>10}{'ctx eval':>10}{'keys':>8}{'wall ms':>10}{'maya ms':>10}{'peak KB':>10}  top commands"
+    print(header)
+    print("-" * len(header))
+    for result in results:
+        top = ", ".join(f"{name} {count}" for name, count in list(result["commands"].items())[:3])
+        print(f"{result['scenario']:<26}{result['size']:>8}{result['calls']:>9}{result['time_changes']:>10}"
+              f"{result['context_evaluations']:>10}{result['keys']:>8}{result['wall_ms']:>10.1f}{result['maya_ms']:>10.1f}"
+              f"{result['peak_kb']:>10.1f}  {top}")
+
+def compare_to_baseline(results, baseline_path, tolerance):
+    """Returns the list of regressions: scenarios making more cmds calls than in the baseline."""
+    with open(baseline_path) as baseline_file:
+        baseline = {(entry["scenario"], entry["size"]): entry for entry in json.load(baseline_file)["results"]}
+
+    regressions = []
+    for result in results:
+        previous = baseline.get((result["scenario"], result["size"]))
+        if previous and result["calls"] > previous["calls"] * (1.0 + tolerance):
+            regressions.append(f"{result['scenario']} ({result['size']} nodes): "
+                               f"{previous['calls']} -> {result['calls']} cmds calls")
+    return regressions
+
+def main(arguments=None):
+    parser = argparse.ArgumentParser(description="Benchmarks the AnimTool scripts on a fake Maya scene.")
+    parser.add_argument("--sizes", default=",".join(str(size) for size in DEFAULT_SIZES),
+                        help="Scene sizes in nodes, comma separated.")
+    parser.add_argument("--frames", type=int, default=100, help="Frames of the animated ranges.")
+    parser.add_argument("--only", default="", help="Scenarios to run, comma separated (all by default).")
+    parser.add_argument("--json", help="Writes the results to this file.")
+    parser.add_argument("--baseline", help="Results file to compare the cmds calls with.")
+    parser.add_argument("--tolerance", type=float, default=0.0, help="Allowed increase of calls (0.1 = 10%%).")
+    options = parser.parse_args(arguments)
+
+    sizes = [int(size) for size in options.sizes.split(",") if size]
+    names = [name for name in options.only.split(",") if name]
+    unknown = set(names) - {name for name, _ in SCENARIOS}
+    if unknown:
+        parser.error(f"Unknown scenarios: {', '.join(sorted(unknown))}")
+
+    results = []
+    for name, function in SCENARIOS:
+        if names and name not in names:
+            continue
+        for size in sizes:
+            result = run_scenario(function, size, options.frames)
+            result.update(scenario=name, size=size)
+            results.append(result)
+
+    print_report(results)
+
+    if options.json:
+        with open(options.json, "w") as json_file:
+            json.dump({"frames": options.frames, "results": results}, json_file, indent=2)
+
+    if options.baseline:
+        regressions = compare_to_baseline(results, options.baseline, options.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        return 1 if regressions else 0
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
+
+# By Teo2103D
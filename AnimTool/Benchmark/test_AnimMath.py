@@ -0,0 +1,169 @@
+import math
+import os
+import random
+import sys
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(HERE))
+
+import AnimMath
+
+# By Teo2103D
+
+# Tests of the matching math (no Maya needed): python -m pytest Benchmark
+
+TRANSFORMS = [
+    # Pivots, rotate axis and joint orient together, like a rig control with a moved pivot
+    dict(joint_orient=(10.0, -35.0, 80.0), rotate_axis=(5.0, 20.0, -15.0),
+         scale_pivot=(1.0, 2.0, -3.0), rotate_pivot=(-2.0, 0.5, 4.0),
+         scale_pivot_translate=(0.3, -0.2, 0.1), rotate_pivot_translate=(1.5, -1.0, 0.25)),
+    dict(joint_orient=(0.0, 90.0, 0.0)),
+    dict(rotate_pivot=(3.0, 3.0, 3.0), scale_pivot=(3.0, 3.0, 3.0)),
+    dict(),
+]
+
+def assert_close(a, b, tolerance=1e-9):
+    assert len(a) == len(b)
+    for x, y in zip(a, b):
+        assert abs(x - y) < tolerance, (a, b)
+
+def random_channels(seed, count=20):
+    generator = random.Random(seed)
+    translates = [tuple(generator.uniform(-50.0, 50.0) for _ in range(3)) for _ in range(count)]
+    rotates = [tuple(generator.uniform(-170.0, 170.0) for _ in range(3)) for _ in range(count)]
+    scales = [tuple(generator.uniform(0.2, 3.0) for _ in range(3)) for _ in range(count)]
+    return translates, rotates, scales
+
+def test_compose_decompose_round_trip():
+    for rotate_order in range(6):
+        for index, transform in enumerate(TRANSFORMS):
+            translates, rotates, scales = random_channels(rotate_order * 10 + index)
+            matrices = AnimMath.compose(translates, rotates, scales, rotate_order, **transform)
+            new_translates, new_rotates, new_scales = AnimMath.decompose(matrices, rotate_order,
+                                                                         filter_euler=False, **transform)
+            for t, new_t in zip(translates, new_translates):
+                assert_close(t, new_t, 1e-7)
+            for s, new_s in zip(scales, new_scales):
+                assert_close(s, new_s, 1e-9)
+            # The rotation can come back as the other Euler solution: compare the matrices
+            assert_close([value for m in matrices for value in m],
+                         [value for m in AnimMath.compose(new_translates, new_rotates, new_scales, rotate_order,
+                                                          **transform) for value in m], 1e-7)
+
+def test_decompose_gimbal_lock():
+    matrices = AnimMath.compose([(1.0, 2.0, 3.0)], [(30.0, 90.0, 10.0)], [(1.0, 1.0, 1.0)])
+    translates, rotates, scales = AnimMath.decompose(matrices, filter_euler=False)
+    assert_close(matrices[0], AnimMath.compose(translates, rotates, scales)[0], 1e-7)
+
+def test_inverse():
+    matrix = AnimMath.compose([(4.0, -2.0, 7.0)], [(20.0, 40.0, 60.0)], [(2.0, 0.5, 1.5)], 2, **TRANSFORMS[0])[0]
+    assert_close(AnimMath.multiply(matrix, AnimMath.inverse(matrix)), AnimMath.IDENTITY)
+
+def test_euler_filter_wraps_and_flips():
+    # A spin through 180 degrees keeps going instead of jumping back to -180
+    filtered = AnimMath.euler_filter([(0.0, 0.0, 170.0), (0.0, 0.0, -175.0), (0.0, 0.0, -160.0)])
+    assert_close([rotate[2] for rotate in filtered], [170.0, 185.0, 200.0])
+
+    # The flipped solution of the same orientation is replaced by the one closest to the previous rotation
+    filtered = AnimMath.euler_filter([(180.0, 170.0, 180.0)], previous=(0.0, 10.0, 0.0))
+    assert_close(filtered[0], (0.0, 10.0, 0.0))
+
+def test_euler_filter_keeps_the_orientation():
+    rotates = [(0.0, 80.0 + frame * 4.0, 200.0 - frame * 37.0) for frame in range(10)]
+    for rotate_order in range(6):
+        filtered = AnimMath.euler_filter(rotates, rotate_order, previous=(720.0, 0.0, 0.0))
+        for rotate, new_rotate in zip(rotates, filtered):
+            assert_close(AnimMath.euler_to_rotation(rotate, rotate_order),
+                         AnimMath.euler_to_rotation(new_rotate, rotate_order))
+        for before, after in zip(filtered, filtered[1:]):
+            assert all(abs(a - b) < 180.0 for a, b in zip(before, after))
+
+def test_move_pivots_keeps_the_matrix():
+    translates, rotates, scales = random_channels(7, 5)
+    for rotate_order in range(6):
+        for transform in TRANSFORMS:
+            for t, r, s in zip(translates, rotates, scales):
+                matrix = AnimMath.compose([t], [r], [s], rotate_order, **transform)[0]
+                new_pivot = (7.0, -3.0, 12.0)
+                options = {key: value for key, value in transform.items()
+                           if key in ("joint_orient", "rotate_axis")}
+                spt, rpt = AnimMath.move_pivots(new_pivot, r, s, rotate_order, **transform)
+                moved = AnimMath.compose([t], [r], [s], rotate_order, scale_pivot=new_pivot, rotate_pivot=new_pivot,
+                                         scale_pivot_translate=spt, rotate_pivot_translate=rpt, **options)[0]
+                assert_close(matrix, moved, 1e-7)
+
+def evaluate_reduced(times, values, kept, time):
+    """Value at time of the spline curve through the kept samples (Maya's spline tangents)."""
+    kept_times = [times[index] for index in kept]
+    kept_values = [values[index] for index in kept]
+    slopes = AnimMath.spline_slopes(kept_times, kept_values)
+    for key in range(len(kept) - 1):
+        if kept_times[key] <= time <= kept_times[key + 1]:
+            return AnimMath._hermite(time, kept_times[key], kept_values[key], slopes[key],
+                                     kept_times[key + 1], kept_values[key + 1], slopes[key + 1])
+    raise ValueError(time)
+
+def test_reduce_keys_linear_curve():
+    times = list(range(1, 101))
+    kept = AnimMath.reduce_keys(times, [2.0 * t + 1.0 for t in times], 0.01)
+    assert kept == [0, 1, 98, 99]
+
+def test_reduce_keys_stays_within_tolerance():
+    times = list(range(1, 201))
+    values = [10.0 * math.sin(t / 15.0) + (5.0 if t > 120 else 0.0) for t in times]
+    for tolerance in (0.001, 0.05, 0.5):
+        kept = AnimMath.reduce_keys(times, values, tolerance)
+        assert kept[:2] == [0, 1] and kept[-2:] == [198, 199]
+        assert len(kept) < len(times)
+        for time, value in zip(times, values):
+            assert abs(evaluate_reduced(times, values, kept, time) - value) <= tolerance + 1e-9
+
+def test_reduce_keys_short_or_exact():
+    assert AnimMath.reduce_keys([1, 2, 3], [0.0, 5.0, 1.0], 0.1) == [0, 1, 2]
+    assert AnimMath.reduce_keys([1, 2, 3, 4, 5, 6], [0.0, 5.0, 1.0, 3.0, 2.0, 8.0], 0.0) == [0, 1, 2, 3, 4, 5]
+
+def test_pole_vector_bent_chain():
+    # Arm along X bent towards -Z: the pole vector goes out from the elbow, half the chain length away
+    positions = AnimMath.pole_vector_positions([(0.0, 0.0, 0.0)], [(10.0, 0.0, -2.0)], [(20.0, 0.0, 0.0)])
+    length = 2.0 * math.sqrt(104.0)
+    assert_close(positions[0], (10.0, 0.0, -2.0 - 0.5 * length))
+
+def test_pole_vector_bend_along_world_y():
+    positions = AnimMath.pole_vector_positions([(0.0, 0.0, 0.0)], [(0.0, 5.0, 5.0)], [(0.0, 0.0, 10.0)], 1.0)
+    assert_close(positions[0], (0.0, 5.0 + 2.0 * math.sqrt(50.0), 5.0))
+    frame = AnimMath.aim_matrices(positions, [(0.0, 5.0, 5.0)])[0]
+    assert all(math.isfinite(value) for value in frame)
+    assert_close(frame[0:3], (0.0, -1.0, 0.0))
+
+def test_pole_vector_straight_frames_use_the_closest_bent_frame():
+    roots = [(0.0, 0.0, 0.0)] * 5
+    ends = [(20.0, 0.0, 0.0)] * 5
+    # Frames 0 and 4 are bent in opposite directions, 1 to 3 are straight
+    middles = [(10.0, 0.0, 1.0), (10.0, 0.0, 0.0), (10.0, 0.0, 0.0), (10.0, 0.0, 0.0), (10.0, 0.0, -1.0)]
+    positions = AnimMath.pole_vector_positions(roots, middles, ends, 0.5)
+    assert positions[1][2] > 0.0
+    assert positions[2][2] > 0.0   # Tie between frames 0 and 4: the earlier one
+    assert positions[3][2] < 0.0
+    assert_close(positions[1], (10.0, 0.0, 10.0))
+
+def test_pole_vector_never_bent():
+    roots, middles, ends = [(0.0, 0.0, 0.0)] * 2, [(10.0, 0.0, 0.0)] * 2, [(20.0, 0.0, 0.0)] * 2
+    # Without a bend nor a fallback the middle joint is returned (no division by zero)
+    assert_close([value for p in AnimMath.pole_vector_positions(roots, middles, ends) for value in p],
+                 [10.0, 0.0, 0.0] * 2)
+    positions = AnimMath.pole_vector_positions(roots, middles, ends, 0.5, [(0.0, 3.0, 0.0), (0.0, 0.0, -2.0)])
+    assert_close(positions[0], (10.0, 10.0, 0.0))
+    assert_close(positions[1], (10.0, 0.0, -10.0))
+
+def test_aim_matrices_degenerate():
+    # Aimed along the up vector: another up is used, the frame stays orthonormal
+    frame = AnimMath.aim_matrices([(0.0, 0.0, 0.0)], [(0.0, 3.0, 0.0)])[0]
+    x, y, z = frame[0:3], frame[4:7], frame[8:11]
+    assert_close(x, (0.0, 1.0, 0.0))
+    assert abs(sum(a * b for a, b in zip(x, y))) < 1e-12
+    assert_close([sum(v * v for v in axis) for axis in (x, y, z)], [1.0, 1.0, 1.0])
+    # Origin on its target: world axes
+    assert_close(AnimMath.aim_matrices([(1.0, 2.0, 3.0)], [(1.0, 2.0, 3.0)])[0],
+                 AnimMath.IDENTITY[:12] + [1.0, 2.0, 3.0, 1.0])
+
+# By Teo2103D
@@ -1,11 +1,26 @@
 import maya.cmds as cmds
+import AnimBake
+import AnimMath
+import AnimOperation
+import AnimScheduler
 
 # By Teo2103D
 
-def create_matched_groups_with_animation(obj_1, obj_2, start_frame, end_frame):
+# Live follow: message attribute on the multMatrix of a follower, connected from its driver
+LIVE_FOLLOW_ATTR = "liveFollowDriver"
+# Matrix attribute on the multMatrix keeping what the follower had in its offsetParentMatrix (rest offset of the rig):
+# its value, or the connection that fed it
+LIVE_FOLLOW_REST_ATTR = "liveFollowRest"
+# Attribute marking the pickMatrix nodes created by the live follow (a rig can have its own on the driver)
+LIVE_FOLLOW_PICK_ATTR = "liveFollowPick"
+
+@AnimOperation.as_operation("Follow")
+def create_matched_groups_with_animation(obj_1, obj_2, start_frame, end_frame, fast_bake=True):
     """
     Creates two groups that follow the transformations of the selected objects and animates the second object
     so that it follows the second group between the start_frame and end_frame.
+    With fast_bake, the second group is sampled with context time instead of moving the timeline on every frame,
+    and the keys of each channel are written as one batch.
     """
     if not cmds.objExists(obj_1) or not cmds.objExists(obj_2):
         cmds.warning("One of the selected objects no longer exists!")
@@ -37,13 +52,16 @@ def create_matched_groups_with_animation(obj_1, obj_2, start_frame, end_frame):
                                        'rotateX', 'rotateY', 'rotateZ', 
                                        'scaleX', 'scaleY', 'scaleZ'], time=start_frame-1)
 
-    # Make the second object follow the second group with an animation keyframe for each frame
-    for t in range(start_frame, end_frame + 1):
-        cmds.currentTime(t, edit=True)
-        cmds.xform(obj_2, ws=True, matrix=cmds.xform(grp_2, q=True, ws=True, matrix=True))
-        cmds.setKeyframe(obj_2, attribute=['translateX', 'translateY', 'translateZ', 
-                                           'rotateX', 'rotateY', 'rotateZ', 
-                                           'scaleX', 'scaleY', 'scaleZ'], time=t)
+    if fast_bake:
+        bake_follow_keys(obj_2, grp_2, start_frame, end_frame)
+    else:
+        # Make the second object follow the second group with an animation keyframe for each frame
+        for t in range(start_frame, end_frame + 1):
+            cmds.currentTime(t, edit=True)
+            cmds.xform(obj_2, ws=True, matrix=cmds.xform(grp_2, q=True, ws=True, matrix=True))
+            cmds.setKeyframe(obj_2, attribute=['translateX', 'translateY', 'translateZ', 
+                                               'rotateX', 'rotateY', 'rotateZ', 
+                                               'scaleX', 'scaleY', 'scaleZ'], time=t)
 
     print(f"Groups and animation created:\n"
           f" - {grp_1} (matched to {obj_1}, with parent constraint)\n"
@@ -53,11 +71,390 @@ def create_matched_groups_with_animation(obj_1, obj_2, start_frame, end_frame):
     # Delete only the first group
     cmds.delete(grp_1)
 
+def bake_follow_keys(obj, grp, start_frame, end_frame):
+    """
+    Samples the world matrix of grp and the parent inverse matrix of obj for every frame in one pass,
+    decomposes them into obj's channels and writes all the keys of each channel at once.
+    """
+    frames = list(range(start_frame, end_frame + 1))
+    world_plug = f"{grp}.worldMatrix[0]"
+    parent_plug = f"{obj}.parentInverseMatrix[0]"
+
+    samples = AnimBake.sample_matrices([world_plug, parent_plug], frames)
+    previous_rotate = cmds.getAttr(f"{obj}.rotate", time=start_frame - 1)[0]
+    values = AnimBake.decompose_local_matrices(obj, samples[world_plug], samples[parent_plug], previous_rotate)
+    AnimBake.write_keys(obj, values, frames)
+
+@AnimOperation.as_operation("Follow Batch")
+def bake_follow_pairs(pairs, start_frame, end_frame):
+    """
+    Batch version of the follow: each (driver, driven) pair is baked so the driven object keeps
+    its offset to the driver from start_frame, without helper groups.
+    Every driver (and every parent of a driven object) is sampled once per frame in a single shared pass,
+    so several driven objects on the same driver cost nothing more to sample.
+    Pairs can depend on each other (a control chain, or a driven object driving another pair): they are baked
+    parent first, and the new motion of each baked object is carried to the pairs it moves, like AnimBake.bake_matches.
+    """
+    return AnimScheduler.run_now(iter_bake_follow_pairs(pairs, start_frame, end_frame))
+
+def iter_bake_follow_pairs(pairs, start_frame, end_frame):
+    """
+    Job of bake_follow_pairs for AnimScheduler: one step per frame sampled, then the keys of all the pairs
+    (AnimScheduler.EDIT). Returns the number of pairs baked.
+    """
+    missing = [obj for pair in pairs for obj in pair if not cmds.objExists(obj)]
+    if missing:
+        cmds.warning(f"These objects no longer exist: {', '.join(missing)}")
+        return 0
+
+    long_names = {obj: cmds.ls(obj, long=True)[0] for pair in pairs for obj in pair}
+    pairs = order_follow_pairs(pairs, long_names)
+    if pairs is None:
+        return 0
+
+    frames = list(range(start_frame, end_frame + 1))
+    driven_objects = [driven for _, driven in pairs]
+
+    # Offset between each driven object and its driver at the start frame (what TeoOffset/TeoMAT hold).
+    # The driver's scale is ignored, like the parentConstraint of the single follow.
+    offsets = [AnimMath.multiply(cmds.getAttr(f"{driven}.worldMatrix[0]", time=start_frame),
+                                 AnimMath.inverse(AnimMath.remove_scale(
+                                     [cmds.getAttr(f"{driver}.worldMatrix[0]", time=start_frame)])[0]))
+               for driver, driven in pairs]
+
+    # One sampling pass shared by all the pairs (a plug used by several pairs is read once)
+    plugs = []
+    for driver, driven in pairs:
+        for plug in (f"{driver}.worldMatrix[0]", f"{driven}.parentInverseMatrix[0]"):
+            if plug not in plugs:
+                plugs.append(plug)
+    # Motion before the bake of the driven objects that move other pairs (driver or parent of another one)
+    for _, driven in pairs:
+        path = long_names[driven]
+        moves_others = any(long_names[obj] == path or long_names[obj].startswith(path + "|")
+                           for other in pairs if other[1] != driven for obj in other)
+        if moves_others and f"{driven}.worldMatrix[0]" not in plugs:
+            plugs.append(f"{driven}.worldMatrix[0]")
+    count = len(frames) + len(pairs)
+    samples = yield from _iter_samples(plugs, frames, count)
+    yield AnimScheduler.EDIT
+
+    # Same key as the single follow, holding the start pose before the driven objects start following
+    cmds.currentTime(start_frame, edit=True)
+    cmds.setKeyframe(driven_objects, attribute=AnimBake.TRANSFORM_CHANNELS, time=start_frame - 1)
+
+    # New world matrices of the driven objects already baked
+    new_worlds = {}
+
+    def get_baked_anchor(obj, strict=False):
+        """Closest object baked above obj in the hierarchy (or obj itself unless strict), or None."""
+        path = long_names[obj]
+        anchors = [other for other in new_worlds if path.startswith(long_names[other] + "|")
+                   or (not strict and path == long_names[other])]
+        return max(anchors, key=lambda other: len(long_names[other])) if anchors else None
+
+    for index, ((driver, driven), offset) in enumerate(zip(pairs, offsets)):
+        # Driver moved by a bake done before: old world x (old anchor -> new anchor)
+        driver_worlds = samples[f"{driver}.worldMatrix[0]"]
+        anchor = get_baked_anchor(driver)
+        if anchor == driver:
+            driver_worlds = new_worlds[driver]
+        elif anchor:
+            driver_worlds = [AnimMath.multiply(AnimMath.multiply(world, AnimMath.inverse(old)), new)
+                             for world, old, new in zip(driver_worlds, samples[f"{anchor}.worldMatrix[0]"],
+                                                        new_worlds[anchor])]
+
+        # Parent moved by a bake done before: same correction on its inverse
+        parent_inverses = samples[f"{driven}.parentInverseMatrix[0]"]
+        anchor = get_baked_anchor(driven, strict=True)
+        if anchor:
+            parent_inverses = [AnimMath.multiply(AnimMath.multiply(AnimMath.inverse(new), old), parent_inverse)
+                               for parent_inverse, old, new in zip(parent_inverses, samples[f"{anchor}.worldMatrix[0]"],
+                                                                   new_worlds[anchor])]
+
+        world_matrices = AnimMath.multiply_many(offset, AnimMath.remove_scale(driver_worlds))
+        new_worlds[driven] = world_matrices
+        previous_rotate = cmds.getAttr(f"{driven}.rotate", time=start_frame - 1)[0]
+        values = AnimBake.decompose_local_matrices(driven, world_matrices, parent_inverses, previous_rotate)
+        AnimBake.write_keys(driven, values, frames)
+        yield len(frames) + index + 1, count
+
+    print(f"{len(pairs)} objects follow their driver from frame {start_frame} to {end_frame}, with animation keys.")
+    return len(pairs)
+
+def order_follow_pairs(pairs, long_names):
+    """
+    Orders the (driver, driven) pairs for the batch bake: a pair comes after the pairs whose driven object
+    is its driver, or above its driver or its driven object in the hierarchy.
+    long_names: {object: long name} of all the objects of the pairs.
+    Returns None (with an error message) when an object is driven twice or the pairs drive each other in a loop.
+    """
+    driven_objects = [driven for _, driven in pairs]
+    twice = sorted({driven for driven in driven_objects if driven_objects.count(driven) > 1})
+    if twice:
+        cmds.warning(f"These objects are driven by several drivers: {', '.join(twice)}")
+        return None
+
+    def moves(first, second):
+        """True if baking the first pair changes what the second one reads."""
+        path = long_names[first[1]]
+        return any(long_names[obj] == path or long_names[obj].startswith(path + "|") for obj in second)
+
+    remaining, ordered = list(pairs), []
+    while remaining:
+        ready = [pair for pair in remaining if not any(other is not pair and moves(other, pair) for other in remaining)]
+        if not ready:
+            cmds.warning("These pairs drive each other in a loop: "
+                         f"{', '.join(f'{driver} -> {driven}' for driver, driven in remaining)}")
+            return None
+        ordered += ready
+        remaining = [pair for pair in remaining if pair not in ready]
+    return ordered
+
+def _iter_samples(plugs, frames, count):
+    """
+    Samples the plugs over the frames for a job (AnimBake.iter_sample_matrices), yielding (frame index, count).
+    Ranges long enough for AnimShard are sampled by the worker processes, the job waiting for them between its yields.
+    Returns the samples.
+    """
+    import AnimShard
+    samples = {}
+    sampling = AnimShard.iter_sample_matrices if AnimShard.should_shard(frames) else AnimBake.iter_sample_matrices
+    for index, _ in sampling(plugs, frames, samples):
+        yield index, count
+    return samples
+
+def get_live_follow(obj):
+    """multMatrix node of the live follow driving obj, or None."""
+    for node in cmds.listConnections(f"{obj}.offsetParentMatrix", source=True, destination=False,
+                                     type="multMatrix") or []:
+        if cmds.attributeQuery(LIVE_FOLLOW_ATTR, node=node, exists=True):
+            return node
+    return None
+
+def get_driver_pick_matrix(driver):
+    """
+    pickMatrix giving the world matrix of the driver without its scale (like the parentConstraint of the follow),
+    shared by all the followers of this driver. Only the pickMatrix nodes made by the live follow are reused.
+    """
+    for node in cmds.listConnections(f"{driver}.worldMatrix[0]", source=False, destination=True,
+                                     type="pickMatrix") or []:
+        if cmds.attributeQuery(LIVE_FOLLOW_PICK_ATTR, node=node, exists=True):
+            return node
+
+    pick = cmds.createNode("pickMatrix", name=f"{driver.split('|')[-1].replace(':', '_')}_liveFollowPick")
+    cmds.addAttr(pick, longName=LIVE_FOLLOW_PICK_ATTR, attributeType="bool")
+    cmds.setAttr(f"{pick}.useScale", False)
+    cmds.setAttr(f"{pick}.useShear", False)
+    cmds.connectAttr(f"{driver}.worldMatrix[0]", f"{pick}.inputMatrix")
+    return pick
+
+def get_live_follow_rest(mult):
+    """
+    What the follower of a live follow had in its offsetParentMatrix: (source plug, None) if it was connected,
+    else (None, matrix). Identity for the follows made before it was kept.
+    """
+    if not cmds.attributeQuery(LIVE_FOLLOW_REST_ATTR, node=mult, exists=True):
+        return None, AnimMath.IDENTITY
+    source = cmds.listConnections(f"{mult}.{LIVE_FOLLOW_REST_ATTR}", source=True, destination=False, plugs=True)
+    if source:
+        return source[0], None
+    return None, cmds.getAttr(f"{mult}.{LIVE_FOLLOW_REST_ATTR}")
+
+def remove_live_follow(obj):
+    """
+    Deletes the live follow network of obj (and the pickMatrix of its driver once nothing uses it)
+    and gives its offsetParentMatrix back what it had before (value or connection).
+    The object jumps back to its own channels.
+    """
+    mult = get_live_follow(obj)
+    if mult is None:
+        return False
+
+    rest_plug, rest = get_live_follow_rest(mult)
+    pick = (cmds.listConnections(f"{mult}.matrixIn[1]", source=True, destination=False) or [None])[0]
+    cmds.delete(mult)
+    if pick and not cmds.listConnections(f"{pick}.outputMatrix", source=False, destination=True):
+        cmds.delete(pick)
+    if rest_plug:
+        cmds.connectAttr(rest_plug, f"{obj}.offsetParentMatrix", force=True)
+    else:
+        cmds.setAttr(f"{obj}.offsetParentMatrix", *rest, type="matrix")
+    return True
+
+@AnimOperation.as_operation("Live Follow")
+def create_live_follows(pairs, start_frame):
+    """
+    Live version of the follow, without baking: each driven object follows its driver through its
+    offsetParentMatrix, driven by one multMatrix node (no helper group, no constraint):
+        offset (captured once at start_frame) x driver world matrix without scale x parent world inverse matrix
+    The offset also compensates the object's own channels at start_frame, so nothing moves when it is created;
+    its channels stay usable as an offset on top of the follow.
+    Use bake_live_follows to turn the follow into keys and remove the network.
+    """
+    missing = [obj for pair in pairs for obj in pair if not cmds.objExists(obj)]
+    if missing:
+        cmds.warning(f"These objects no longer exist: {', '.join(missing)}")
+        return []
+
+    # offsetParentMatrix exists since Maya 2020 (and only on transforms)
+    without = [driven for _, driven in pairs if not cmds.attributeQuery("offsetParentMatrix", node=driven, exists=True)]
+    if without:
+        cmds.warning(f"The live follow needs the offsetParentMatrix attribute (Maya 2020 or newer): {', '.join(without)}")
+        return []
+
+    # The networks would make a DG cycle: an object driven twice, pairs driving each other, a driver under its follower
+    long_names = {obj: cmds.ls(obj, long=True)[0] for pair in pairs for obj in pair}
+    if order_follow_pairs(pairs, long_names) is None:
+        return []
+    inside = [f"{driver} -> {driven}" for driver, driven in pairs
+              if long_names[driver] == long_names[driven] or long_names[driver].startswith(long_names[driven] + "|")]
+    if inside:
+        cmds.warning(f"These drivers are moved by their own follower: {', '.join(inside)}")
+        return []
+
+    created = []
+    for driver, driven in pairs:
+        # A new follow replaces the previous one (the start pose below includes it, so nothing jumps)
+        world = cmds.getAttr(f"{driven}.worldMatrix[0]", time=start_frame)
+        local = cmds.getAttr(f"{driven}.matrix", time=start_frame)
+        driver_world = AnimMath.remove_scale([cmds.getAttr(f"{driver}.worldMatrix[0]", time=start_frame)])[0]
+        remove_live_follow(driven)
+
+        # world = local x offset x driver world, at start_frame
+        offset = AnimMath.multiply(AnimMath.inverse(local), AnimMath.multiply(world, AnimMath.inverse(driver_world)))
+
+        mult = cmds.createNode("multMatrix", name=f"{driven.split('|')[-1].replace(':', '_')}_liveFollow")
+        cmds.addAttr(mult, longName=LIVE_FOLLOW_ATTR, attributeType="message")
+        cmds.connectAttr(f"{driver}.message", f"{mult}.{LIVE_FOLLOW_ATTR}")
+
+        # Keep the rest offset of the rig (connection or value) to give it back when the follow is removed
+        cmds.addAttr(mult, longName=LIVE_FOLLOW_REST_ATTR, attributeType="matrix")
+        rest_source = cmds.listConnections(f"{driven}.offsetParentMatrix", source=True, destination=False, plugs=True)
+        if rest_source:
+            cmds.connectAttr(rest_source[0], f"{mult}.{LIVE_FOLLOW_REST_ATTR}")
+        else:
+            cmds.setAttr(f"{mult}.{LIVE_FOLLOW_REST_ATTR}", *cmds.getAttr(f"{driven}.offsetParentMatrix"), type="matrix")
+
+        cmds.setAttr(f"{mult}.matrixIn[0]", *offset, type="matrix")
+        cmds.connectAttr(f"{get_driver_pick_matrix(driver)}.outputMatrix", f"{mult}.matrixIn[1]")
+        parent = cmds.listRelatives(driven, parent=True, fullPath=True)
+        if parent:
+            cmds.connectAttr(f"{parent[0]}.worldInverseMatrix[0]", f"{mult}.matrixIn[2]")
+        cmds.connectAttr(f"{mult}.matrixSum", f"{driven}.offsetParentMatrix", force=True)
+        created.append(mult)
+
+    print(f"{len(created)} objects follow their driver live (offset taken at frame {start_frame}).")
+    return created
+
+@AnimOperation.as_operation("Bake Live Follow")
+def bake_live_follows(objects, start_frame, end_frame):
+    """
+    Bakes the live follow of the objects between start_frame and end_frame and removes it:
+    every follower is sampled in one shared pass, its network deleted and its keys written in one batch.
+    Objects without a live follow are ignored. Returns the number of objects baked.
+    """
+    return AnimScheduler.run_now(iter_bake_live_follows(objects, start_frame, end_frame))
+
+def iter_bake_live_follows(objects, start_frame, end_frame):
+    """
+    Job of bake_live_follows for AnimScheduler: one step per frame sampled, then the keys of all the followers
+    (AnimScheduler.EDIT). The networks are only removed with the keys, after the sampling. The keys are computed for the
+    offsetParentMatrix the follower gets back (the rest offset of the rig): local = world x inverse(rest x parent world).
+    """
+    followers = [obj for obj in objects if cmds.objExists(obj) and get_live_follow(obj)]
+    if not followers:
+        cmds.warning("None of these objects has a live follow.")
+        return 0
+
+    frames = list(range(start_frame, end_frame + 1))
+    plugs = []
+    rests = {}
+    for obj in followers:
+        plugs += [f"{obj}.worldMatrix[0]", f"{obj}.parentInverseMatrix[0]"]
+        rests[obj] = get_live_follow_rest(get_live_follow(obj))
+        if rests[obj][0]:
+            plugs.append(rests[obj][0])
+    count = len(frames) + len(followers)
+    samples = yield from _iter_samples(list(dict.fromkeys(plugs)), frames, count)
+    yield AnimScheduler.EDIT
+    previous_rotates = {obj: cmds.getAttr(f"{obj}.rotate", time=start_frame - 1)[0] for obj in followers}
+
+    # Without its network the offsetParentMatrix is back to the rest offset: with it, the keys give the followed motion
+    for index, obj in enumerate(followers):
+        remove_live_follow(obj)
+        rest_plug, rest = rests[obj]
+        rest_inverses = AnimMath.inverse_many(samples[rest_plug]) if rest_plug else AnimMath.inverse(rest)
+        parent_inverses = AnimMath.multiply_many(samples[f"{obj}.parentInverseMatrix[0]"], rest_inverses)
+        values = AnimBake.decompose_local_matrices(obj, samples[f"{obj}.worldMatrix[0]"],
+                                                   parent_inverses, previous_rotates[obj])
+        AnimBake.write_keys(obj, values, frames)
+        yield len(frames) + index + 1, count
+
+    print(f"Live follow of {len(followers)} objects baked from frame {start_frame} to {end_frame}.")
+    return len(followers)
+
+def get_follow_pairs(selection, one_driver):
+    """
+    Builds the (driver, driven) pairs from the selection:
+    - one_driver: the first object drives all the others
+    - otherwise: driver, driven, driver, driven...
+    """
+    if len(selection) < 2:
+        cmds.warning("Please select at least two objects.")
+        return []
+
+    if one_driver:
+        return [(selection[0], driven) for driven in selection[1:]]
+
+    if len(selection) % 2:
+        cmds.warning("Select the objects by pairs: driver, driven, driver, driven...")
+        return []
+    return list(zip(selection[0::2], selection[1::2]))
+
+def follow_objects(objects, start_frame, end_frame, fast_bake=True, one_driver=False, live=False):
+    """
+    Runs the follow on a list of objects ordered like the selection (no UI, used by the batch too):
+    a single pair keeps the original tool, several pairs use the batch bake.
+    With live, the followers get a live follow from start_frame instead of keys.
+    Returns the number of pairs baked (or followed live).
+    """
+    pairs = get_follow_pairs(objects, one_driver)
+    if live:
+        if pairs:
+            create_live_follows(pairs, start_frame)
+    elif len(pairs) == 1:
+        create_matched_groups_with_animation(pairs[0][0], pairs[0][1], start_frame, end_frame, fast_bake)
+    elif pairs:
+        bake_follow_pairs(pairs, start_frame, end_frame)
+    return len(pairs)
+
+def apply_follow(start_frame, end_frame, fast_bake, one_driver, live=False):
+    """
+    Runs the follow on the selection.
+    Fast bakes run in the background (AnimScheduler) with the batch bake, even for a single pair:
+    Maya stays usable during long ranges and the bake can be cancelled.
+    """
+    objects = cmds.ls(selection=True)
+    if live or not fast_bake or not AnimScheduler.runs_in_background():
+        follow_objects(objects, start_frame, end_frame, fast_bake, one_driver, live)
+        return
+
+    pairs = get_follow_pairs(objects, one_driver)
+    if pairs:
+        AnimScheduler.start("Follow Batch", iter_bake_follow_pairs(pairs, start_frame, end_frame))
+
+def bake_selected_live_follows(start_frame, end_frame):
+    """
+    Bakes and removes the live follow of the selected followers (in the background, see apply_follow).
+    """
+    AnimScheduler.start("Bake Live Follow", iter_bake_live_follows(cmds.ls(selection=True), start_frame, end_frame))
+
 def open_ui():
     if cmds.window("ConstraintAnimTool", exists=True):
         cmds.deleteUI("ConstraintAnimTool")
 
-    cmds.window("ConstraintAnimTool", title="FollowAnimTool", widthHeight=(320, 100))
+    cmds.window("ConstraintAnimTool", title="FollowAnimTool", widthHeight=(320, 190))
     cmds.columnLayout(adjustableColumn=True)
 
     cmds.text(label="Start Frame:")
@@ -66,15 +463,31 @@ def open_ui():
     cmds.text(label="End Frame:")
     end_frame_field = cmds.intField("endFrameField", value=cmds.playbackOptions(query=True, maxTime=True))
 
-    cmds.button(label="Apply", command=lambda *_: create_matched_groups_with_animation(
-        cmds.ls(selection=True)[0], cmds.ls(selection=True)[1], 
+    fast_bake_box = cmds.checkBox("fastBake", label="Fast bake (no timeline scrub)", value=True)
+
+    live_box = cmds.checkBox("liveFollow", label="Live (no keys, bake it later)", value=False)
+
+    mode_field = cmds.radioButtonGrp("followMode", label="Selection:", numberOfRadioButtons=2,
+                                     labelArray2=["Pairs", "One driver"], select=1,
+                                     columnWidth3=(60, 80, 80))
+
+    cmds.button(label="Apply", command=lambda *_: apply_follow(
         cmds.intField(start_frame_field, query=True, value=True), 
+        cmds.intField(end_frame_field, query=True, value=True),
+        cmds.checkBox(fast_bake_box, query=True, value=True),
+        cmds.radioButtonGrp(mode_field, query=True, select=True) == 2,
+        cmds.checkBox(live_box, query=True, value=True)
+    ))
+
+    cmds.button(label="Bake Live Follows (selected followers)", command=lambda *_: bake_selected_live_follows(
+        cmds.intField(start_frame_field, query=True, value=True),
         cmds.intField(end_frame_field, query=True, value=True)
     ))
 
     cmds.showWindow("ConstraintAnimTool")
 
-# Open the window
-open_ui()
+# Open the window when the file is run as a script (importing it has no side effect)
+if __name__ == "__main__":
+    open_ui()
 
 # By Teo2103D
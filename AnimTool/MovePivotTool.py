@@ -1,135 +1,243 @@
 import maya.cmds as cmds
+import re
+import AnimBake
+import AnimMath
+import AnimOperation
+import AnimScheduler
 
 #By Teo2103D
 
-# Store objects that already have locators
-tracked_objects = {}
-
-def neutralize_pivot_effect(obj):
+# Pivot setups of the scene, saved with it (nothing is kept in the module, which can be reloaded):
+# - every set-up object is connected to the registry node (object.message -> registry.setups)
+# - its locators are connected to it (locator.message -> object.pivotLocators[index in LOCATOR_NAMES])
+# Message connections follow renames and disappear with deleted nodes.
+PIVOT_REGISTRY = "AnimTool_pivotSetups"
+LOCATOR_NAMES = ["Origin", "PosPivot1", "PosPivot2"]
+LOCATOR_PLUG_PATTERN = re.compile(r"\.pivotLocators\[(\d+)\]$")
+
+# Constraint types found by the reverse index
+CONSTRAINT_TYPES = ["parentConstraint", "pointConstraint", "orientConstraint", "aimConstraint", "scaleConstraint"]
+
+# Gizmo template of the scene: one hidden transform carrying the curves of the gizmo, instanced for every object
+GIZMO_TEMPLATE = "pivotGizmo_template"
+GIZMO_AXIS_POINTS = [
+    [(0, 0, 0), (2, 0, 0)],  # X
+    [(0, 0, 0), (0, 2, 0)],  # Y
+    [(0, 0, 0), (0, 0, 2)],  # Z
+]
+GIZMO_CIRCLE_NORMALS = [(1, 0, 0), (0, 1, 0), (0, 0, 1)]
+
+# Destination plug of a target connection, e.g. "pc1.target[2].targetTranslate"
+TARGET_PLUG_PATTERN = re.compile(r"^(.+?)\.(?:target|tg)\[(\d+)\]")
+
+# Constraints following the pivot of their targets, and the target plugs the pivot compensation drives
+PIVOT_CONSTRAINT_TYPES = ("parentConstraint", "pointConstraint", "aimConstraint")
+TARGET_ATTR_PATTERN = re.compile(r"^(.+?)\.(?:target|tg)\[\d+\]\.(targetTranslate|tt|targetRotatePivot|trp"
+                                 r"|targetRotateTranslate|trt)$")
+
+def find_constraints_targeting(objects):
+    """
+    Builds a reverse index {object: {constraint: (constraint type, [target indices])}} of the constraints
+    that use each object as a target, from the connection graph with one listConnections query.
+    Connections from an object to a constraint it is driven by (constraintParentInverseMatrix...) are ignored.
+    Returns the index and the target connections of each object {object: [(source plug, destination plug), ...]}.
+    """
+    index = {obj: {} for obj in objects}
+    target_plugs = {obj: [] for obj in objects}
+    names = {}
+    for obj in objects:
+        for name in cmds.ls(obj) + cmds.ls(obj, long=True):
+            names[name] = obj
+
+    connections = cmds.listConnections(objects, source=False, destination=True, connections=True,
+                                       plugs=True, type="constraint") or []
+    constraint_types = {}
+
+    for source_plug, destination_plug in zip(connections[0::2], connections[1::2]):
+        match = TARGET_PLUG_PATTERN.match(destination_plug)
+        obj = names.get(source_plug.split('.')[0])
+        if not match or obj is None:
+            continue
+
+        constraint, target_index = match.group(1), int(match.group(2))
+        if constraint not in constraint_types:
+            constraint_types[constraint] = cmds.nodeType(constraint)
+        if constraint_types[constraint] not in CONSTRAINT_TYPES:
+            continue
+
+        _, indices = index[obj].setdefault(constraint, (constraint_types[constraint], []))
+        if target_index not in indices:
+            indices.append(target_index)
+        target_plugs[obj].append((source_plug, destination_plug))
+
+    return index, target_plugs
+
+def neutralize_pivot_effect(obj, constraints=None, target_plugs=None):
     """
-    Finds all parent and point constraints that use the selected object as a target,
-    then connects a Multiply Divide Node and a single PlusMinusAverage Node to correct the offsets without creating a cycle.
+    Finds all the constraints that use the selected object as a target (one connection query, or the
+    constraints and target connections found for it by find_constraints_targeting when several objects
+    are set up together),
+    then makes them follow the original pivot point of the object instead of its pivot.
+    A single pointMatrixMult node per object gives that point (original pivot x object matrix, which the pivot
+    snaps do not change) to the target translate of every parent, point and aim constraint, whose target
+    pivots are zeroed. The offsets of the constraints are left untouched, and more constraints add no node.
+    Orient and scale constraints do not depend on the pivot.
     """
-    if not cmds.objExists(obj):
-        cmds.warning(f"The object {obj} does not exist!")
+    if constraints is None:
+        if not cmds.objExists(obj):
+            cmds.warning(f"The object {obj} does not exist!")
+            return
+        index, plugs = find_constraints_targeting([obj])
+        constraints, target_plugs = index[obj], plugs[obj]
+
+    relevant_constraints = {constraint for constraint, (constraint_type, _) in constraints.items()
+                            if constraint_type in PIVOT_CONSTRAINT_TYPES}
+    if not relevant_constraints:
+        cmds.warning(f"No parent, point or aim constraint affecting {obj} found.")
         return
 
-    # Find all parent and point constraints in the scene
-    all_parent_constraints = cmds.ls(type="parentConstraint") or []
-    all_point_constraints = cmds.ls(type="pointConstraint") or []
-    
-    relevant_constraints = []
-
-    # Check if the object is a target of parentConstraints
-    for constraint in all_parent_constraints:
-        targets = cmds.parentConstraint(constraint, q=True, tl=True)
-        if obj in targets:
-            relevant_constraints.append(constraint)
+    remove_legacy_offset_network(obj, constraints)
+
+    # Compensation node of the object: its pivot point when set up, carried by the object's matrix
+    compensation = f"{obj}_pivotCompensation"
+    if not cmds.objExists(compensation):
+        compensation = cmds.createNode("pointMatrixMult", name=compensation)
+        local = cmds.getAttr(f"{obj}.matrix")
+        pivot_point = [sum(values) for values in zip(*[cmds.getAttr(f"{obj}.{attr}")[0] for attr in
+                                                       ("translate", "rotatePivot", "rotatePivotTranslate")])]
+        cmds.setAttr(f"{compensation}.inPoint", *AnimMath.transform_point(pivot_point, AnimMath.inverse(local)))
+        cmds.connectAttr(f"{obj}.matrix", f"{compensation}.inMatrix")
+
+    # Target plugs fed by the object: the translate comes from the node, the pivots are zeroed
+    for source_plug, destination_plug in target_plugs:
+        match = TARGET_ATTR_PATTERN.match(destination_plug)
+        if not match or match.group(1) not in relevant_constraints:
+            continue
+        if match.group(2) in ("targetTranslate", "tt"):
+            cmds.connectAttr(f"{compensation}.output", destination_plug, force=True)
+        else:
+            cmds.disconnectAttr(source_plug, destination_plug)
+            cmds.setAttr(destination_plug, 0, 0, 0)
 
-    # Check if the object is a target of pointConstraints
-    for constraint in all_point_constraints:
-        targets = cmds.pointConstraint(constraint, q=True, tl=True)
-        if obj in targets:
-            relevant_constraints.append(constraint)
+    print(f" Pivot of {obj} neutralized on {len(relevant_constraints)} constraints with a single compensation node.")
 
-    if not relevant_constraints:
-        cmds.warning(f"No parent or point constraint affecting {obj} found.")
-        return
-
-    # Create a Multiply Divide Node to reverse the Scale Pivot
+def remove_legacy_offset_network(obj, constraints):
+    """
+    Removes the nodes older setups added to correct the constraint offsets (a multiplyDivide per object and
+    a plusMinusAverage per constraint target) and gives the offsets back their values without the pivot.
+    """
     mult_node = f"{obj}_multReversePivot"
     if not cmds.objExists(mult_node):
-        mult_node = cmds.createNode("multiplyDivide", name=mult_node)
-        cmds.setAttr(f"{mult_node}.operation", 1)  # Multiplication
-        cmds.setAttr(f"{mult_node}.input2X", -1)
-        cmds.setAttr(f"{mult_node}.input2Y", -1)
-        cmds.setAttr(f"{mult_node}.input2Z", -1)
-
-    # Connect the object's Scale Pivot to the Multiply Divide Node
-    cmds.connectAttr(f"{obj}.scalePivotX", f"{mult_node}.input1X", force=True)
-    cmds.connectAttr(f"{obj}.scalePivotY", f"{mult_node}.input1Y", force=True)
-    cmds.connectAttr(f"{obj}.scalePivotZ", f"{mult_node}.input1Z", force=True)
-
-    # Apply the connection to the found constraints
-    for constraint in relevant_constraints:
-        # Determine if it's a parentConstraint or a pointConstraint
-        is_parent_constraint = cmds.objectType(constraint) == "parentConstraint"
-
-        # Get the offsets before the connection
-        if is_parent_constraint:
-            offset_x = cmds.getAttr(f"{constraint}.target[0].targetOffsetTranslateX")
-            offset_y = cmds.getAttr(f"{constraint}.target[0].targetOffsetTranslateY")
-            offset_z = cmds.getAttr(f"{constraint}.target[0].targetOffsetTranslateZ")
-        else:
-            offset_x = cmds.getAttr(f"{constraint}.offsetX")
-            offset_y = cmds.getAttr(f"{constraint}.offsetY")
-            offset_z = cmds.getAttr(f"{constraint}.offsetZ")
-
-        # Create a single PlusMinusAverage Node per constraint
-        add_node = cmds.createNode("plusMinusAverage", name=f"{constraint}_addOffset")
-        cmds.setAttr(f"{add_node}.operation", 1)  # Addition mode
-
-        # Set the current offset values in the Add nodes
-        cmds.setAttr(f"{add_node}.input1D[1]", offset_x)  # X → input1D
-        cmds.setAttr(f"{add_node}.input2D[1].input2Dx", offset_y)  # Y → input2Dx
-        cmds.setAttr(f"{add_node}.input3D[1].input3Dx", offset_z)  # Z → input3Dx
-
-        # Connect the Multiply Divide Node to the Add Node for each axis
-        cmds.connectAttr(f"{mult_node}.outputX", f"{add_node}.input1D[0]", force=True)  # X
-        cmds.connectAttr(f"{mult_node}.outputY", f"{add_node}.input2D[0].input2Dx", force=True)  # Y
-        cmds.connectAttr(f"{mult_node}.outputZ", f"{add_node}.input3D[0].input3Dx", force=True)  # Z
-
-        # Connect the Add Nodes to the offsets of the respective constraints
-        if is_parent_constraint:
-            cmds.connectAttr(f"{add_node}.output1D", f"{constraint}.target[0].targetOffsetTranslateX", force=True)
-            cmds.connectAttr(f"{add_node}.output2D.output2Dx", f"{constraint}.target[0].targetOffsetTranslateY", force=True)
-            cmds.connectAttr(f"{add_node}.output3D.output3Dx", f"{constraint}.target[0].targetOffsetTranslateZ", force=True)
-        else:
-            cmds.connectAttr(f"{add_node}.output1D", f"{constraint}.offsetX", force=True)
-            cmds.connectAttr(f"{add_node}.output2D.output2Dx", f"{constraint}.offsetY", force=True)
-            cmds.connectAttr(f"{add_node}.output3D.output3Dx", f"{constraint}.offsetZ", force=True)
+        return
 
-    print(f" Pivot of {obj} neutralized on its parent and point constraints with a single PlusMinusAverage per constraint.")
+    for constraint, (constraint_type, indices) in constraints.items():
+        if constraint_type == "parentConstraint":
+            offset_attrs = [[f"{constraint}.target[{index}].targetOffsetTranslate{axis}" for axis in "XYZ"]
+                            for index in indices]
+        elif constraint_type == "pointConstraint":
+            offset_attrs = [[f"{constraint}.offset{axis}" for axis in "XYZ"]]
+        else:
+            continue
+
+        for attrs in offset_attrs:
+            add_node = (cmds.listConnections(attrs[0], source=True, destination=False, type="plusMinusAverage") or [None])[0]
+            if add_node is None:
+                continue
+            offsets = [cmds.getAttr(f"{add_node}.{attr}")
+                       for attr in ("input1D[1]", "input2D[1].input2Dx", "input3D[1].input3Dx")]
+            weight_node = [node for node in cmds.listConnections(f"{add_node}.input1D[0]", source=True,
+                                                                 destination=False) or [] if node != mult_node]
+            cmds.delete(add_node, *weight_node)
+            for attr, value in zip(attrs, offsets):
+                cmds.setAttr(attr, value)
+
+    cmds.delete(mult_node)
+
+def _find_unregistered_setups():
+    """Objects set up before the registry existed, found by the name of their PosPivot1 locator."""
+    return AnimScheduler.run_now(_iter_unregistered_setups())
+
+def _iter_unregistered_setups():
+    """Job of _find_unregistered_setups for AnimScheduler: one step per locator. Returns the objects."""
+    setups = []
+    locators = cmds.ls("PosPivot1_*", "*:PosPivot1_*", type="transform") or []
+    for index, locator in enumerate(locators):
+        parent = cmds.listRelatives(locator, parent=True)
+        if parent and locator.split('|')[-1] == f"PosPivot1_{parent[0]}":
+            setups.append(parent[0])
+        yield index + 1, len(locators)
+    return setups
+
+def get_pivot_registry():
+    """
+    Returns the registry node of the scene, created with the first setup.
+    The setups made before it are registered then (once per scene).
+    """
+    if cmds.objExists(PIVOT_REGISTRY):
+        return PIVOT_REGISTRY
+
+    registry = cmds.createNode("network", name=PIVOT_REGISTRY)
+    cmds.addAttr(registry, longName="setups", attributeType="message", multi=True, indexMatters=False)
+    for obj in _find_unregistered_setups():
+        register_pivot_setup(obj, {loc_name: f"{loc_name}_{obj}" for loc_name in LOCATOR_NAMES
+                                   if cmds.objExists(f"{loc_name}_{obj}")})
+    return registry
+
+def register_pivot_setup(obj, locators):
+    """Records the setup of an object in the scene: object -> registry, locators -> object."""
+    registry = get_pivot_registry()
+    if registry not in (cmds.listConnections(f"{obj}.message", source=False, destination=True) or []):
+        cmds.connectAttr(f"{obj}.message", f"{registry}.setups", nextAvailable=True)
+
+    if not cmds.attributeQuery("pivotLocators", node=obj, exists=True):
+        cmds.addAttr(obj, longName="pivotLocators", attributeType="message", multi=True)
+    for index, loc_name in enumerate(LOCATOR_NAMES):
+        if loc_name in locators:
+            cmds.connectAttr(f"{locators[loc_name]}.message", f"{obj}.pivotLocators[{index}]", force=True)
+
+def get_pivot_setups():
+    """Set-up objects of the scene, from the registry: the cost does not depend on the size of the scene."""
+    if not cmds.objExists(PIVOT_REGISTRY):
+        return _find_unregistered_setups()
+    return list(dict.fromkeys(cmds.listConnections(f"{PIVOT_REGISTRY}.setups", source=True, destination=False) or []))
+
+def get_pivot_locators(obj):
+    """{locator name: locator} of a set-up object, from its pivotLocators connections."""
+    if not cmds.attributeQuery("pivotLocators", node=obj, exists=True):
+        return {}
+    connections = cmds.listConnections(f"{obj}.pivotLocators", source=True, destination=False, connections=True) or []
+    locators = {}
+    for plug, locator in zip(connections[0::2], connections[1::2]):
+        match = LOCATOR_PLUG_PATTERN.search(plug)
+        if match and int(match.group(1)) < len(LOCATOR_NAMES):
+            locators[LOCATOR_NAMES[int(match.group(1))]] = locator
+    return locators
 
 def create_locators_for_object(obj):
     """
-    Creates three locators (Origin, PosPivot1, PosPivot2) in the correct order:
-    - Creating the locator
-    - Parenting the locator to the selected object
-    - Snapping to the object's world space
-    - Setting the locator's translation and rotation values to 0
+    Creates three locators (Origin, PosPivot1, PosPivot2) on the object:
+    - Creating the locators
+    - Parenting them to the object in one call, relative: they stay at 0 in translation and rotation,
+      1 in scale, on the object's origin
     """
-    if obj in tracked_objects:
-        return tracked_objects[obj]  # Return existing locators
-
-    locators = {}
-    locator_names = ["Origin", "PosPivot1", "PosPivot2"]
+    # Return existing locators (the connections of deleted locators are gone with them)
+    locators = get_pivot_locators(obj)
+    if len(locators) == len(LOCATOR_NAMES):
+        return locators
 
-    # Get the world space position of the object
-    obj_world_pos = cmds.xform(obj, q=True, ws=True, rp=True)
+    new_locators = []
 
-    for loc_name in locator_names:
+    for loc_name in LOCATOR_NAMES:
         full_name = f"{loc_name}_{obj}"
 
-        if cmds.objExists(full_name):
+        if loc_name in locators:
+            continue
+        elif cmds.objExists(full_name):
             locators[loc_name] = full_name
         else:
             loc = cmds.spaceLocator(name=full_name)[0]
-
-            # Parent the locator to the selected object
-            cmds.parent(loc, obj)
-
-            # Snap the locator to the object's world space position
-            cmds.xform(loc, ws=True, t=obj_world_pos)
-
-            # Reset translation and rotation to 0 without freezing
-            cmds.setAttr(f"{loc}.translate", 0, 0, 0)
-            cmds.setAttr(f"{loc}.rotate", 0, 0, 0)
-
-            # Set the scale values to 1
-            cmds.setAttr(f"{loc}.scale", 1, 1, 1)
-
             locators[loc_name] = loc
+            new_locators.append(loc_name)
 
             # Make "Origin" invisible
             if loc_name == "Origin":
@@ -144,15 +252,49 @@ def create_locators_for_object(obj):
                 cmds.setAttr(f"{loc}.overrideEnabled", 1)
                 cmds.setAttr(f"{loc}.overrideColor", 16)  # White
 
-    tracked_objects[obj] = locators  # Store locators for this object
-    return locators
+    # The new locators are created at the world origin with identity values: parented relative,
+    # they land on the object's origin with translate 0, rotate 0 and scale 1
+    if new_locators:
+        parented = cmds.parent([locators[loc_name] for loc_name in new_locators], obj, relative=True)
+        locators.update(zip(new_locators, parented))
+
+    register_pivot_setup(obj, locators)  # Store locators for this object, in the scene
+    return {loc_name: locators[loc_name] for loc_name in LOCATOR_NAMES}
+
+def get_gizmo_template():
+    """
+    Returns the gizmo template of the scene, built the first time: a hidden transform (scale 0.25) carrying
+    the six curves of the gizmo as shapes (three axes, three circles), in reference display.
+    The gizmos are instances of it, so the curves are only built once per scene and their shapes are shared.
+    """
+    if cmds.objExists(GIZMO_TEMPLATE):
+        return GIZMO_TEMPLATE
 
+    # Create axis segments and spheres as curves
+    curves = [cmds.curve(d=1, p=points, k=[0, 1]) for points in GIZMO_AXIS_POINTS]
+    curves += [cmds.circle(nr=normal, c=(0, 0, 0), r=1.5, sections=20, constructionHistory=False)[0]
+               for normal in GIZMO_CIRCLE_NORMALS]
+
+    # Move all the curve shapes under the template, then delete their empty transforms
+    template = cmds.group(empty=True, name=GIZMO_TEMPLATE)
+    cmds.parent(cmds.listRelatives(curves, shapes=True, fullPath=True), template, relative=True, shape=True)
+    cmds.delete(curves)
+
+    # Enable "reference" display to avoid accidental selection (shared by all the instances)
+    for shape in cmds.listRelatives(template, shapes=True, fullPath=True):
+        cmds.setAttr(f"{shape}.overrideEnabled", 1)
+        cmds.setAttr(f"{shape}.overrideDisplayType", 2)
+
+    cmds.setAttr(f"{template}.scale", 0.25, 0.25, 0.25)
+    cmds.setAttr(f"{template}.visibility", 0)
+    return template
+
+@AnimOperation.as_operation("Pivot Gizmo")
 def create_gizmo_curve(obj):
     """
     Creates a cross-shaped gizmo with a sphere that follows the pivot of the object.
-    - The gizmo is first parented to the object.
-    - It is then aligned to the pivot in world space.
-    - Finally, it is reset in translation, rotation, and scale before being constrained.
+    - The gizmo is an instance of the scene's gizmo template (same values: at 0, scale 0.25, hidden).
+    - It is parented to the object, relative, so it is aligned on the object, made visible and constrained.
     """
 
     # Delete the old gizmo if it exists
@@ -160,56 +302,20 @@ def create_gizmo_curve(obj):
     if cmds.objExists(gizmo_name):
         cmds.delete(gizmo_name)
 
-    # Create axis segments as curves
-    axis_curves = []
-    axis_points = [
-        [(0, 0, 0), (2, 0, 0)],  # X
-        [(0, 0, 0), (0, 2, 0)],  # Y
-        [(0, 0, 0), (0, 0, 2)],  # Z
-    ]
-    
-    for points in axis_points:
-        curve = cmds.curve(d=1, p=points, k=[0, 1])
-        axis_curves.append(curve)
-
-    # Create spheres as curves
-    sphere1 = cmds.circle(nr=(1, 0, 0), c=(0, 0, 0), r=1.5, sections=20)[0]
-    sphere2 = cmds.circle(nr=(0, 1, 0), c=(0, 0, 0), r=1.5, sections=20)[0]
-    sphere3 = cmds.circle(nr=(0, 0, 1), c=(0, 0, 0), r=1.5, sections=20)[0]
-
-    # Create the gizmo group
-    gizmo_curve_group = cmds.group(empty=True, name=gizmo_name)
-
-    # Parent the curves directly under the group
-    for curve in axis_curves + [sphere1, sphere2, sphere3]:
-        cmds.parent(curve, gizmo_curve_group)
-
-    # Enable "reference" display to avoid accidental selection
-    for curve in axis_curves + [sphere1, sphere2, sphere3]:
-        cmds.setAttr(f"{curve}.overrideEnabled", 1)
-        cmds.setAttr(f"{curve}.overrideDisplayType", 2)
+    gizmo_curve_group = cmds.instance(get_gizmo_template(), name=gizmo_name)[0]
+    gizmo_curve_group = cmds.parent(gizmo_curve_group, obj, relative=True)[0]
+    cmds.setAttr(f"{gizmo_curve_group}.visibility", 1)
 
-    # **1. Parent the gizmo group to the object BEFORE any transformation**
-    cmds.parent(gizmo_curve_group, obj)
-
-    # **2. Snap to the world pivot**
-    pivot_position = cmds.xform(obj, query=True, worldSpace=True, rp=True)
-    cmds.xform(gizmo_curve_group, worldSpace=True, translation=pivot_position)
-
-    # **3. Reset values (keep the correct alignment)**
-    cmds.setAttr(f"{gizmo_curve_group}.translate", 0, 0, 0)
-    cmds.setAttr(f"{gizmo_curve_group}.rotate", 0, 0, 0)
-    cmds.setAttr(f"{gizmo_curve_group}.scale", 0.25, 0.25, 0.25)
-
-    # **4. Constraints to follow the object**
+    # Constraints to follow the object
     cmds.orientConstraint(obj, gizmo_curve_group, maintainOffset=True)
     cmds.pointConstraint(obj, gizmo_curve_group, maintainOffset=True)
 
     print(f"\u2705 Gizmo Curve for {obj} created properly with reset and constraints.")
 
-def unlock_pivot_attributes():
-    # Récupérer les objets sélectionnés
-    selected_objects = cmds.ls(selection=True)
+@AnimOperation.as_operation("Unlock Pivots")
+def unlock_pivot_attributes(selected_objects=None):
+    # Récupérer les objets sélectionnés (ou ceux donnés)
+    selected_objects = selected_objects or cmds.ls(selection=True)
     
     if not selected_objects:
         cmds.warning("Aucun objet sélectionné.")
@@ -247,6 +353,7 @@ def unlock_pivot_attributes():
             else:
                 print(f"L'attribut {attr} n'existe pas sur {obj}.")
                 
+@AnimOperation.as_operation("Snap Pivot")
 def snap_pivot_to_locator(obj, locator):
     """
     Snaps the object's pivot to the position of the given locator (rotationPivot and scalePivot),
@@ -260,15 +367,21 @@ def snap_pivot_to_locator(obj, locator):
         return
         
         
-    # Get the position of the locator in world space
-    locator_pos = cmds.xform(locator, q=True, ws=True, t=True)
+    # Get the position of the locator in the object's space
+    locator_pos = AnimMath.positions([cmds.getAttr(f"{locator}.worldMatrix[0]")])[0]
+    new_pivot = AnimMath.transform_point(locator_pos, cmds.getAttr(f"{obj}.worldInverseMatrix[0]"))
 
     # Get the current frame to add a keyframe
     current_frame = cmds.currentTime(query=True)
 
-    # Move the pivots of the object without moving the object itself
-    cmds.xform(obj, ws=True, rp=locator_pos)  # Rotation pivot
-    cmds.xform(obj, ws=True, sp=locator_pos)  # Scale pivot
+    # Move the pivots of the object without moving the object itself (the pivot translates compensate)
+    scale_pivot_translate, rotate_pivot_translate = AnimMath.move_pivots(
+        new_pivot, cmds.getAttr(f"{obj}.rotate")[0], cmds.getAttr(f"{obj}.scale")[0],
+        **AnimBake.get_transform_attributes(obj))
+    cmds.setAttr(f"{obj}.rotatePivot", *new_pivot)  # Rotation pivot
+    cmds.setAttr(f"{obj}.scalePivot", *new_pivot)  # Scale pivot
+    cmds.setAttr(f"{obj}.rotatePivotTranslate", *rotate_pivot_translate)
+    cmds.setAttr(f"{obj}.scalePivotTranslate", *scale_pivot_translate)
 
     # Add keyframes for all pivot and transform attributes
     # Keyframe for rotationPivot (rp) and scalePivot (sp)
@@ -285,6 +398,68 @@ def snap_pivot_to_locator(obj, locator):
 
     print(f" The rotation and scale pivots of {obj} have been snapped to {locator}, and animation keys have been added.")
 
+@AnimOperation.as_operation("Snap Pivot Over Range")
+def snap_pivot_to_locator_over_range(obj, locator, start_frame, end_frame):
+    """
+    Range version of snap_pivot_to_locator: on every frame between start_frame and end_frame, the pivots
+    follow the locator and the translate is recomputed so the object does not move.
+    Everything is sampled in one pass and keyed in bulk. Keys at start_frame - 1 and end_frame + 1 hold
+    the original values, so the pivot hands over cleanly before and after the range.
+    The pivot keys are stepped (and never reduced): between two frames (motion blur, retimes) the pivots
+    hold instead of being interpolated on their own.
+    Returns the number of frames keyed, or None when nothing was keyed.
+    """
+    if not cmds.objExists(obj) or not cmds.objExists(locator):
+        cmds.warning(f"{obj} or {locator} no longer exists!")
+        return
+
+    frames = list(range(start_frame, end_frame + 1))
+    pivot_attrs = ["translate", "rotatePivot", "scalePivot", "rotatePivotTranslate", "scalePivotTranslate"]
+    channels = [f"{attr}{axis}" for attr in pivot_attrs for axis in "XYZ"]
+
+    # Original values around the range, read before anything is keyed
+    def read_channels(t):
+        return [value for attr in pivot_attrs for value in cmds.getAttr(f"{obj}.{attr}", time=t)[0]]
+    before, after = read_channels(start_frame - 1), read_channels(end_frame + 1)
+
+    plugs = [f"{obj}.matrix", f"{obj}.worldInverseMatrix[0]", f"{locator}.worldMatrix[0]"]
+    AnimBake.start_progress("Move Pivot", len(frames))
+    try:
+        samples = AnimBake.sample_matrices(plugs, frames, AnimBake.update_progress)
+    finally:
+        AnimBake.end_progress()
+    if samples is None:
+        cmds.warning("Pivot bake cancelled, no key was created.")
+        return
+
+    attributes = AnimBake.get_transform_attributes(obj)
+    values = {channel: [value] for channel, value in zip(channels, before)}
+
+    for local, world_inverse, locator_matrix in zip(*[samples[plug] for plug in plugs]):
+        # Pivot position in the object's space on this frame
+        pivot = AnimMath.transform_point(AnimMath.positions([locator_matrix])[0], world_inverse)
+
+        # Same local matrix with the new pivots: only the translate changes
+        attributes.update(scale_pivot=pivot, rotate_pivot=pivot,
+                          scale_pivot_translate=(0, 0, 0), rotate_pivot_translate=(0, 0, 0))
+        translate = AnimMath.decompose([local], filter_euler=False, **attributes)[0][0]
+
+        for channel, value in zip(channels, list(translate) + list(pivot) * 2 + [0.0] * 6):
+            values[channel].append(value)
+
+    for channel, value in zip(channels, after):
+        values[channel].append(value)
+
+    key_frames = [start_frame - 1] + frames + [end_frame + 1]
+    pivot_channels = channels[3:]
+    AnimBake.write_keys(obj, {channel: values[channel] for channel in channels[:3]}, key_frames)
+    AnimBake.write_keys(obj, {channel: values[channel] for channel in pivot_channels}, key_frames, reduce=False)
+    cmds.keyTangent(obj, attribute=pivot_channels, time=(key_frames[0], key_frames[-1]), outTangentType="step")
+
+    print(f" The pivots of {obj} follow {locator} from frame {start_frame} to {end_frame}, with animation keys.")
+    return len(frames)
+
+@AnimOperation.as_operation("Pivot Setup")
 def create_locators_and_gizmo_for_selected_object():
     """
     Creates locators and gizmo for the selected object and refreshes the UI.
@@ -313,6 +488,41 @@ def create_locators_and_gizmo_for_selected_object():
     # Refresh the UI to add the new object
     open_object_selection_ui()
 
+@AnimOperation.as_operation("Pivot Setup")
+def set_up_pivots(objects):
+    """
+    Pivot setup (unlocked pivots, neutralized constraints, locators and gizmo) of several objects at once:
+    one unlock pass, one constraint query and one gizmo template for all of them, in a single undo chunk.
+    """
+    objects = [obj for obj in objects if cmds.objExists(obj)]
+    if not objects:
+        return []
+
+    unlock_pivot_attributes(objects)
+    constraints, target_plugs = find_constraints_targeting(objects)
+    get_gizmo_template()
+
+    for obj in objects:
+        neutralize_pivot_effect(obj, constraints[obj], target_plugs[obj])
+        create_locators_for_object(obj)
+        create_gizmo_curve(obj)
+    return objects
+
+def create_locators_and_gizmo_for_selection():
+    """
+    Batch version of create_locators_and_gizmo_for_selected_object: sets up all the selected objects.
+    """
+    selected = cmds.ls(selection=True)
+    if not selected:
+        cmds.warning("Please select the objects to set up.")
+        return
+
+    objects = set_up_pivots(selected)
+    print(f"\u2705 Locators and gizmos created for {len(objects)} objects.")
+
+    # Refresh the UI once for all the new objects
+    open_object_selection_ui()
+
 def open_object_selection_ui():
     """
     Opens a window listing all objects with locators.
@@ -328,18 +538,34 @@ def open_object_selection_ui():
 
     cmds.separator(height=10)
 
-    # Check which objects already have locators
-    all_objects = cmds.ls(transforms=True)
-    valid_objects = [obj for obj in all_objects if any(cmds.objExists(f"{loc}_{obj}") for loc in ["Origin", "PosPivot1", "PosPivot2"])]
-
-
-    for obj in valid_objects:
-        cmds.button(label=obj, command=lambda _, o=obj: open_pivot_ui(o))
+    # Objects that already have locators: listed in the background (AnimScheduler), the window opens at once
+    setup_list = cmds.columnLayout(adjustableColumn=True)
+    cmds.setParent("..")
 
     cmds.separator(height=10)
     cmds.button(label="Create", command=lambda _: create_locators_and_gizmo_for_selected_object())
+    cmds.button(label="Create For All Selected", command=lambda _: create_locators_and_gizmo_for_selection())
 
     cmds.showWindow("PivotObjectSelection")
+    AnimScheduler.start("Pivot Setups", _iter_setup_buttons(setup_list))
+
+def _iter_setup_buttons(layout):
+    """
+    Job of open_object_selection_ui: finds the set-up objects (one step per locator in a scene
+    without registry) and adds one button per object to layout (one step per button).
+    Stops when the window is closed.
+    """
+    if cmds.objExists(PIVOT_REGISTRY):
+        setups = get_pivot_setups()
+    else:
+        setups = yield from _iter_unregistered_setups()
+
+    for index, obj in enumerate(setups):
+        try:
+            cmds.button(label=obj, parent=layout, command=lambda _, o=obj: open_pivot_ui(o))
+        except RuntimeError:
+            return  # The window was closed
+        yield index + 1, len(setups)
 
 def open_pivot_ui(obj):
     """
@@ -348,7 +574,7 @@ def open_pivot_ui(obj):
     if cmds.window("MovePivotAnimTool", exists=True):
         cmds.deleteUI("MovePivotAnimTool")
 
-    cmds.window("MovePivotAnimTool", title=f"Pivots of {obj}", widthHeight=(300, 150))
+    cmds.window("MovePivotAnimTool", title=f"Pivots of {obj}", widthHeight=(300, 250))
     cmds.columnLayout(adjustableColumn=True)
 
     locators = create_locators_for_object(obj)
@@ -356,10 +582,26 @@ def open_pivot_ui(obj):
     for loc_name, locator in locators.items():
         cmds.button(label=f"Snap pivots to {loc_name}", command=lambda _, l=locator: snap_pivot_to_locator(obj, l))
 
+    # Range mode: the pivot follows the locator on every frame of the range
+    cmds.separator(height=10)
+    range_field = cmds.intFieldGrp(label="Start / End:", numberOfFields=2,
+                                   value1=cmds.playbackOptions(query=True, minTime=True),
+                                   value2=cmds.playbackOptions(query=True, maxTime=True),
+                                   columnWidth3=(80, 60, 60))
+
+    for loc_name, locator in locators.items():
+        cmds.button(label=f"Snap pivots to {loc_name} over range",
+                    command=lambda _, l=locator: snap_pivot_to_locator_over_range(
+                        obj, l,
+                        cmds.intFieldGrp(range_field, query=True, value1=True),
+                        cmds.intFieldGrp(range_field, query=True, value2=True)))
+
     cmds.showWindow("MovePivotAnimTool")
 
 # By Teo2103D
 
-# Open the main window
-open_object_selection_ui()
+# Open the main window when the file is run as a script (importing it has no side effect)
+if __name__ == "__main__":
+    open_object_selection_ui()
+
 
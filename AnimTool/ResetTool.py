@@ -0,0 +1,132 @@
+import maya.cmds as cmds
+import AnimOperation
+import AnimScheduler
+
+# By Teo2103D
+
+TRANSFORM_ATTRS = {f"{t}{a}" for t in ["translate", "rotate", "scale"] for a in "XYZ"}
+
+# Reset modes
+CURRENT_FRAME = "Current"   # Set the default value at the current frame (like before)
+FRAME_RANGE = "Range"       # Hold the default value over the whole range (keys at the ends, keys inside reset)
+KEYS_ONLY = "Keys"          # Only reset the existing keys inside the range
+
+# Default values of built-in attributes, per (node type, attribute): they are the same on every node of a type
+_default_cache = {}
+
+def get_default_values(obj, node_type, attributes, user_defined):
+    """
+    Returns {attribute: default value} for the attributes of obj that have a default.
+    Built-in attributes are queried once per node type and cached; user-defined attributes
+    can have a different default on every node, so they are always queried.
+    """
+    defaults = {}
+    for attr in attributes:
+        key = (node_type, attr)
+        if attr in user_defined or key not in _default_cache:
+            try:
+                default_value = cmds.attributeQuery(attr, node=obj, listDefault=True)
+            except RuntimeError:
+                default_value = None
+            value = default_value[0] if default_value else None
+            if attr in user_defined:
+                defaults[attr] = value
+                continue
+            _default_cache[key] = value
+        defaults[attr] = _default_cache[key]
+    return {attr: value for attr, value in defaults.items() if value is not None}
+
+def get_reset_attributes(obj, option, selected_attrs=None):
+    """
+    Attributes of obj to reset for a menu option: "All", "Transforms", "Other" or "Selection" (selected_attrs),
+    in long names.
+    """
+    if option == "Selection":
+        # Channel Box names are short ones ("tx"): long names, like listAttr gives for the other options
+        if not selected_attrs:
+            return []
+        try:
+            return cmds.listAttr([f"{obj}.{attr}" for attr in selected_attrs]) or []
+        except (RuntimeError, ValueError):
+            # An attribute missing on this object: the others one by one
+            attributes = []
+            for attr in selected_attrs:
+                try:
+                    attributes += cmds.listAttr(f"{obj}.{attr}") or []
+                except (RuntimeError, ValueError):
+                    pass
+            return attributes
+
+    attributes = cmds.listAttr(obj, keyable=True) or []
+    if option == "Transforms":
+        return [attr for attr in attributes if attr in TRANSFORM_ATTRS]
+    if option == "Other":
+        return [attr for attr in attributes if attr not in TRANSFORM_ATTRS]
+    return attributes
+
+def reset_attributes(objects, option, selected_attrs=None, mode=CURRENT_FRAME, start_frame=None, end_frame=None):
+    """
+    Resets the attributes of all the objects to their default values in a single undo chunk.
+    In FRAME_RANGE and KEYS_ONLY modes, the keys of animated attributes inside the range are edited
+    with one keyframe call per attribute instead of being overwritten one frame at a time.
+    Returns the number of attributes reset.
+    """
+    with AnimOperation.operation("Reset"):
+        return AnimScheduler.run_now(iter_reset_attributes(objects, option, selected_attrs, mode, start_frame, end_frame))
+
+def iter_reset_attributes(objects, option, selected_attrs=None, mode=CURRENT_FRAME, start_frame=None, end_frame=None):
+    """
+    Job of reset_attributes for AnimScheduler: one step per object read, then all the resets (AnimScheduler.EDIT).
+    Returns the number of attributes reset.
+    """
+    if mode != CURRENT_FRAME and (start_frame is None or end_frame is None):
+        start_frame = cmds.playbackOptions(query=True, minTime=True)
+        end_frame = cmds.playbackOptions(query=True, maxTime=True)
+
+    # Node types of all the objects in one query
+    types_list = cmds.ls(objects, showType=True) or []
+    node_types = dict(zip(types_list[0::2], types_list[1::2]))
+
+    # (object, attribute, default value, animated) of all the objects, read before anything is reset
+    resets = []
+    for index, obj in enumerate(objects):
+        yield index, len(objects)
+        attributes = get_reset_attributes(obj, option, selected_attrs)
+        if not attributes:
+            continue
+        user_defined = set(cmds.listAttr(obj, userDefined=True) or [])
+        defaults = get_default_values(obj, node_types.get(obj, obj), attributes, user_defined)
+
+        animated = set()
+        if mode != CURRENT_FRAME:
+            # Animated attributes of the object, one query: [obj.attr, curve.output, ...], in long names
+            connections = cmds.listConnections(obj, source=True, destination=False, type="animCurve",
+                                               connections=True, plugs=True) or []
+            if connections:
+                animated = set(cmds.listAttr(connections[0::2]) or [])
+
+        resets += [(obj, attr, default_value, attr in animated) for attr, default_value in defaults.items()]
+    yield AnimScheduler.EDIT
+
+    count = 0
+    for obj, attr, default_value, is_animated in resets:
+        plug = f"{obj}.{attr}"
+        try:
+            if mode == CURRENT_FRAME:
+                cmds.setAttr(plug, default_value)
+            elif is_animated:
+                if mode == FRAME_RANGE:
+                    cmds.setKeyframe(obj, attribute=attr, value=default_value, time=[start_frame, end_frame])
+                cmds.keyframe(plug, edit=True, time=(start_frame, end_frame), valueChange=default_value)
+            elif mode == FRAME_RANGE:
+                # Not animated: the value holds on every frame
+                cmds.setAttr(plug, default_value)
+            else:
+                continue
+            count += 1
+        except RuntimeError:
+            pass  # Locked or connected attribute
+
+    return count
+
+# By Teo2103D
@@ -0,0 +1,116 @@
+import bisect
+import json
+import os
+import re
+
+#By Teo2103D
+
+# Limb classification shared by OnIk, OnFk and SwitchIkFk: which limb (arm, leg) a node belongs to, and its side.
+#
+# The keywords and side patterns come from LimbNaming.json, by naming profile:
+# - "limbs": limb -> keywords found anywhere in the name (case-insensitive)
+# - "sides": locator suffix ("_L", "_R") -> regular expressions on the name (case-sensitive)
+# - "rigs": optional regular expression; the profile is used for the rigs (top parent names) it matches
+# A profile only gives what differs from the "default" profile.
+# Each profile is compiled once into one pattern for all its limbs and one for all its sides.
+# Names are matched without their path and namespace.
+
+CONFIG_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "LimbNaming.json")
+
+# Profile used for the rigs no profile claims (set_profile), read from the config file
+active_profile = None
+
+_config = None
+# Profile name -> ([pattern per limb], [limbs], side pattern, [sides])
+_matchers = {}
+
+def load_config(path=None):
+    """Reads the naming profiles (LimbNaming.json by default); the patterns are compiled again on next use."""
+    global _config, active_profile
+    with open(path or CONFIG_FILE, encoding="utf-8") as config_file:
+        _config = json.load(config_file)
+    active_profile = _config.get("default_profile", "default")
+    _matchers.clear()
+    return _config
+
+def _get_config():
+    return _config if _config is not None else load_config()
+
+def get_profile_names():
+    return list(_get_config()["profiles"])
+
+def set_profile(name):
+    global active_profile
+    if name not in _get_config()["profiles"]:
+        raise ValueError(f"Unknown naming profile: {name}")
+    active_profile = name
+
+def get_profile(rig=None):
+    """Profile of a rig (top parent name): the first profile whose "rigs" pattern matches it, else the active one."""
+    profiles = _get_config()["profiles"]
+    if rig:
+        rig_name = rig.split('|')[-1]
+        for name, settings in profiles.items():
+            if settings.get("rigs") and re.search(settings["rigs"], rig_name):
+                return name
+    return active_profile
+
+def _get_matcher(profile=None):
+    profiles = _get_config()["profiles"]
+    name = profile or active_profile
+    if name in _matchers:
+        return _matchers[name]
+    if name not in profiles:
+        raise ValueError(f"Unknown naming profile: {name}")
+
+    settings = dict(profiles.get("default", {}))
+    settings.update(profiles[name])
+
+    # One pattern per limb: the keywords of two limbs can overlap in a name, each limb is searched on its own
+    limbs = list(settings["limbs"])
+    limb_patterns = [re.compile("|".join(re.escape(word) for word in settings["limbs"][limb]), re.IGNORECASE)
+                     for limb in limbs]
+
+    sides = list(settings["sides"])
+    side_pattern = re.compile("|".join(f"(?P<g{index}>{'|'.join(settings['sides'][side])})"
+                                       for index, side in enumerate(sides)))
+
+    _matchers[name] = (limb_patterns, limbs, side_pattern, sides)
+    return _matchers[name]
+
+def _short_name(name):
+    return name.split('|')[-1].rpartition(':')[2]
+
+def classify_names(names, profile=None):
+    """
+    Limbs found in each name: [set of limbs] in the order of the names (an empty set when none is found).
+    All the names are scanned in one pass per limb of its compiled pattern over the joined names.
+    """
+    limb_patterns, limbs, _, _ = _get_matcher(profile)
+    short_names = [_short_name(name) for name in names]
+
+    # Offset of each name in the joined text, to map the matches back to the names
+    starts, offset = [], 0
+    for short_name in short_names:
+        starts.append(offset)
+        offset += len(short_name) + 1
+
+    text = "\n".join(short_names)
+    result = [set() for _ in names]
+    for limb, limb_pattern in zip(limbs, limb_patterns):
+        for match in limb_pattern.finditer(text):
+            result[bisect.bisect_right(starts, match.start()) - 1].add(limb)
+    return result
+
+def get_limb(name, profile=None):
+    """First limb of the profile found in the name, or None."""
+    found = classify_names([name], profile)[0]
+    return next((limb for limb in _get_matcher(profile)[1] if limb in found), None)
+
+def get_side(name, profile=None):
+    """Locator suffix of the side of a node ("_L", "_R"), or "" when no side pattern matches."""
+    _, _, side_pattern, sides = _get_matcher(profile)
+    match = side_pattern.search(_short_name(name))
+    return sides[int(match.lastgroup[1:])] if match else ''
+
+#By Teo2103D
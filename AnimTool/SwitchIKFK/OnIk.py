@@ -1,12 +1,12 @@
 import maya.cmds as cmds
+import AnimOperation
+import LimbNaming
+import SwitchTargets
 
 #By Teo2103D
 
+@AnimOperation.as_operation("Loc On Ik")
 def create_group_based_on_selection():
-    # List of words for each category
-    arm_list = ["wrist", "hand", "elbow", "arm", "shoulder", "clavicle"]
-    leg_list = ["hip", "pelvis", "femur", "kneecap", "knee", "leg", "ankle", "foot", "tibia"]
-
     # Get the selected objects
     selected_objects = cmds.ls(selection=True)
     
@@ -15,12 +15,10 @@ def create_group_based_on_selection():
         cmds.error("Please select at least one object.")
         return
 
-    # Function to check if a word from a list is present in the object name
-    def contains_word(obj_name, word_list):
-        for word in word_list:
-            if word.lower() in obj_name.lower():  # Check case-insensitively
-                return True
-        return False
+    # Limbs of all the selected objects (LimbNaming), with the naming profile of their rig
+    hierarchy = get_hierarchy_info(selected_objects)
+    profile = LimbNaming.get_profile(hierarchy[selected_objects[0]][1])
+    limbs = LimbNaming.classify_names(selected_objects, profile)
 
     # Function to determine if the object is IK or FK
     def detect_ik_fk(obj_name):
@@ -36,14 +34,14 @@ def create_group_based_on_selection():
     is_leg = None
     group_type = None  # IK or FK
 
-    for obj in selected_objects:
-        if contains_word(obj, arm_list):
+    for obj, obj_limbs in zip(selected_objects, limbs):
+        if "arm" in obj_limbs:
             if is_arm is None:
                 is_arm = True
             elif is_leg:
                 cmds.error("The selection contains objects from both 'arm' and 'leg' groups.")
                 return
-        elif contains_word(obj, leg_list):
+        elif "leg" in obj_limbs:
             if is_leg is None:
                 is_leg = True
             elif is_arm:
@@ -63,36 +61,72 @@ def create_group_based_on_selection():
                 return
 
     # Create the locators
-    create_locators_with_hierarchy_based_names(selected_objects, is_arm, is_leg, group_type)
+    create_locators_with_hierarchy_based_names(selected_objects, is_arm, is_leg, group_type, hierarchy)
+
+def get_hierarchy_info(objects):
+    """
+    Finds the depth (number of parents) and the topmost parent of every object: {object: (depth, top parent name)}.
+    Both are read from the full paths of all the objects in one call, instead of walking up the parents.
+    """
+    # ls does not keep the order of the objects: each object takes the path ending with its name
+    paths_by_leaf = {}
+    for path in cmds.ls(objects, long=True) or []:
+        paths_by_leaf.setdefault(path.rpartition('|')[2], []).append(path)
+
+    info = {}
+    for obj in objects:
+        name = obj.lstrip('|')
+        paths = [path for path in paths_by_leaf.get(name.rpartition('|')[2], [])
+                 if path == '|' + name or path.endswith('|' + name)]
+        if len(paths) != 1:
+            # A name matching several objects: its own query
+            paths = cmds.ls(obj, long=True)
+        info[obj] = (paths[0].count('|') - 1, paths[0].split('|')[1])
+    return info
 
 def get_top_parent(obj):
     """
     Finds the topmost parent in the hierarchy for the given object.
     """
-    parent = cmds.listRelatives(obj, parent=True, fullPath=True)
-    while parent:
-        obj = parent[0]
-        parent = cmds.listRelatives(obj, parent=True, fullPath=True)
-    return obj.split('|')[-1]  # Return the name of the top-level parent
-
-def create_locators_with_hierarchy_based_names(selected_objects, is_arm, is_leg, group_type):
-    counters = {'_L': 0, '_R': 0, '': 0}
+    return get_hierarchy_info([obj])[obj][1]  # Return the name of the top-level parent
+
+def create_switch_locator(obj, locator_name, stored=None):
+    """
+    Creates a locator aligned with the object and parent constrained to it.
+    With stored (SwitchTargets.store_offsets by default), its offset is stored on the object instead
+    and nothing is created: returns None.
+    """
+    if SwitchTargets.store_offsets if stored is None else stored:
+        SwitchTargets.store_target(obj, locator_name)
+        return None
+
+    locator = cmds.spaceLocator(name=locator_name)[0]
+
+    # Match the transform of the locator to the object
+    cmds.matchTransform(locator, obj, position=True, rotation=True, scale=True)
+
+    # Add a parentConstraint to the locator
+    cmds.parentConstraint(obj, locator, maintainOffset=False)
+    return locator
+
+def create_locators_with_hierarchy_based_names(selected_objects, is_arm, is_leg, group_type, hierarchy=None):
+    counters = {}
     prefix = "Arm_" if is_arm else "Leg_"
 
+    # Top parents of all the selected objects, in one query
+    if hierarchy is None:
+        hierarchy = get_hierarchy_info(selected_objects)
+    profile = LimbNaming.get_profile(hierarchy[selected_objects[0]][1])
+
     for selected_object in selected_objects:
-        # Detect the suffix (_L, _R, or none)
-        if selected_object.endswith("_L"):
-            suffix = "_L"
-        elif selected_object.endswith("_R"):
-            suffix = "_R"
-        else:
-            suffix = ""
+        # Detect the suffix (_L, _R, or none) with the side patterns of the profile
+        suffix = LimbNaming.get_side(selected_object, profile)
 
         # Increment the corresponding counter
-        counters[suffix] += 1
+        counters[suffix] = counters.get(suffix, 0) + 1
 
         # Get the top parent name for the selected object
-        top_parent_name = get_top_parent(selected_object)
+        top_parent_name = hierarchy[selected_object][1]
 
         # Determine the locator type based on the object type (IK/FK)
         locator_type = group_type  # This is "FK" or "IK" based on the detected type
@@ -100,19 +134,14 @@ def create_locators_with_hierarchy_based_names(selected_objects, is_arm, is_leg,
         # Construct the locator name
         locator_name = f"{prefix}{locator_type}_{top_parent_name}_{counters[suffix]}_loc{suffix}"
 
-        # Create the locator
-        locator = cmds.spaceLocator(name=locator_name)[0]
-
-        # Match the transform of the locator to the selected object
-        cmds.matchTransform(locator, selected_object, position=True, rotation=True, scale=True)
-
-        # Add a parentConstraint to the locator
-        cmds.parentConstraint(selected_object, locator, maintainOffset=False)
-
-        # Print message for the created locator
-        print(f"Locator '{locator_name}' created and aligned with '{selected_object}'.")
+        # Create the locator, aligned and constrained to the selected object (or store its target)
+        if create_switch_locator(selected_object, locator_name):
+            print(f"Locator '{locator_name}' created and aligned with '{selected_object}'.")
+        else:
+            print(f"Target of '{locator_name}' stored on '{selected_object}'.")
 
-# Execute the function
-create_group_based_on_selection()
+# Execute the function when the file is run as a script (importing it has no side effect)
+if __name__ == "__main__":
+    create_group_based_on_selection()
 
 #By Teo2103D
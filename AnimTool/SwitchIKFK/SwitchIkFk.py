@@ -1,27 +1,55 @@
 import maya.cmds as cmds
-import re
+import AnimBake
+import AnimOperation
+import LimbNaming
+import SwitchRigRegistry
+import SwitchTargets
 
 # By Teo2103D
 
-def detect_unique_locator_names():
-    locators = cmds.ls(type="locator")
+# Fonction pour retrouver un locator dans l'index, dans le namespace des contrôleurs ou à défaut à la racine
+# (ou sa cible stockée : le plug est rendu tel quel).
+# Jamais dans le namespace d'un autre personnage : le switch alignerait un personnage sur un autre.
+def find_locator(index, key, namespace=''):
+    candidates = index.get(key)
+    if not candidates:
+        return None
+    if namespace in candidates:
+        target = candidates[namespace]
+    elif '' in candidates:
+        target = candidates['']
+    else:
+        cmds.warning(f"Aucun locator {key} dans le namespace '{namespace}' ni à la racine "
+                     f"(trouvés dans : {', '.join(sorted(candidates))}).")
+        return None
+    if SwitchTargets.is_stored_target(target):
+        return target
+    names = cmds.ls(target, long=True)
+    return names[0] if names else None
+
+# Fonction pour aligner un contrôleur sur son locator, ou sur sa cible stockée calculée depuis les joints
+# (le pole vector en position seulement)
+def match_to_target(obj, target):
+    if SwitchTargets.is_stored_target(target):
+        AnimBake.match_matrix(obj, SwitchTargets.get_target_matrix(target),
+                              rotate=not SwitchTargets.is_pole_vector_target(target))
+    else:
+        AnimBake.match_world_matrix(obj, target)
 
-    if not locators:
-        cmds.error("Aucun locator trouvé dans la scène.")
+# Fonction pour récupérer le namespace d'un objet
+def get_namespace(obj):
+    return SwitchRigRegistry.get_namespace(obj)
 
-    unique_names = set()
-    # Regex améliorée pour éviter "PV_" et retirer les chiffres et underscores finaux
-    name_pattern = re.compile(r"(?:Arm|Leg)_(?:FK|IK|IK_PV)_([A-Za-z_]+?)\d*_loc_[LR]")
+# Fonction pour afficher l'état des membres du rig sélectionné dans la liste
+def show_rig_status(locator_list, status_list):
+    selected_group = cmds.textScrollList(locator_list, q=True, selectItem=True)
+    cmds.textScrollList(status_list, edit=True, removeAll=True)
+    if selected_group:
+        cmds.textScrollList(status_list, edit=True, append=SwitchRigRegistry.get_rig_status(selected_group[0]))
 
-    for locator in locators:
-        match = name_pattern.search(locator)
-        if match:
-            name = match.group(1)
-            # Supprime "PV_" s'il est présent au début
-            clean_name = re.sub(r"^PV_", "", name)
-            # Supprime tous les underscores à la fin du nom (évite "jeff_rig_" au lieu de "jeff_rig")
-            clean_name = clean_name.rstrip("_")
-            unique_names.add(clean_name)
+def detect_unique_locator_names():
+    # Le registre n'analyse la scène qu'une fois, puis suit les locators créés, supprimés ou renommés
+    unique_names = SwitchRigRegistry.get_rig_names()
 
     if not unique_names:
         cmds.error("Aucun nom valide trouvé dans les locators.")
@@ -31,18 +59,30 @@ def detect_unique_locator_names():
     if cmds.window(window_name, exists=True):
         cmds.deleteUI(window_name)
 
-    cmds.window(window_name, title="Noms uniques des locators", widthHeight=(300, 200))
+    cmds.window(window_name, title="Noms uniques des locators", widthHeight=(300, 360))
     cmds.columnLayout(adjustableColumn=True)
     cmds.text(label="Noms trouvés dans les locators :")
     locator_list = cmds.textScrollList(allowMultiSelection=False, height=150)
 
-    for name in unique_names:
-        cmds.textScrollList(locator_list, edit=True, append=name)
+    cmds.textScrollList(locator_list, edit=True, append=unique_names)
+
+    cmds.text(label="État des membres :")
+    status_list = cmds.textScrollList(height=80)
+    cmds.textScrollList(locator_list, edit=True, selectCommand=lambda: show_rig_status(locator_list, status_list))
+
+    cmds.separator(height=10)
+    mode_field = cmds.radioButtonGrp(label="Switch :", numberOfRadioButtons=3,
+                                     labelArray3=["Frame", "Plage", "Clés"], select=1,
+                                     columnWidth4=(50, 60, 60, 60))
+    start_frame_field = cmds.intFieldGrp(label="Début / Fin :", numberOfFields=2,
+                                         value1=cmds.playbackOptions(query=True, minTime=True),
+                                         value2=cmds.playbackOptions(query=True, maxTime=True),
+                                         columnWidth3=(80, 60, 60))
 
-    cmds.button(label="Sélectionner le groupe", command=lambda x: apply_group_selection(locator_list))
+    cmds.button(label="Sélectionner le groupe", command=lambda x: apply_group_selection(locator_list, mode_field, start_frame_field))
     cmds.showWindow(window_name)
 
-def apply_group_selection(locator_list):
+def apply_group_selection(locator_list, mode_field=None, range_field=None):
     selected_group = cmds.textScrollList(locator_list, q=True, selectItem=True)
 
     if not selected_group:
@@ -50,25 +90,21 @@ def apply_group_selection(locator_list):
         return
 
     selected_group = selected_group[0]
-    match_transforms_to_locators(selected_group)
+    mode = cmds.radioButtonGrp(mode_field, q=True, select=True) if mode_field else 1
 
-# Fonction pour trouver un objet même avec un namespace
-def find_object_with_partial_name(target_name):
-    all_objects = cmds.ls(long=True)
-
-    for obj in all_objects:
-        if target_name in obj:
-            return obj  # Retourne le premier objet correspondant
-
-    return None  # Aucun objet trouvé
+    if mode == 1:
+        match_transforms_to_locators(selected_group)
+    else:
+        start_frame = cmds.intFieldGrp(range_field, q=True, value1=True)
+        end_frame = cmds.intFieldGrp(range_field, q=True, value2=True)
+        switch_frame_range(selected_group, start_frame, end_frame, keys_only=(mode == 3))
 
 # Fonction pour déterminer la catégorie (bras ou jambe) des objets sélectionnés
-def determine_category(selected_objects):
-    arm_list = ["wrist", "hand", "elbow", "arm", "shoulder", "clavicle", "poignet", "main", "coude", "bras", "epaule", "clavicule"]
-    leg_list = ["hip", "pelvis", "femur", "kneecap", "knee", "leg", "ankle", "foot", "tibia", "hanche", "bassin", "rotule", "genou", "cheville", "pied", "waist", "hinge", "heel", "toe"]
-
-    is_arm = any(any(word.lower() in obj.lower() for word in arm_list) for obj in selected_objects)
-    is_leg = any(any(word.lower() in obj.lower() for word in leg_list) for obj in selected_objects)
+# (mots-clés du profil de nommage du rig, LimbNaming.json)
+def determine_category(selected_objects, selected_group=None):
+    limbs = LimbNaming.classify_names(selected_objects, LimbNaming.get_profile(selected_group))
+    is_arm = any("arm" in obj_limbs for obj_limbs in limbs)
+    is_leg = any("leg" in obj_limbs for obj_limbs in limbs)
 
     if is_arm and is_leg:
         cmds.error("La sélection contient des objets des deux groupes 'bras' et 'jambe'.")
@@ -81,32 +117,29 @@ def determine_category(selected_objects):
         cmds.error("La sélection ne correspond à aucun groupe valide ('arm' ou 'leg').")
         return None
 
-# Fonction pour appliquer les alignements pour FK locators
-def match_to_fk_locators(selected_objects, category, selected_group):
-    def get_suffix(obj_name):
-        if obj_name.endswith('_L'):
-            return '_L'
-        elif obj_name.endswith('_R'):
-            return '_R'
-        else:
-            return ''
+# Fonction pour obtenir le préfixe des locators (Arm/Leg) d'une catégorie
+def get_limb_name(category, selected_group):
+    if category == "arm":
+        return "Arm"
+    elif category == "leg":
+        return "Leg"
+    return selected_group
+
+# Fonction pour associer chaque contrôleur FK à son locator
+def get_fk_locator_pairs(selected_objects, category, selected_group, index):
+    # Côté de chaque objet (_L, _R ou aucun) selon le profil de nommage du rig
+    profile = LimbNaming.get_profile(selected_group)
+    suffixes = {obj: LimbNaming.get_side(obj, profile) for obj in selected_objects}
 
-    objects_L = [obj for obj in selected_objects if get_suffix(obj) == '_L']
-    objects_R = [obj for obj in selected_objects if get_suffix(obj) == '_R']
-    objects_none = [obj for obj in selected_objects if get_suffix(obj) == '']
+    limb = get_limb_name(category, selected_group)
 
     def get_locators(objects, suffix):
         locators = []
         for i, obj in enumerate(objects):
-            if category == "arm":
-                locator_name = f"Arm_FK_{selected_group}_{i+1}_loc{suffix}"
-            elif category == "leg":
-                locator_name = f"Leg_FK_{selected_group}_{i+1}_loc{suffix}"
-            else:
-                locator_name = f"{selected_group}_FK_{selected_group}_{i+1}_loc{suffix}"
+            locator_name = f"{limb}_FK_{selected_group}_{i+1}_loc{suffix}"
 
             # Trouver l'objet en prenant en compte le namespace
-            full_locator_name = find_object_with_partial_name(locator_name)
+            full_locator_name = find_locator(index, (limb, "FK", selected_group, i + 1, suffix), get_namespace(obj))
 
             if full_locator_name:
                 locators.append(full_locator_name)
@@ -114,90 +147,138 @@ def match_to_fk_locators(selected_objects, category, selected_group):
                 cmds.warning(f"Le locator {locator_name} n'existe pas.")
         return locators
 
-    locators_L = get_locators(objects_L, '_L')
-    locators_R = get_locators(objects_R, '_R')
-    locators_none = get_locators(objects_none, '')
+    # Locators de chaque côté, numérotés dans l'ordre de la sélection
+    locators_by_suffix = {suffix: get_locators([obj for obj in selected_objects if suffixes[obj] == suffix], suffix)
+                          for suffix in dict.fromkeys(suffixes.values())}
 
+    pairs = []
     for obj in selected_objects:
-        suffix = get_suffix(obj)
-        locator_to_match = None
-        if suffix == '_L' and locators_L:
-            locator_to_match = locators_L.pop(0)
-        elif suffix == '_R' and locators_R:
-            locator_to_match = locators_R.pop(0)
-        elif suffix == '' and locators_none:
-            locator_to_match = locators_none.pop(0)
+        locators = locators_by_suffix[suffixes[obj]]
+        locator_to_match = locators.pop(0) if locators else None
 
         if locator_to_match:
-            cmds.matchTransform(obj, locator_to_match, position=True, rotation=True, scale=False)
-            print(f"Alignement effectué : {obj} -> {locator_to_match}")
+            pairs.append((obj, locator_to_match))
+
+    return pairs
+
+# Fonction pour appliquer les alignements pour FK locators
+@AnimOperation.as_operation("Switch IK/FK")
+def match_to_fk_locators(selected_objects, category, selected_group):
+    for obj, locator in get_fk_locator_pairs(selected_objects, category, selected_group, SwitchRigRegistry.get_locator_index()):
+        match_to_target(obj, locator)
+        print(f"Alignement effectué : {obj} -> {locator}")
+
+# Fonction pour associer chaque contrôleur IK (PV puis IK) à son locator
+def get_ik_locator_pairs(selected_objects, category, selected_group, index):
+    profile = LimbNaming.get_profile(selected_group)
 
-# Fonction pour appliquer les alignements pour IK locators
-def match_to_ik_locators(selected_objects, category, selected_group):
     def get_suffix(obj_name):
-        if obj_name.endswith('_L'):
-            return '_L'
-        elif obj_name.endswith('_R'):
-            return '_R'
-        else:
-            return ''
+        return LimbNaming.get_side(obj_name, profile)
 
-    suffix_counts = {"_L": 0, "_R": 0, "": 0}
+    suffix_counts = {}
 
     for obj in selected_objects:
         suffix = get_suffix(obj)
-        suffix_counts[suffix] += 1
+        suffix_counts[suffix] = suffix_counts.get(suffix, 0) + 1
         if suffix_counts[suffix] > 2:
             cmds.error(f"Vous ne pouvez pas sélectionner plus de deux objets avec le suffixe '{suffix}'.")
 
+    limb = get_limb_name(category, selected_group)
     last_suffix = None
+    pairs = []
 
     for obj in selected_objects:
         current_suffix = get_suffix(obj)
 
         if last_suffix is None or last_suffix != current_suffix:
-            if category == "arm":
-                locator_name = f"Arm_IK_PV_{selected_group}_loc{current_suffix}"
-            elif category == "leg":
-                locator_name = f"Leg_IK_PV_{selected_group}_loc{current_suffix}"
-            else:
-                locator_name = f"{selected_group}_IK_PV_{selected_group}_loc{current_suffix}"
+            locator_name = f"{limb}_IK_PV_{selected_group}_loc{current_suffix}"
+            key = (limb, "PV", selected_group, None, current_suffix)
         else:
-            if category == "arm":
-                locator_name = f"Arm_IK_{selected_group}_1_loc{current_suffix}"
-            elif category == "leg":
-                locator_name = f"Leg_IK_{selected_group}_1_loc{current_suffix}"
-            else:
-                locator_name = f"{selected_group}_IK_{selected_group}_1_loc{current_suffix}"
+            locator_name = f"{limb}_IK_{selected_group}_1_loc{current_suffix}"
+            key = (limb, "IK", selected_group, 1, current_suffix)
 
-        full_locator_name = find_object_with_partial_name(locator_name)
+        full_locator_name = find_locator(index, key, get_namespace(obj))
 
         if full_locator_name:
-            cmds.matchTransform(obj, full_locator_name, position=True, rotation=True, scale=False)
-            print(f"Alignement effectué : {obj} -> {full_locator_name}")
+            pairs.append((obj, full_locator_name))
         else:
             cmds.warning(f"Le locator {locator_name} n'existe pas pour l'objet {obj}.")
 
         last_suffix = current_suffix
 
-# Fonction principale pour appliquer les alignements aux locators
-def match_transforms_to_locators(selected_group):
-    selected_objects = cmds.ls(selection=True)
-    
+    return pairs
+
+# Fonction pour appliquer les alignements pour IK locators
+@AnimOperation.as_operation("Switch IK/FK")
+def match_to_ik_locators(selected_objects, category, selected_group):
+    for obj, locator in get_ik_locator_pairs(selected_objects, category, selected_group, SwitchRigRegistry.get_locator_index()):
+        match_to_target(obj, locator)
+        print(f"Alignement effectué : {obj} -> {locator}")
+
+# Fonction pour trouver les paires (contrôleur, locator) de la sélection (ou des objets donnés, pour le batch)
+def get_selection_locator_pairs(selected_group, selected_objects=None):
+    if selected_objects is None:
+        selected_objects = cmds.ls(selection=True)
+
     if len(selected_objects) == 0:
         cmds.error("Veuillez sélectionner au moins un objet.")
-        return
+        return []
 
-    category = determine_category(selected_objects)
+    category = determine_category(selected_objects, selected_group)
+
+    # Index tenu à jour par le registre, sans parcourir la scène
+    index = SwitchRigRegistry.get_locator_index()
 
     if len(selected_objects) in [3, 6]:
-        match_to_fk_locators(selected_objects, category, selected_group)
+        return get_fk_locator_pairs(selected_objects, category, selected_group, index)
     elif len(selected_objects) in [2, 4]:
-        match_to_ik_locators(selected_objects, category, selected_group)
+        return get_ik_locator_pairs(selected_objects, category, selected_group, index)
     else:
         cmds.error(f"Le script fonctionne uniquement avec 2, 4, 3 ou 6 objets sélectionnés. Vous avez sélectionné {len(selected_objects)}.")
+        return []
+
+# Fonction principale pour appliquer les alignements aux locators
+@AnimOperation.as_operation("Switch IK/FK")
+def match_transforms_to_locators(selected_group, selected_objects=None):
+    for obj, locator in get_selection_locator_pairs(selected_group, selected_objects):
+        match_to_target(obj, locator)
+        print(f"Alignement effectué : {obj} -> {locator}")
+
+# Fonction pour faire le switch sur toute une plage de frames (ou seulement sur les clés existantes)
+@AnimOperation.as_operation("Switch IK/FK Range")
+def switch_frame_range(selected_group, start_frame, end_frame, keys_only=False, selected_objects=None):
+    pairs = get_selection_locator_pairs(selected_group, selected_objects)
+    if not pairs:
+        return False
+
+    if keys_only:
+        controls = [obj for obj, _ in pairs]
+        key_times = cmds.keyframe(controls, query=True, timeChange=True, time=(start_frame, end_frame)) or []
+        frames = sorted(set(key_times))
+        if not frames:
+            cmds.warning("Aucune clé trouvée sur les contrôleurs dans cette plage.")
+            return False
+    else:
+        frames = list(range(start_frame, end_frame + 1))
+
+    # Les cibles stockées sont calculées depuis les matrices des joints, échantillonnées avec le reste
+    targets = [(obj, SwitchTargets.get_target(locator) if SwitchTargets.is_stored_target(locator) else locator)
+               for obj, locator in pairs]
+
+    AnimBake.start_progress("Switch IK/FK", len(frames))
+    try:
+        completed = AnimBake.bake_matches(targets, frames, AnimBake.update_progress)
+    finally:
+        AnimBake.end_progress()
+
+    if completed:
+        print(f"Switch effectué de {frames[0]} à {frames[-1]} sur {len(pairs)} contrôleurs ({len(frames)} frames).")
+    else:
+        cmds.warning("Switch annulé, aucune clé n'a été créée.")
+    return completed
 
-# Exécuter la détection des locators
-detect_unique_locator_names()
+# Exécuter la détection des locators quand le fichier est lancé comme script (l'import n'a pas d'effet)
+if __name__ == "__main__":
+    detect_unique_locator_names()
 
 # By Teo2103D
@@ -0,0 +1,205 @@
+import maya.api.OpenMaya as om
+import re
+import SwitchTargets
+
+# By Teo2103D
+
+# Registre des locators de switch IK/FK de la scène.
+# Les noms sont analysés une seule fois, puis le registre est tenu à jour par des callbacks
+# (locator créé, supprimé ou renommé) : ouvrir la fenêtre du switch ne rescane plus la scène.
+# Le registre reste en mémoire : un node de stockage dans la scène deviendrait faux dès que des
+# locators sont modifiés sans que l'outil soit chargé, il faudrait donc le revérifier à chaque ouverture.
+# Les cibles stockées sans locator (SwitchTargets) sont relues à chaque lecture : elles sont toutes
+# connectées au node registre de la scène, une seule requête suffit.
+
+# Noms des locators créés par OnIk/OnFk :
+# Arm_FK_jeff_rig_1_loc_L, Arm_IK_jeff_rig_1_loc_L, Arm_IK_PV_jeff_rig_loc_L (namespace éventuel devant)
+LOCATOR_NAME_PATTERN = re.compile(r"^(Arm|Leg)_(IK_PV|FK|IK)_(.+)_loc(_[LR])?$")
+LOCATOR_INDEX_PATTERN = re.compile(r"^(.+)_(\d+)$")
+
+# Locators attendus pour un membre complet
+EXPECTED_PARTS = [("FK", 1), ("FK", 2), ("FK", 3), ("IK", 1), ("PV", None)]
+
+# uuid du transform -> (clé, namespace), None tant que le registre n'a pas été construit
+_entries = None
+# uuid des locators créés depuis la dernière lecture (leur nom final n'est connu qu'après coup)
+_pending = set()
+_callback_ids = []
+
+# Fonction pour découper le nom d'un locator en (membre, type, rig, numéro, côté), ou None
+def parse_locator_name(name):
+    short_name = name.split('|')[-1].rpartition(':')[2]
+    match = LOCATOR_NAME_PATTERN.match(short_name)
+    if not match:
+        return None
+
+    limb, kind, rig, side = match.groups()
+    number = None
+    if kind == "IK_PV":
+        kind = "PV"
+    else:
+        # Le numéro est collé à la fin du nom du rig (jeff_rig_1)
+        index_match = LOCATOR_INDEX_PATTERN.match(rig)
+        if index_match:
+            rig, number = index_match.group(1), int(index_match.group(2))
+
+    return (limb, kind, rig, number, side or '')
+
+# Fonction pour récupérer le namespace d'un objet
+def get_namespace(obj):
+    return obj.split('|')[-1].rpartition(':')[0]
+
+def _get_uuid(node):
+    return om.MFnDependencyNode(node).uuid().asString()
+
+def _locator_transform(node):
+    """Transform parent d'un locator shape, ou le node lui-même s'il porte un locator."""
+    dag_node = om.MFnDagNode(node)
+    if node.hasFn(om.MFn.kLocator):
+        return dag_node.parent(0) if dag_node.parentCount() else None
+    if node.hasFn(om.MFn.kTransform):
+        for i in range(dag_node.childCount()):
+            if dag_node.child(i).hasFn(om.MFn.kLocator):
+                return node
+    return None
+
+def _register(transform):
+    """Analyse le nom d'un transform de locator et met à jour son entrée."""
+    uuid = _get_uuid(transform)
+    name = om.MFnDependencyNode(transform).name()
+    key = parse_locator_name(name)
+    if key:
+        _entries[uuid] = (key, get_namespace(name))
+    else:
+        _entries.pop(uuid, None)
+
+def _build():
+    """Construit le registre en un seul parcours des locators de la scène."""
+    global _entries
+    _entries = {}
+    _pending.clear()
+
+    iterator = om.MItDependencyNodes(om.MFn.kLocator)
+    while not iterator.isDone():
+        transform = _locator_transform(iterator.thisNode())
+        if transform is not None:
+            _register(transform)
+        iterator.next()
+
+def _on_node_added(node, client_data):
+    if _entries is not None:
+        _pending.add(_get_uuid(node))
+
+def _on_node_removed(node, client_data):
+    if _entries is None:
+        return
+    _pending.discard(_get_uuid(node))
+    transform = _locator_transform(node)
+    if transform is not None:
+        _entries.pop(_get_uuid(transform), None)
+
+def _on_name_changed(node, previous_name, client_data):
+    if _entries is None or not node.hasFn(om.MFn.kTransform):
+        return
+    if _locator_transform(node) is not None:
+        _register(node)
+
+def _on_scene_changed(client_data):
+    # Nouvelle scène : le registre sera reconstruit à la prochaine lecture
+    global _entries
+    _entries = None
+    _pending.clear()
+
+def install_callbacks():
+    """Installe les callbacks qui tiennent le registre à jour (une seule fois par session)."""
+    if _callback_ids:
+        return
+    _callback_ids.append(om.MDGMessage.addNodeAddedCallback(_on_node_added, "locator"))
+    _callback_ids.append(om.MDGMessage.addNodeRemovedCallback(_on_node_removed, "locator"))
+    _callback_ids.append(om.MNodeMessage.addNameChangedCallback(om.MObject.kNullObj, _on_name_changed))
+    for message in (om.MSceneMessage.kAfterOpen, om.MSceneMessage.kAfterNew):
+        _callback_ids.append(om.MSceneMessage.addCallback(message, _on_scene_changed))
+
+def remove_callbacks():
+    om.MMessage.removeCallbacks(_callback_ids)
+    del _callback_ids[:]
+
+def get_entries():
+    """
+    Retourne le registre {uuid: (clé, namespace)}, construit à la première lecture
+    puis seulement complété avec les locators créés depuis.
+    """
+    install_callbacks()
+    if _entries is None:
+        _build()
+    elif _pending:
+        for uuid in list(_pending):
+            selection = om.MSelectionList()
+            try:
+                selection.add(om.MUuid(uuid))
+            except RuntimeError:
+                continue  # Supprimé entre-temps
+            transform = _locator_transform(selection.getDependNode(0))
+            if transform is not None:
+                _register(transform)
+        _pending.clear()
+    return _entries
+
+def get_stored_entries():
+    """Cibles stockées de la scène (SwitchTargets) : {plug: (clé, namespace)}, lues en une requête."""
+    entries = {}
+    for plug in SwitchTargets.get_target_plugs():
+        node, _, attr = plug.partition('.')
+        key = parse_locator_name(attr[len(SwitchTargets.TARGET_PREFIX):])
+        if key:
+            entries[plug] = (key, get_namespace(node))
+    return entries
+
+def get_all_entries():
+    """Locators et cibles stockées : {uuid du locator ou plug de la cible: (clé, namespace)}."""
+    entries = dict(get_entries())
+    entries.update(get_stored_entries())
+    return entries
+
+def get_locator_index():
+    """
+    Index {clé: {namespace: uuid du locator ou plug de la cible stockée}} utilisé par le switch
+    pour trouver les locators.
+    """
+    index = {}
+    for target, (key, namespace) in get_all_entries().items():
+        index.setdefault(key, {})[namespace] = target
+    return index
+
+def get_rig_names():
+    return sorted({key[2] for key, _ in get_all_entries().values()})
+
+def get_rig_status(rig):
+    """
+    État de chaque membre d'un rig : liste de lignes "Arm_L : complet", "Leg_R : manque FK 3, PV"
+    ou "cassé" quand un locator existe en double dans le même namespace.
+    """
+    parts = {}
+    duplicates = set()
+    for key, namespace in get_all_entries().values():
+        limb, kind, key_rig, number, side = key
+        if key_rig != rig:
+            continue
+        limb_parts = parts.setdefault((namespace, limb, side), [])
+        if (kind, number) in limb_parts:
+            duplicates.add((namespace, limb, side))
+        limb_parts.append((kind, number))
+
+    lines = []
+    for (namespace, limb, side), limb_parts in sorted(parts.items()):
+        label = f"{namespace + ':' if namespace else ''}{limb}{side}"
+        missing = [f"{kind} {number}" if number else kind for kind, number in EXPECTED_PARTS if (kind, number) not in limb_parts]
+        if (namespace, limb, side) in duplicates:
+            lines.append(f"{label} : cassé (locators en double)")
+        elif missing:
+            lines.append(f"{label} : manque {', '.join(missing)}")
+        else:
+            lines.append(f"{label} : complet")
+    return lines
+
+# By Teo2103D
@@ -0,0 +1,143 @@
+import json
+import os
+import maya.cmds as cmds
+import AnimBake
+import AnimOperation
+import OnIk
+import OnFk
+import SwitchTargets
+
+#By Teo2103D
+
+# Batch version of OnIk/OnFk: sets up the switch locators of every limb of whole characters at once
+# (a crowd of referenced rigs, or all the characters of a shot), from a limb mapping instead of a selection per limb.
+#
+# For every rig and limb of the mapping, like the manual steps of the ReadMe:
+# - OnIk on the IK chain: FK locators 1, 2, 3
+# - OnIk on the last joint of the FK chain: IK locator 1
+# - OnFk on the FK chain: pole vector locator, placed by AnimMath.pole_vector_positions
+# The joints of all the rigs are found with one DAG query, and the nodes created for a rig are grouped under
+# "<rig>_switchSetup_grp". Referenced rigs get their locators in their namespace, so the switch finds them.
+# With stored offsets (SwitchTargets), no locator is created: the targets are stored on the joints.
+
+# Limbs set up on every rig: IK chain and FK chain from top to bottom, "{side}" replaced by every side.
+# The names are looked up under each rig, without namespace.
+DEFAULT_LIMB_MAPPING = {
+    "sides": ["_L", "_R"],
+    "limbs": {
+        "Arm": {"ik": ["IK_Shoulder{side}", "IK_Elbow{side}", "IK_Wrist{side}"],
+                "fk": ["FK_Shoulder{side}", "FK_Elbow{side}", "FK_Wrist{side}"]},
+        "Leg": {"ik": ["IK_Hip{side}", "IK_Knee{side}", "IK_Ankle{side}"],
+                "fk": ["FK_Hip{side}", "FK_Knee{side}", "FK_Ankle{side}"]},
+    },
+}
+
+# Mapping of the rigs of the project, used instead of the default one when it exists (same layout, JSON)
+LIMB_MAPPING_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "SwitchLimbMapping.json")
+
+def load_limb_mapping(path=None):
+    """Limb mapping from a JSON file (SwitchLimbMapping.json by default), or the default mapping."""
+    path = path or LIMB_MAPPING_FILE
+    if not os.path.isfile(path):
+        return DEFAULT_LIMB_MAPPING
+    with open(path) as mapping_file:
+        return json.load(mapping_file)
+
+def index_rig_joints(rigs):
+    """
+    Finds the top parent of the rigs and every transform under them with one DAG query.
+    Returns ([rig roots], {(rig root, name without namespace): full path}).
+    """
+    roots = list(dict.fromkeys(root for _, root in OnIk.get_hierarchy_info(rigs).values()))
+    index = {}
+    for path in cmds.listRelatives(roots, allDescendents=True, fullPath=True, type="transform") or []:
+        parts = path.split('|')
+        index.setdefault((parts[1], parts[-1].rpartition(':')[2]), path)
+    return roots, index
+
+def set_up_limb(root, limb, side, chains, stored=None):
+    """
+    Creates the FK, IK and PV locators of one limb of a rig, from its IK and FK chains (full paths),
+    or stores their targets (stored, SwitchTargets.store_offsets by default).
+    Returns the top-level nodes created.
+    """
+    namespace, _, rig_name = root.rpartition(':')
+    prefix = f"{namespace}:{limb}_" if namespace else f"{limb}_"
+
+    # Top to bottom, as OnFk sorts them (depth from the full paths)
+    ik_chain, fk_chain = [sorted(chain, key=lambda path: path.count('|')) for chain in (chains["ik"], chains["fk"])]
+
+    created = [OnIk.create_switch_locator(joint, f"{prefix}FK_{rig_name}_{number}_loc{side}", stored)
+               for number, joint in enumerate(ik_chain, 1)]
+    created.append(OnIk.create_switch_locator(fk_chain[-1], f"{prefix}IK_{rig_name}_1_loc{side}", stored))
+    created.append(OnFk.create_pole_vector_target(fk_chain, prefix, rig_name, side, stored))
+    return [node for node in created if node]
+
+@AnimOperation.as_operation("Switch Setup Batch")
+def set_up_rigs(rigs, mapping=None, stored=None):
+    """
+    Sets up the switch locators of every limb of the mapping on every rig
+    (or their stored targets: stored, SwitchTargets.store_offsets by default).
+    Returns {"limbs": number of limbs set up, "missing": [limbs skipped, with the missing joints], "cancelled": bool}.
+    """
+    mapping = mapping or load_limb_mapping()
+    roots, index = index_rig_joints(rigs)
+    limbs = [(root, limb, side) for root in roots for limb in mapping["limbs"] for side in mapping["sides"]]
+    report = {"limbs": 0, "missing": [], "cancelled": False}
+
+    AnimBake.start_progress("Switch Setup", len(limbs))
+    try:
+        for root in roots:
+            created = []
+            for limb, chain_names in mapping["limbs"].items():
+                for side in mapping["sides"]:
+                    if not AnimBake.update_progress(report["limbs"] + len(report["missing"]), len(limbs)):
+                        report["cancelled"] = True
+                        break
+
+                    chains, missing = {}, []
+                    for kind in ("ik", "fk"):
+                        names = [name.format(side=side) for name in chain_names[kind]]
+                        chains[kind] = [index.get((root, name)) for name in names]
+                        missing += [name for name, path in zip(names, chains[kind]) if path is None]
+                    if missing:
+                        report["missing"].append(f"{root} {limb}{side}: {', '.join(missing)}")
+                        continue
+
+                    created += set_up_limb(root, limb, side, chains, stored)
+                    report["limbs"] += 1
+                if report["cancelled"]:
+                    break
+
+            # Everything created for this rig in one group
+            if created:
+                cmds.group(created, name=f"{root.replace(':', '_')}_switchSetup_grp")
+            if report["cancelled"]:
+                break
+    finally:
+        AnimBake.end_progress()
+    return report
+
+def set_up_selected_rigs():
+    """Sets up the selected rigs (any node of each rig can be selected) with the limb mapping."""
+    selection = cmds.ls(selection=True)
+    if not selection:
+        cmds.warning("Select the rigs to set up.")
+        return
+
+    report = set_up_rigs(selection)
+    for missing in report["missing"]:
+        print(f"Skipped {missing}")
+    kind = "targets stored" if SwitchTargets.store_offsets else "locators created"
+    message = f"Switch {kind} on {report['limbs']} limbs"
+    if report["missing"]:
+        message += f", {len(report['missing'])} limbs skipped (see the Script Editor)"
+    if report["cancelled"]:
+        message += ", cancelled"
+    print(message + ".")
+
+# Execute the function when the file is run as a script (importing it has no side effect)
+if __name__ == "__main__":
+    set_up_selected_rigs()
+
+#By Teo2103D
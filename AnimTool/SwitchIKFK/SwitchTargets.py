@@ -0,0 +1,166 @@
+import re
+import maya.cmds as cmds
+import AnimMath
+
+#By Teo2103D
+
+# Switch targets stored on the rig instead of locators ("stored offsets" setup mode of OnIk, OnFk and the batch).
+#
+# A switch locator only gives the pose its control is matched to, but its constraints are evaluated on every
+# frame of playback. Instead, the offset of each locator to what drives it is stored as a matrix attribute
+# on the driving joint, named after the locator
+# (e.g. "switchTarget_Arm_FK_jeff_rig_1_loc_L"), and the switch computes the target when it runs:
+# - FK and IK targets: offset x world matrix of the joint
+# - pole vector target: offset x pole vector frame of the chain (AnimMath.pole_vector_positions), stored on the
+#   middle joint with the chain connected to it (top.message -> middle.<attribute>_chain[0], middle [1], bottom [2]).
+#   The bend direction of the chain at setup is stored too (<attribute>_bend, in the space of the middle joint):
+#   it places the target when the chain is straight on every frame switched. The pole vector is matched
+#   in position only.
+# Every stored attribute is connected to the registry node of the scene, so one query finds them all
+# (SwitchRigRegistry lists them with the locators). Nothing here is evaluated during playback.
+
+TARGET_REGISTRY = "AnimTool_switchTargets"
+TARGET_PREFIX = "switchTarget_"
+CHAIN_SUFFIX = "_chain"
+BEND_SUFFIX = "_bend"
+CHAIN_PLUG_PATTERN = re.compile(r"\[(\d+)\]$")
+
+# Setup mode used by OnIk, OnFk and the batch setup when they are not told: store the offsets, no locator
+store_offsets = False
+
+# Distance of the pole vector target (stored, or OnFk locator) from the middle joint, in lengths of the chain
+POLE_VECTOR_DISTANCE = 0.5
+
+def get_target_registry():
+    """Registry node of the stored targets, created with the first one."""
+    if cmds.objExists(TARGET_REGISTRY):
+        return TARGET_REGISTRY
+    registry = cmds.createNode("network", name=TARGET_REGISTRY)
+    cmds.addAttr(registry, longName="targets", attributeType="matrix", multi=True, indexMatters=False)
+    return registry
+
+def _store(node, locator_name, offset):
+    """Stores offset on node, under the name of the locator (without namespace). Returns the plug."""
+    attr = TARGET_PREFIX + locator_name.rpartition(':')[2]
+    plug = f"{node}.{attr}"
+    if not cmds.attributeQuery(attr, node=node, exists=True):
+        cmds.addAttr(node, longName=attr, attributeType="matrix")
+        cmds.connectAttr(plug, f"{get_target_registry()}.targets", nextAvailable=True)
+    cmds.setAttr(plug, *offset, type="matrix")
+    return plug
+
+def store_target(obj, locator_name, offset=None):
+    """
+    Stores the target of a switch locator following obj (matched on it: identity offset by default).
+    """
+    return _store(obj, locator_name, offset or AnimMath.IDENTITY)
+
+def get_rest_bend(chain):
+    """
+    Bend direction of a chain (top, middle, bottom objects) in the space of its middle object, from its current pose.
+    A straight chain gives the axis of the middle object the most perpendicular to the chain.
+    """
+    worlds = [cmds.getAttr(f"{obj}.worldMatrix[0]") for obj in chain]
+    top, middle, bottom = AnimMath.positions(worlds)
+    direction = AnimMath.bend_direction(top, middle, bottom)
+    if direction is not None:
+        return AnimMath.transform_vector(direction, AnimMath.inverse(worlds[1]))
+
+    chain_axis = [b - t for t, b in zip(top, bottom)]
+    def alignment(axis):
+        world_axis = AnimMath.transform_vector(axis, worlds[1])
+        norm = sum(value * value for value in world_axis) ** 0.5 or 1.0
+        return abs(sum(a * c for a, c in zip(world_axis, chain_axis))) / norm
+    return min(((0.0, 1.0, 0.0), (0.0, 0.0, 1.0), (1.0, 0.0, 0.0)), key=alignment)
+
+def store_pole_vector_target(chain, locator_name):
+    """
+    Stores the target of the pole vector locator of a chain (top, middle, bottom objects) on its middle object,
+    with the bend direction of its current pose (get_rest_bend).
+    """
+    middle = chain[1]
+    plug = _store(middle, locator_name, AnimMath.IDENTITY)
+    attr = plug.partition('.')[2]
+    chain_attr = attr + CHAIN_SUFFIX
+    if not cmds.attributeQuery(chain_attr, node=middle, exists=True):
+        cmds.addAttr(middle, longName=chain_attr, attributeType="message", multi=True)
+    for index, obj in enumerate(chain):
+        cmds.connectAttr(f"{obj}.message", f"{middle}.{chain_attr}[{index}]", force=True)
+
+    bend_attr = attr + BEND_SUFFIX
+    if not cmds.attributeQuery(bend_attr, node=middle, exists=True):
+        cmds.addAttr(middle, longName=bend_attr, attributeType="double3")
+        for axis in "XYZ":
+            cmds.addAttr(middle, longName=f"{bend_attr}{axis}", attributeType="double", parent=bend_attr)
+    cmds.setAttr(f"{middle}.{bend_attr}", *get_rest_bend(chain))
+    return plug
+
+def get_target_plugs():
+    """Plugs of all the stored targets of the scene ("joint.switchTarget_..."), with one query per registry."""
+    plugs = []
+    for registry in cmds.ls(TARGET_REGISTRY, f"*:{TARGET_REGISTRY}", type="network") or []:
+        plugs += cmds.listConnections(f"{registry}.targets", source=True, destination=False, plugs=True) or []
+    return plugs
+
+def is_stored_target(target):
+    """True for a stored target plug, False for a locator name."""
+    return '.' in target
+
+def is_pole_vector_target(target):
+    """True for a stored pole vector target (matched in position only)."""
+    if not is_stored_target(target):
+        return False
+    node, _, attr = target.partition('.')
+    return cmds.attributeQuery(attr + CHAIN_SUFFIX, node=node, exists=True)
+
+def _get_chain(node, attr):
+    """Chain (top, middle, bottom) of a pole vector target, or None for an FK/IK target."""
+    if not cmds.attributeQuery(attr + CHAIN_SUFFIX, node=node, exists=True):
+        return None
+    connections = cmds.listConnections(f"{node}.{attr}{CHAIN_SUFFIX}", source=True, destination=False,
+                                       connections=True) or []
+    chain = sorted(zip(connections[0::2], connections[1::2]),
+                   key=lambda pair: int(CHAIN_PLUG_PATTERN.search(pair[0]).group(1)))
+    return [obj for _, obj in chain]
+
+def pole_vector_frames(tops, middles, bottoms, fallbacks=None):
+    """
+    Pole vector frames for each (top, middle, bottom) positions: at the pole vector position of the chain
+    (POLE_VECTOR_DISTANCE), aimed (X) at the middle joint with Y up.
+    fallbacks: world bend directions used when the chain is never bent (AnimMath.pole_vector_positions).
+    """
+    positions = AnimMath.pole_vector_positions(tops, middles, bottoms, POLE_VECTOR_DISTANCE, fallbacks)
+    return AnimMath.aim_matrices(positions, middles)
+
+def get_target(plug):
+    """
+    How a stored target is computed, as the targets of AnimBake.bake_matches take it:
+    ([matrix plugs to sample], function {plug: [matrix per frame]} -> [target world matrix per frame]),
+    plus True for a pole vector target (position only).
+    """
+    node, _, attr = plug.partition('.')
+    offset = cmds.getAttr(plug)
+    chain = _get_chain(node, attr)
+
+    if chain is None:
+        world_plug = f"{node}.worldMatrix[0]"
+        return [world_plug], lambda samples: AnimMath.multiply_many(offset, samples[world_plug])
+
+    world_plugs = [f"{obj}.worldMatrix[0]" for obj in chain]
+    # Bend direction of the setup, carried by the middle joint (older setups: its Y axis)
+    bend = (0.0, 1.0, 0.0)
+    if cmds.attributeQuery(attr + BEND_SUFFIX, node=node, exists=True):
+        bend = cmds.getAttr(f"{node}.{attr}{BEND_SUFFIX}")[0]
+    def compute(samples):
+        fallbacks = [AnimMath.transform_vector(bend, matrix) for matrix in samples[world_plugs[1]]]
+        frames = pole_vector_frames(*[AnimMath.positions(samples[world_plug]) for world_plug in world_plugs],
+                                    fallbacks=fallbacks)
+        return AnimMath.multiply_many(offset, frames)
+    return world_plugs, compute, True
+
+def get_target_matrix(plug):
+    """World matrix of a stored target at the current time."""
+    plugs, compute = get_target(plug)[:2]
+    return compute({world_plug: [cmds.getAttr(world_plug)] for world_plug in plugs})[0]
+
+#By Teo2103D
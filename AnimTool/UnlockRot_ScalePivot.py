@@ -1,7 +1,9 @@
 import maya.cmds as cmds
+import AnimOperation
 
 #By Teo2103D
 
+@AnimOperation.as_operation("Unlock Pivots")
 def unlock_pivot_attributes():
     # Récupérer les objets sélectionnés
     selected_objects = cmds.ls(selection=True)
@@ -42,5 +44,6 @@ def unlock_pivot_attributes():
             else:
                 print(f"L'attribut {attr} n'existe pas sur {obj}.")
                 
-# Appeler la fonction pour déverrouiller les pivots des objets sélectionnés
-unlock_pivot_attributes()
+# Appeler la fonction quand le fichier est lancé comme script (l'import n'a pas d'effet)
+if __name__ == "__main__":
+    unlock_pivot_attributes()